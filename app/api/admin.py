@@ -0,0 +1,48 @@
+from typing import Dict, Any
+from fastapi import APIRouter
+
+from app.core.logging import logger
+from app.services.blob_store import get_blob_store
+from app.services.cache_warmer import get_warmer_stats
+from app.services.caching import get_cache_stats
+from app.services.catalog import get_catalog_stats
+from app.services.executor import run_blocking
+from app.services.resilience import get_upstream_stats
+from app.services.singleflight import get_singleflight_stats
+
+router = APIRouter(tags=["admin"])
+
+@router.get("/blob-store")
+async def api_blob_store_usage() -> Dict[str, Any]:
+    logger.info("Blob store usage requested")
+    return get_blob_store().usage()
+
+
+@router.get("/cache")
+async def api_cache_stats() -> Dict[str, Any]:
+    logger.info("Cache stats requested")
+    return get_cache_stats()
+
+
+@router.get("/upstreams")
+async def api_upstream_stats() -> Dict[str, Any]:
+    logger.info("Upstream stats requested")
+    return get_upstream_stats()
+
+
+@router.get("/singleflight")
+async def api_singleflight_stats() -> Dict[str, Any]:
+    logger.info("Singleflight stats requested")
+    return get_singleflight_stats()
+
+
+@router.get("/cache-warmer")
+async def api_cache_warmer_stats() -> Dict[str, Any]:
+    logger.info("Cache warmer stats requested")
+    return get_warmer_stats()
+
+
+@router.get("/catalog")
+async def api_catalog_stats() -> Dict[str, Any]:
+    logger.info("Catalog stats requested")
+    return await run_blocking(get_catalog_stats)
@@ -1,56 +1,234 @@
-from typing import Optional, Dict, Any, List
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse, FileResponse
+from typing import Optional, Dict, Any, Iterable, List, Sequence
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 from starlette.responses import Response
-import gzip
+import asyncio
+import fnmatch
 
+from app.core.compression import precompressed_response
+from app.core.config import settings
 from app.core.logging import logger
+from app.services.cache_warmer import access_stats
+from app.services.caching import cache_data, cached_fetch_entry, get_cached_entry, make_cache_key, serialize
 from app.services.markets.common import get_market_service
+from app.utils.helpers import format_size
 
 router = APIRouter(tags=["models"])
 
+
+class ModelBatchRequest(BaseModel):
+    # model_ids가 pydantic의 "model_" 예약 접두어와 겹치지 않도록 보호 네임스페이스 해제
+    model_config = ConfigDict(protected_namespaces=())
+
+    model_ids: List[str] = Field(..., min_length=1, max_length=settings.BATCH_MAX_MODELS)
+    fields: Optional[List[str]] = Field(None, description="Only return these fields for each model")
+    card_html: bool = Field(False, description="Include the rendered model card HTML")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    # 미지정 시 목록 화면용 기본 필드, "all"이면 전체 필드
+    if fields is None:
+        return list(settings.MODEL_LIST_FIELDS)
+    if fields.strip() == "all":
+        return None
+    return validate_fields(field.strip() for field in fields.split(",") if field.strip())
+
+def validate_fields(fields: Iterable[str], allowed: Sequence[str] = settings.MODEL_FIELDS) -> List[str]:
+    requested = list(dict.fromkeys(fields))
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported fields: {', '.join(unknown)}")
+    return ["id"] + [field for field in requested if field != "id"]
+
+def paginate_files(listing: Dict[str, Any], pattern: Optional[str], extensions: Optional[List[str]],
+                   page: int, limit: int) -> Dict[str, Any]:
+    files = listing.get("files", [])
+    if pattern:
+        files = [file for file in files if fnmatch.fnmatchcase(file["name"], pattern)]
+    if extensions:
+        suffixes = tuple("." + extension.lower().lstrip(".") for extension in extensions)
+        files = [file for file in files if file["name"].lower().endswith(suffixes)]
+    total_size = sum(file.get("size_bytes") or 0 for file in files)
+    return {
+        "sha": listing.get("sha"),
+        "files": files[(page - 1) * limit:page * limit],
+        "total": len(files),
+        "total_size": total_size,
+        "total_size_human": format_size(total_size),
+        "page": page,
+        "limit": limit,
+    }
+
 @router.get("/")
-async def api_models(market: str, query: str = "", sort: str = "downloads", page: int = Query(1, ge=1), limit: int = 30):
+async def api_models(request: Request, market: str, query: str = "", sort: str = "downloads",
+                     page: int = Query(1, ge=1), limit: int = 30,
+                     fields: Optional[str] = Query(None, description="Comma-separated model fields, or 'all' for the full payload"),
+                     tags: Optional[List[str]] = Query(None, description="Only models with all of these tags")):
     try:
+        selected = parse_fields(fields)
+        fields_key = ",".join(selected) if selected else "all"
         market_service = get_market_service(market)
         if sort == "trending":
-            data = await market_service.get_trending_models(page, query)
+            entry = await cached_fetch_entry(market, "trending", {"query": query, "page": page, "fields": fields_key},
+                                             lambda: market_service.get_trending_models(page, query, selected))
         else:
-            data = await market_service.search_models(query, sort, page, limit)
-
-        json_compatible_data = JSONResponse(content=data).body
-        gzip_body = gzip.compress(json_compatible_data)
+            tags_key = ",".join(sorted(set(tags))) if tags else None
+            entry = await cached_fetch_entry(market, "search", {"query": query, "sort": sort, "page": page,
+                                                                "limit": limit, "fields": fields_key, "tags": tags_key},
+                                             lambda: market_service.search_models(query, sort, page, limit, selected, tags))
 
-        return Response(
-            content=gzip_body,
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
+        # 캐시 항목의 직렬화 본문과 압축본을 그대로 사용
+        return precompressed_response(request, entry.body, entry.etag)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in api_models: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/batch")
+async def api_models_batch(market: str, batch: ModelBatchRequest) -> StreamingResponse:
+    # 스트리밍을 시작하기 전에 검증해 알 수 없는 필드는 400으로 응답 (상세 응답에는 card_html도 포함될 수 있음)
+    fields = validate_fields(batch.fields, settings.MODEL_FIELDS + ["card_html"]) if batch.fields else None
+    market_service = get_market_service(market)
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def fetch_one(model_id: str) -> bytes:
+        async with semaphore:
+            try:
+                entry = await cached_fetch_entry(market, "detail", {"model_id": model_id, "card_html": batch.card_html},
+                                                 lambda: market_service.get_model_detail(model_id, include_html=batch.card_html))
+                if fields:
+                    data = {field: entry.value[field] for field in fields if field in entry.value}
+                    return serialize({"id": model_id, "data": data})
+                # 필드 선택이 없으면 캐시된 직렬화 본문을 그대로 이어 붙임
+                return b'{"id":' + serialize(model_id) + b',"data":' + entry.body + b"}"
+            except HTTPException as e:
+                return serialize({"id": model_id, "error": e.detail, "status": e.status_code})
+            except Exception as e:
+                # 개별 모델 실패는 배치 전체를 실패시키지 않고 해당 줄에만 기록
+                logger.error(f"Error in api_models_batch for {model_id}: {str(e)}")
+                return serialize({"id": model_id, "error": str(e), "status": 404})
+
+    async def generate():
+        tasks = [asyncio.ensure_future(fetch_one(model_id)) for model_id in dict.fromkeys(batch.model_ids)]
+        try:
+            # 완료되는 순서대로 NDJSON 한 줄씩 전송
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result + b"\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/export")
+async def api_models_export(market: str, query: str = "", sort: str = "downloads",
+                            fields: Optional[str] = Query(None, description="Comma-separated model fields, or 'all' for the full payload"),
+                            tags: Optional[List[str]] = Query(None, description="Only models with all of these tags"),
+                            cursor: Optional[str] = Query(None, description="Resume token from a previous export's cursor line")) -> StreamingResponse:
+    """검색 결과 전체를 NDJSON으로 스트리밍한다.
+
+    모델 한 줄씩 전송하고, 업스트림 페이지가 끝날 때마다 {"cursor": ...} 줄을 보낸다.
+    중단된 경우 같은 검색 조건에 마지막으로 받은 cursor를 더해 다시 요청하면 다음 모델부터 이어서 받는다.
+    마지막 줄은 {"done": true, "count": N}, 도중 오류 시 {"error": ..., "cursor": ...}.
+    """
+    try:
+        selected = parse_fields(fields)
+        market_service = get_market_service(market)
+        if not hasattr(market_service, "export_models"):
+            raise HTTPException(status_code=400, detail=f"Export is not supported for market {market}")
+        pages = market_service.export_models(query, sort, selected, tags, cursor)
+        # 첫 페이지는 응답 시작 전에 받아 업스트림 오류를 HTTP 상태 코드로 전달
+        first_page = await pages.__anext__()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in api_models_export: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def generate():
+        count = 0
+        last_cursor = cursor
+        page = first_page
+        try:
+            while True:
+                models, next_cursor = page
+                count += len(models)
+                # 페이지 단위로 한 번에 전송: 클라이언트가 느리면 send에서 대기하므로 다음 페이지 요청도 멈춤
+                chunk = b"".join(serialize(model) + b"\n" for model in models)
+                if next_cursor is None:
+                    yield chunk + serialize({"done": True, "count": count}) + b"\n"
+                    return
+                last_cursor = next_cursor
+                yield chunk + serialize({"cursor": next_cursor}) + b"\n"
+                page = await pages.__anext__()
+        except Exception as e:
+            # 헤더가 이미 전송되었으므로 오류는 마지막 줄로 알리고, 받은 cursor부터 재개하도록 함
+            logger.error(f"Error in api_models_export stream: {str(e)}")
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield serialize({"error": detail, "cursor": last_cursor}) + b"\n"
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @router.get("/{model_id:path}/files")
-async def api_model_files(market: str, model_id: str) -> Dict[str, Any]:
+async def api_model_files(request: Request, market: str, model_id: str,
+                          revision: Optional[str] = Query(None, description="Branch, tag or commit sha (default: main)"),
+                          pattern: Optional[str] = Query(None, description="Glob on the file path, ex: *.safetensors"),
+                          extensions: Optional[List[str]] = Query(None, description="Only files with these extensions"),
+                          page: int = Query(1, ge=1),
+                          limit: int = Query(settings.FILES_PAGE_SIZE, ge=1, le=settings.FILES_MAX_PAGE_SIZE)) -> Response:
     try:
         market_service = get_market_service(market)
-        return await market_service.get_model_files(model_id)
+        listing_entry = await cached_fetch_entry(market, "files", {"model_id": model_id, "revision": revision},
+                                                 lambda: market_service.get_model_files(model_id, revision))
+        listing = listing_entry.value
+        # 필터/페이지 크기 조합은 클라이언트가 임의로 만들 수 있으므로 캐시하지 않고 요청마다 계산
+        if pattern or extensions or limit != settings.FILES_PAGE_SIZE \
+                or (page - 1) * limit >= max(len(listing.get("files", [])), 1):
+            return paginate_files(listing, pattern, extensions, page, limit)
+        # 필터 없는 기본 크기의 (실제 존재하는) 페이지만 sha 기준으로 캐시해 직렬화·압축본을 재사용
+        view_key = make_cache_key(market, "files_page", {"model_id": model_id,
+                                                         "sha": listing.get("sha") or listing_entry.etag,
+                                                         "page": page})
+        entry = await get_cached_entry(view_key)
+        if entry is None:
+            entry = await cache_data(view_key, paginate_files(listing, None, None, page, limit),
+                                     timeout=settings.MODEL_FILES_CACHE_TTL)
+        return precompressed_response(request, entry.body, entry.etag)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Failed to fetch model files: {str(e)}")
 
 @router.get("/{model_id:path}/download")
-async def download_model(market: str, model_id: str, filename: str) -> FileResponse:
+async def download_model(request: Request, market: str, model_id: str, filename: str,
+                         stream: Optional[bool] = Query(None, description="Proxy the file as a stream instead of downloading it first")) -> Response:
     try:
         market_service = get_market_service(market)
-        return await market_service.download_model_file(model_id, filename)
+        use_stream = stream if stream is not None else settings.DOWNLOAD_MODE == "stream"
+        if use_stream:
+            return await market_service.stream_model_file(model_id, filename, request.headers.get("range"))
+        return await market_service.download_model_file(model_id, filename, request.headers.get("range"))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Failed to download model file: {str(e)}")
 
 @router.get("/{model_id:path}")
-async def api_model_detail(market: str, model_id: str) -> Dict[str, Any]:
+async def api_model_detail(request: Request, market: str, model_id: str,
+                           card_html: bool = Query(True, description="Include the rendered model card HTML")) -> Response:
     try:
         market_service = get_market_service(market)
-        return await market_service.get_model_detail(model_id)
+        access_stats.record(market, model_id, card_html)
+        # 업스트림 응답은 검증/재인코딩 없이 캐시된 직렬화 본문을 그대로 전달
+        entry = await cached_fetch_entry(market, "detail", {"model_id": model_id, "card_html": card_html},
+                                         lambda: market_service.get_model_detail(model_id, include_html=card_html))
+        return precompressed_response(request, entry.body, entry.etag)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in api_model_detail: {str(e)}")
         raise HTTPException(status_code=404, detail=f"Model not found or error occurred: {str(e)}")
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
-from app.services.caching import cache_data, get_cached_data
+from fastapi import APIRouter, HTTPException, Query, Request
+from app.core.compression import precompressed_response
 from app.core.config import settings
-from app.services.markets.common import get_market_service
+from app.services.caching import serialize
+from app.services.tag_index import get_tag_index, get_tags_entry
+import hashlib
 import logging
 
 router = APIRouter(tags=["tags"])
@@ -9,60 +11,61 @@ logger = logging.getLogger(__name__)
 
 INTERNAL_SERVER_ERROR_MESSAGE = "Internal Server Error"
 
+
 @router.get("/")
-async def api_tags(market: str = Query(..., description="The market to fetch tags for")):
+async def api_tags(request: Request, market: str = Query(..., description="The market to fetch tags for")):
     try:
-        cache_key = f"{market}_tag_cache"
-        data, _ = await get_cached_data(cache_key)
-        if not data:
-            market_service = get_market_service(market)
-            data = market_service.get_tags()
-            if not data:
-                raise HTTPException(status_code=500, detail="Failed to retrieve tags")
-            await cache_data(cache_key, data)
-        return data
+        entry = await get_tags_entry(market)
+        return precompressed_response(request, entry.body, entry.etag)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in api_tags: {str(e)}")
         raise HTTPException(status_code=500, detail=INTERNAL_SERVER_ERROR_MESSAGE)
 
 @router.get("/{group}")
-async def api_tags_group(market: str, group: str):
+async def api_tags_group(request: Request, market: str, group: str):
     if group not in settings.GROUPS:
         raise HTTPException(status_code=404, detail="Group not found")
 
     try:
-        cache_key = f"{market}_{group}_data"
-        data, _ = await get_cached_data(cache_key)
-        if not data:
-            market_service = get_market_service(market)
-            all_tags = market_service.get_tags()
-            data = all_tags.get(group, [])
-            await cache_data(cache_key, data)
-
-        if group in settings.LIMITED_GROUPS:
-            limited_data = data[:settings.LIMIT] if isinstance(data, list) else list(data.items())[:settings.LIMIT]
-            remaining_count = len(data) - settings.LIMIT if len(data) > settings.LIMIT else 0
-            return {"data": limited_data, "remaining_count": remaining_count}
-        return {"data": data, "remaining_count": 0}
+        tag_group = (await get_tag_index(market)).groups[group]
+        return precompressed_response(request, tag_group.limited_body, f"{tag_group.etag}-limited")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in api_tags_group: {str(e)}")
         raise HTTPException(status_code=500, detail=INTERNAL_SERVER_ERROR_MESSAGE)
 
 @router.get("/{group}/all")
-async def api_tags_group_all(market: str, group: str):
+async def api_tags_group_all(request: Request, market: str, group: str):
     if group not in settings.GROUPS:
         raise HTTPException(status_code=404, detail="Group not found")
 
     try:
-        cache_key = f"{market}_{group}_data"
-        data, _ = await get_cached_data(cache_key)
-        if not data:
-            market_service = get_market_service(market)
-            all_tags = market_service.get_tags()
-            data = all_tags.get(group, [])
-            await cache_data(cache_key, data)
-
-        return {"data": data}
+        tag_group = (await get_tag_index(market)).groups[group]
+        return precompressed_response(request, tag_group.full_body, f"{tag_group.etag}-all")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in api_tags_group_all: {str(e)}")
         raise HTTPException(status_code=500, detail=INTERNAL_SERVER_ERROR_MESSAGE)
+
+@router.get("/{group}/search")
+async def api_tags_group_search(request: Request, market: str, group: str,
+                                q: str = Query("", max_length=100, description="Prefix or substring to search for"),
+                                limit: int = Query(20, ge=1, le=settings.LIMIT)):
+    if group not in settings.GROUPS:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    try:
+        tag_group = (await get_tag_index(market)).groups[group]
+        # 결과는 태그 데이터(etag)와 정규화된 질의/limit으로 결정되므로 이를 ETag로 사용
+        query_hash = hashlib.sha256(f"{q.strip().lower()}\n{limit}".encode("utf-8")).hexdigest()[:16]
+        body = serialize({"data": tag_group.search(q, limit)})
+        return precompressed_response(request, body, f"{tag_group.etag}-search-{query_hash}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in api_tags_group_search: {str(e)}")
+        raise HTTPException(status_code=500, detail=INTERNAL_SERVER_ERROR_MESSAGE)
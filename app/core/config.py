@@ -1,16 +1,139 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 import os
 
 class Settings(BaseSettings):
     HF_API_TOKEN: str
+    # HuggingFace Hub base URL (huggingface_hub also reads HF_ENDPOINT from the environment)
+    HF_ENDPOINT: str = "https://huggingface.co"
     ALLOWED_ORIGINS: list = ["*"]
     CACHE_TIMEOUT: int = 3600
+    # per-endpoint freshness TTL (seconds); stale entries are served for CACHE_STALE_TTL more while refreshing
+    # ("files" only re-checks the repo sha; listings themselves are cached per sha for MODEL_FILES_CACHE_TTL)
+    # ("file_blob" maps a file on main to its blob so stored blobs are served without an upstream call)
+    CACHE_TTLS: dict = {"search": 300, "trending": 300, "files": 300, "detail": 900, "tags": 3600, "file_blob": 300}
+    CACHE_STALE_TTL: int = 86400
+    # model card metadata (per repo sha) and rendered card HTML (per card content hash)
+    MODEL_CARD_CACHE_TTL: int = 86400
+    # model file listings (per repo sha) and GET /models/{id}/files page size
+    MODEL_FILES_CACHE_TTL: int = 86400
+    FILES_PAGE_SIZE: int = 100
+    FILES_MAX_PAGE_SIZE: int = 1000
+    # in-process LRU tier bounds, and optional shared tier (ex: redis://127.0.0.1:6379/0)
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    # decoded values kept next to each JSON body take ~3-5x its size; charged to CACHE_MAX_BYTES per body byte
+    CACHE_VALUE_SIZE_RATIO: float = 4.0
+    CACHE_REDIS_URL: Optional[str] = None
+    CACHE_KEY_PREFIX: str = "hub-connect:"
     GROUPS: list = ["region", "other", "library", "license", "language", "dataset", "pipeline_tag"]
     LIMITED_GROUPS: list = ["language", "dataset"]
     LIMIT: int = 100
 
+    # outbound HTTP client (shared aiohttp session) settings
+    HTTP_POOL_SIZE: int = 100
+    HTTP_POOL_SIZE_PER_HOST: int = 20
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+    HTTP_DNS_CACHE_TTL: int = 300
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 30.0
+    HTTP_TOTAL_TIMEOUT: float = 60.0
+
+    # model file download: "stream" proxies upstream chunks (supports Range), "local" serves from the blob store
+    DOWNLOAD_MODE: str = "stream"
+    DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+    BLOB_STORE_DIR: str = "blob_store"
+    BLOB_STORE_MAX_BYTES: int = 50 * 1024 ** 3
+    # temp files untouched for this long are leftovers of a dead process (live downloads keep writing)
+    BLOB_STORE_TMP_MAX_AGE: int = 3600
+
+    # model list field projection: fields accepted by ?fields= and the default slim list schema
+    MODEL_FIELDS: list = ["id", "author", "downloads", "likes", "lastModified", "createdAt", "pipeline_tag",
+                          "library_name", "tags", "private", "gated", "cardData", "config", "safetensors",
+                          "trendingScore", "sha"]
+    MODEL_LIST_FIELDS: list = ["id", "author", "downloads", "likes", "lastModified", "pipeline_tag",
+                               "library_name", "tags"]
+
+    # POST /models/batch limits
+    BATCH_MAX_MODELS: int = 500
+    BATCH_CONCURRENCY: int = 8
+
+    # GET /models/export: upstream page size while following the cursor (Link header)
+    EXPORT_PAGE_SIZE: int = 1000
+
+    # JSON serializer for API responses and cache entries: "orjson", "msgspec" or "json"
+    JSON_BACKEND: str = "orjson"
+
+    # response compression (brotli / zstandard packages enable "br" / "zstd")
+    COMPRESSION_ENCODINGS: list = ["zstd", "br", "gzip"]
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # upstream resilience policy (timeouts, retries with jitter, in-flight cap, circuit breaker), overridable per market
+    UPSTREAM_DEFAULT_POLICY: dict = {
+        "connect_timeout": 5.0,
+        "read_timeout": 30.0,
+        "max_retries": 2,
+        "backoff_base": 0.5,
+        "backoff_max": 10.0,
+        "max_in_flight": 32,
+        "breaker_failure_threshold": 5,
+        "breaker_reset_timeout": 30.0,
+    }
+    UPSTREAM_POLICIES: dict = {"huggingface": {}}
+
+    # background cache warmer (intervals in seconds, jittered by WARMER_JITTER ratio)
+    WARMER_ENABLED: bool = True
+    WARMER_MARKETS: list = ["huggingface"]
+    WARMER_INTERVALS: dict = {"tags": 1800, "lists": 240, "details": 600}
+    WARMER_JITTER: float = 0.2
+    WARMER_CONCURRENCY: int = 2
+    WARMER_PAGES: int = 3
+    WARMER_PAGE_LIMIT: int = 30
+    WARMER_SORTS: list = ["downloads", "likes"]
+    WARMER_TOP_MODELS: int = 50
+    WARMER_ACCESS_STATS_MAX: int = 5000
+
+    # optional local model catalog (SQLite FTS5) serving search with accurate totals
+    CATALOG_ENABLED: bool = False
+    CATALOG_PATH: str = "catalog.db"
+    CATALOG_SYNC_INTERVAL: int = 3600
+    CATALOG_SYNC_PAGE_SIZE: int = 1000
+    CATALOG_SYNC_POPULAR_MODELS: int = 20000
+    CATALOG_SYNC_RECENT_MAX: int = 50000
+
+    # thread pool for blocking huggingface_hub SDK calls
+    EXECUTOR_MAX_WORKERS: int = 16
+    EXECUTOR_MAX_QUEUE: int = 64
+
+    # production server (run.py); in-process caches and /metrics are per worker process (labelled by pid)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8001
+    SERVER_WORKERS: int = 1
+    # with several workers only the holder of this file lock runs the catalog sync (and the warmer when
+    # CACHE_REDIS_URL is shared); the others retry every SERVER_LEADER_RETRY seconds to take over
+    SERVER_LEADER_LOCK: str = "hub-connect.lock"
+    SERVER_LEADER_RETRY: int = 30
+    # "auto" picks uvloop / httptools when installed
+    SERVER_LOOP: str = "auto"
+    SERVER_HTTP: str = "auto"
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_TIMEOUT: int = 5
+    # seconds to let in-flight requests finish after SIGTERM before connections are closed
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_ACCESS_LOG: bool = False
+
+    # Prometheus-style /metrics endpoint; market label values outside this list are reported as "other"
+    METRICS_ENABLED: bool = True
+    METRICS_MARKETS: list = ["huggingface", "aihub"]
+
     # log level setting (ex: DEBUG, INFO, WARNING, ERROR, CRITICAL)
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # sampling ratio (0.0 ~ 1.0) for high-volume log lines, by kind
+    LOG_SAMPLE_RATES: dict = {"external_api_call": 1.0}
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,73 @@
+import asyncio
+import fcntl
+import os
+from typing import Callable, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import registry
+
+
+class LeaderLock:
+    """여러 워커 프로세스 중 파일 잠금을 잡은 하나만 공유 자원을 갱신하는 작업(카탈로그 동기화 등)을 맡게 한다.
+
+    잠금은 프로세스가 종료되면 OS가 해제하므로, 리더 워커가 죽으면 남은 워커 중 하나가 재시도 주기 안에 이어받는다.
+    """
+
+    def __init__(self, path: str, retry_interval: float):
+        self.path = path
+        self.retry_interval = retry_interval
+        self._fd: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            # fd를 닫으면 잠금도 해제됨
+            os.close(self._fd)
+            self._fd = None
+
+    def start(self, on_acquired: Callable[[], None]):
+        """잠금을 잡으면 on_acquired를 호출한다. 다른 워커가 잡고 있으면 백그라운드에서 주기적으로 재시도."""
+        if self.try_acquire():
+            logger.info(f"Worker {os.getpid()} holds the leader lock {self.path}")
+            on_acquired()
+            return
+        self._task = asyncio.create_task(self._wait(on_acquired))
+
+    async def _wait(self, on_acquired: Callable[[], None]):
+        while not self.try_acquire():
+            await asyncio.sleep(self.retry_interval)
+        logger.info(f"Worker {os.getpid()} took over the leader lock {self.path}")
+        on_acquired()
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self.release()
+
+
+leader_lock = LeaderLock(settings.SERVER_LEADER_LOCK, settings.SERVER_LEADER_RETRY)
+
+registry.callback_gauge("hub_worker_leader", "1 in the worker that runs the catalog sync and shared cache warming", (),
+                        lambda: {(): 1 if leader_lock.held else 0})
@@ -1,18 +1,24 @@
+import atexit
 import logging
+import queue
+import random
+from contextvars import ContextVar
 from logging import LogRecord
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict
+from starlette.datastructures import QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.config import settings
 
+REQUEST_BODY_LOG_LIMIT = 1000
+
+# 요청별 컨텍스트. 동시 요청이 서로의 path/method를 덮어쓰지 않도록 contextvar로 분리
+request_context: ContextVar[Dict[str, Any]] = ContextVar("request_context", default={})
 
-class RequestInfoFilter(logging.Filter):
-    def __init__(self):
-        super().__init__()
-        self.request_info = {}
 
+class RequestInfoFilter(logging.Filter):
     def filter(self, record: LogRecord) -> bool:
-        for key, value in self.request_info.items():
+        for key, value in request_context.get().items():
             setattr(record, key, value)
         # Set default values for common fields if they're not present
         record.request_path = getattr(record, 'request_path', 'N/A')
@@ -20,41 +26,74 @@ class RequestInfoFilter(logging.Filter):
         return True
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        request_filter.request_info = {
-            "request_path": request.url.path,
-            "request_method": request.method,
-        }
-
-        if logger.level <= logging.DEBUG:
-            request_filter.request_info["request_params"] = str(dict(request.query_params))
-            body = await request.body()
-            body_str = body.decode() if body else ""
-            request_filter.request_info["request_body"] = body_str[:1000] + "..." if len(body_str) > 1000 else body_str
-
-        response = await call_next(request)
-        return response
+class LoggingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        info = {"request_path": scope["path"], "request_method": scope["method"]}
+        token = request_context.set(info)
+        try:
+            if logger.isEnabledFor(logging.DEBUG):
+                info["request_params"] = str(dict(QueryParams(scope.get("query_string", b""))))
+                info["request_body"] = ""
+                receive = self._capture_body(receive, info)
+            await self.app(scope, receive, send)
+        finally:
+            request_context.reset(token)
+
+    @staticmethod
+    def _capture_body(receive: Receive, info: Dict[str, Any]) -> Receive:
+        # 본문 전체를 미리 읽지 않고 앱이 읽어가는 청크에서 앞부분만 기록
+        captured = bytearray()
+
+        async def receive_with_capture() -> Message:
+            message = await receive()
+            if message["type"] == "http.request" and len(captured) <= REQUEST_BODY_LOG_LIMIT:
+                captured.extend(message.get("body", b"")[:REQUEST_BODY_LOG_LIMIT + 1 - len(captured)])
+                body_str = captured[:REQUEST_BODY_LOG_LIMIT].decode(errors="replace")
+                info["request_body"] = body_str + "..." if len(captured) > REQUEST_BODY_LOG_LIMIT else body_str
+            return message
+        return receive_with_capture
 
 
 def get_logging_level(level_name: str) -> int:
     return getattr(logging, level_name.upper(), logging.INFO)
 
 
+def sampled(kind: str) -> bool:
+    """LOG_SAMPLE_RATES에 지정된 비율만큼만 대량 로그를 남긴다."""
+    rate = settings.LOG_SAMPLE_RATES.get(kind, 1.0)
+    return rate >= 1.0 or random.random() < rate
+
+
 def setup_logging():
     log_level = get_logging_level(settings.LOG_LEVEL)
 
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s - Path: %(request_path)s - Method: %(request_method)s",
-        handlers=[
-            logging.FileHandler("app.log"),
-            logging.StreamHandler()
-        ]
+    # 파일/콘솔 출력은 별도 스레드(QueueListener)에서 처리해 이벤트 루프를 막지 않음
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s - Path: %(request_path)s - Method: %(request_method)s"
     )
-    logger = logging.getLogger(__name__)
+    handlers = [logging.FileHandler("app.log"), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    listener = QueueListener(queue.SimpleQueue(), *handlers, respect_handler_level=True)
+
+    # 요청 컨텍스트는 로그를 남기는 쪽(요청 처리 중인 태스크)에서 채워야 하므로 QueueHandler에 필터를 둠
     request_filter = RequestInfoFilter()
-    logger.addFilter(request_filter)
+    queue_handler = QueueHandler(listener.queue)
+    # 메시지 인자만 병합하고 최종 포맷은 리스너 쪽 핸들러에서 적용
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    queue_handler.addFilter(request_filter)
+    logging.basicConfig(level=log_level, handlers=[queue_handler])
+
+    listener.start()
+    atexit.register(listener.stop)
+    logger = logging.getLogger(__name__)
     return logger, request_filter
 
 
@@ -63,4 +102,7 @@ logger, request_filter = setup_logging()
 
 # Function to log external API calls
 def log_external_api_call(url: str, method: str, params: dict = None, data: dict = None):
-    logger.info(f"External API Call - URL: {url}, Method: {method}, Params: {params}, Data: {data}")
\ No newline at end of file
+    # 비활성 레벨이거나 샘플링에서 제외되면 메시지 포맷팅 자체를 생략
+    if not logger.isEnabledFor(logging.INFO) or not sampled("external_api_call"):
+        return
+    logger.info("External API Call - URL: %s, Method: %s, Params: %s, Data: %s", url, method, params, data)
@@ -0,0 +1,211 @@
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from starlette.datastructures import QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+LabelValues = Tuple[str, ...]
+
+# 요청/업스트림 지연 시간 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """이벤트 루프에서만 갱신하는 단순 카운터 (락 없이 dict 연산만 수행)."""
+
+    type = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def render(self, const: str = "") -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels, const)} {_format_value(value)}"
+                for labels, value in self.values.items()]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, *labels: str, value: float):
+        self.values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+
+class CallbackGauge:
+    """수집 시점에 callback이 돌려주는 {레이블 튜플: 값}을 그대로 노출한다 (기록 비용 없음)."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...],
+                 callback: Callable[[], Dict[LabelValues, float]]):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.callback = callback
+
+    def render(self, const: str = "") -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels, const)} {_format_value(value)}"
+                for labels, value in self.callback().items()]
+
+
+class CallbackCounter(CallbackGauge):
+    """다른 모듈이 이미 누적하고 있는 단조 증가 값을 counter로 노출한다."""
+
+    type = "counter"
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # 레이블별 [버킷별 개수(+Inf 포함, 비누적), 합계, 개수]
+        self.series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, const: str = "") -> List[str]:
+        lines = []
+        for labels, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                le = f"{const},{le}" if const else le
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels, const)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels, const)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        # 모듈 재로딩 등으로 같은 이름이 다시 등록되면 기존 지표를 재사용
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, description, labelnames))
+
+    def gauge(self, name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, description, labelnames))
+
+    def histogram(self, name: str, description: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, description, labelnames, buckets))
+
+    def callback_gauge(self, name: str, description: str, labelnames: Tuple[str, ...],
+                       callback: Callable[[], Dict[LabelValues, float]]) -> CallbackGauge:
+        return self.register(CallbackGauge(name, description, labelnames, callback))
+
+    def callback_counter(self, name: str, description: str, labelnames: Tuple[str, ...],
+                         callback: Callable[[], Dict[LabelValues, float]]) -> CallbackCounter:
+        return self.register(CallbackCounter(name, description, labelnames, callback))
+
+    def render(self, worker_label: bool = False) -> str:
+        # 워커 프로세스마다 지표가 따로 집계되므로 여러 워커로 실행할 때는 pid 레이블로 구분 (합산은 sum without(worker))
+        const = f'worker="{os.getpid()}"' if worker_label else ""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render(const))
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "hub_http_request_duration_seconds", "HTTP request latency by route template",
+    ("route", "method", "status", "market"))
+http_requests_in_flight = registry.gauge("hub_http_requests_in_flight", "HTTP requests currently being served")
+http_response_bytes = registry.counter(
+    "hub_http_response_bytes_total", "Response body bytes sent (after compression)", ("route", "market"))
+
+
+class MetricsMiddleware:
+    """요청 지연/상태/전송 바이트를 라우트 템플릿 기준으로 기록한다 (경로 값은 레이블로 쓰지 않음)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+        sent = 0
+
+        async def send_with_metrics(message: Message):
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            # 매칭되지 않은 경로는 하나의 레이블로 묶어 레이블 수가 늘어나지 않도록 함
+            route_path = getattr(route, "path", None) or "unmatched"
+            market = _market(scope)
+            http_request_duration.observe(time.perf_counter() - started, route_path, scope["method"], status, market)
+            http_response_bytes.inc(route_path, market, amount=sent)
+
+
+def _market(scope: Scope) -> str:
+    query_string = scope.get("query_string", b"")
+    if b"market=" not in query_string:
+        return ""
+    market = QueryParams(query_string).get("market", "")
+    return market if market in settings.METRICS_MARKETS else "other"
+
+
+def render_metrics() -> str:
+    return registry.render(worker_label=settings.SERVER_WORKERS > 1)
+
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.logging import logger
+from app.core.metrics import registry
+
+
+class Readiness:
+    """기동 warm-up(마켓 모듈 import, 카탈로그 동기화/캐시 워머 시작) 완료 여부를 추적한다.
+
+    서버는 warm-up을 기다리지 않고 바로 연결을 받으며 (live check는 즉시 응답),
+    로드밸런서는 /ready 가 200을 돌려줄 때부터 트래픽을 보낸다.
+    """
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None and not self.stopping
+
+    def start(self, warm_up: Callable[[], Awaitable[None]]):
+        self.started_at = time.monotonic()
+        self.ready_at = None
+        self.stopping = False
+        self._task = asyncio.create_task(self._run(warm_up))
+
+    async def _run(self, warm_up: Callable[[], Awaitable[None]]):
+        try:
+            await warm_up()
+        except Exception as e:
+            # warm-up 실패는 업스트림 장애일 수 있으므로 기록만 하고 요청은 받음 (캐시/요청 시점 생성으로 처리)
+            logger.error(f"Error during warm-up: {str(e)}")
+        self.ready_at = time.monotonic()
+        logger.info(f"Application ready after {self.ready_at - self.started_at:.3f}s warm-up")
+
+    async def stop(self):
+        # 종료 중에는 not ready로 전환해 새 트래픽이 들어오지 않도록 함
+        self.stopping = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def warmup_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.ready_at is None:
+            return None
+        return self.ready_at - self.started_at
+
+    def status(self) -> Dict[str, Any]:
+        warmup = self.warmup_seconds()
+        return {
+            "status": "ready" if self.ready else ("stopping" if self.stopping else "starting"),
+            "warmup_seconds": round(warmup, 3) if warmup is not None else None,
+            "uptime_seconds": round(time.monotonic() - self.started_at, 3) if self.started_at is not None else None,
+        }
+
+
+readiness = Readiness()
+
+registry.callback_gauge("hub_ready", "1 once startup warm-up has finished and the process accepts traffic", (),
+                        lambda: {(): 1 if readiness.ready else 0})
+registry.callback_gauge("hub_startup_warmup_seconds", "Time from startup to readiness", (),
+                        lambda: {(): readiness.warmup_seconds()} if readiness.warmup_seconds() is not None else {})
@@ -0,0 +1,49 @@
+import json
+from datetime import date, datetime
+from typing import Any, Callable
+
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return str(value)
+
+
+def _stdlib_dumps(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def _load_dumps(backend: str) -> Callable[[Any], bytes]:
+    if backend == "orjson":
+        try:
+            import orjson
+            options = orjson.OPT_NON_STR_KEYS
+            return lambda data: orjson.dumps(data, default=_default, option=options)
+        except ImportError:
+            logger.warning("orjson is not installed, falling back to the json module")
+    elif backend == "msgspec":
+        try:
+            import msgspec
+            encoder = msgspec.json.Encoder(enc_hook=_default)
+            return encoder.encode
+        except ImportError:
+            logger.warning("msgspec is not installed, falling back to the json module")
+    return _stdlib_dumps
+
+
+# 설정된 백엔드(orjson / msgspec / json)로 한 번만 결정
+json_dumps: Callable[[Any], bytes] = _load_dumps(settings.JSON_BACKEND)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON_BACKEND로 직렬화하는 기본 응답 클래스."""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
@@ -1,12 +1,24 @@
 from fastapi import FastAPI, APIRouter
 from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.core.config import settings
-from app.api import models, tags
+from app.api import admin, models, tags
+from app.core.compression import CompressionMiddleware
+from app.core.leader import leader_lock
 from app.core.logging import logger, LoggingMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.readiness import readiness
+from app.core.responses import FastJSONResponse
+from app.services.blob_store import get_blob_store
+from app.services.catalog import start_catalog_sync, stop_catalog_sync
+from app.services.cache_warmer import start_cache_warmer, stop_cache_warmer
+from app.services.caching import cache
+from app.services.executor import get_executor, shutdown_executor
+from app.services.http_client import open_http_session, close_http_session
+from app.services.markets.common import market_registry
 import logging
 
 app = FastAPI(
@@ -14,10 +26,12 @@ app = FastAPI(
     description="API for connecting 3rd party models to AI-PaaS",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -25,6 +39,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 
 # Exception handlers
@@ -47,12 +62,27 @@ async def root():
     return {"message": "Live check"}
 
 
+# Readiness check: 503 until startup warm-up has finished (and again while shutting down)
+@app.get("/ready")
+async def ready():
+    status = readiness.status()
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=status)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        raise StarletteHTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 # Create a prefix router
 prefix_router = APIRouter(prefix="/api/v1")
 
 # Include other routers in the prefix_router
 prefix_router.include_router(models.router, prefix="/models", tags=["models"])
 prefix_router.include_router(tags.router, prefix="/tags", tags=["tags"])
+prefix_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 
 
 # Add a new endpoint to show all routes under /api/v1
@@ -80,7 +110,39 @@ app.include_router(prefix_router)
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"Application is starting up. Log level: {settings.LOG_LEVEL}")
+    await open_http_session()
+    get_executor()
+    get_blob_store()
+    # 마켓 모듈 로딩과 백그라운드 작업 시작은 서버가 연결을 받기 시작한 뒤 진행 (/ready로 완료 확인)
+    readiness.start(warm_up)
+
+
+async def warm_up():
+    await market_registry.startup()
+    if settings.SERVER_WORKERS <= 1:
+        start_catalog_sync()
+        start_cache_warmer()
+        return
+    # 여러 워커: 카탈로그 파일과 공유(Redis) 캐시는 잠금을 잡은 워커 하나만 갱신, 메모리 캐시 워밍은 워커마다 수행
+    if not settings.CACHE_REDIS_URL:
+        start_cache_warmer()
+    leader_lock.start(start_leader_jobs)
+
+
+def start_leader_jobs():
+    start_catalog_sync()
+    if settings.CACHE_REDIS_URL:
+        start_cache_warmer()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    logging.info("Application is shutting down")
\ No newline at end of file
+    logging.info("Application is shutting down")
+    await readiness.stop()
+    await stop_cache_warmer()
+    await stop_catalog_sync()
+    await leader_lock.stop()
+    await market_registry.shutdown()
+    await close_http_session()
+    shutdown_executor()
+    await cache.close()
\ No newline at end of file
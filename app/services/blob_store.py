@@ -0,0 +1,213 @@
+import asyncio
+import contextvars
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import aiohttp
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.executor import get_executor
+from app.services.http_client import get_http_session
+
+# blob_id는 git OID(sha1) 또는 sha256 hex 문자열만 허용 (경로 조작 방지)
+BLOB_ID_PATTERN = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _hash_and_write(digest, file, chunk: bytes):
+    digest.update(chunk)
+    file.write(chunk)
+
+
+async def _run_io(func: Callable, *args) -> Any:
+    # 이미 시작된 다운로드가 executor 대기열 한도(503)로 중간에 실패하지 않도록 admission 없이 공용 풀에서 실행
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), context.run, func, *args)
+
+
+class BlobFileResponse(FileResponse):
+    # 로컬 blob은 큰 청크로 읽어 read/send 호출 횟수를 줄임 (Range 요청은 FileResponse가 처리)
+    chunk_size = settings.DOWNLOAD_CHUNK_SIZE
+
+
+class BlobStore:
+    """blob_id 기준으로 중복 없이 모델 파일을 보관하고, 디스크 한도를 넘으면 가장 오래 사용하지 않은 파일부터 삭제한다.
+
+    여러 워커 프로세스가 같은 디렉터리를 공유할 수 있도록 디스크를 기준 상태로 사용한다:
+    조회는 파일 존재 여부로 판단하고 mtime을 마지막 사용 시각으로 갱신하며, 저장 직전에 디렉터리를 다시 스캔해
+    전체 사용량 기준으로 한도를 적용한다. 임시 파일 이름에는 PID를 넣고, 시작 시에는 오래된 임시 파일만 정리한다.
+    """
+
+    def __init__(self, root: str, max_bytes: int, tmp_max_age: float = 3600):
+        self.root = root
+        self.blobs_dir = os.path.join(root, "blobs")
+        self.tmp_dir = os.path.join(root, "tmp")
+        self.max_bytes = max_bytes
+        self.tmp_max_age = tmp_max_age
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        # 디스크 작업은 executor 스레드에서 수행되므로 인덱스 갱신을 직렬화
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_fetched = 0
+
+    def load(self):
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        # 이전 프로세스가 남긴 미완성 임시 파일 정리 (다른 워커가 쓰는 중인 파일은 mtime이 계속 갱신되므로 제외)
+        now = time.time()
+        for entry in os.scandir(self.tmp_dir):
+            try:
+                if now - entry.stat().st_mtime > self.tmp_max_age:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            self._scan()
+            self._make_room(0)
+        logger.info(f"Blob store loaded: {len(self._entries)} blobs, {self._bytes} bytes in {self.root}")
+
+    def _scan(self):
+        blobs = []
+        for entry in os.scandir(self.blobs_dir):
+            if BLOB_ID_PATTERN.fullmatch(entry.name):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                blobs.append((stat.st_mtime, entry.name, stat.st_size))
+        self._entries.clear()
+        self._bytes = 0
+        for _, blob_id, size in sorted(blobs):
+            self._entries[blob_id] = size
+            self._bytes += size
+
+    def path_for(self, blob_id: str) -> str:
+        if not BLOB_ID_PATTERN.fullmatch(blob_id):
+            raise ValueError(f"Invalid blob id: {blob_id}")
+        return os.path.join(self.blobs_dir, blob_id)
+
+    async def lookup(self, blob_id: str) -> Optional[str]:
+        path = self.path_for(blob_id)
+        if await _run_io(self._touch, blob_id, path):
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def _touch(self, blob_id: str, path: str) -> bool:
+        try:
+            # 재시작 후에도(다른 워커에서도) LRU 순서가 유지되도록 mtime을 마지막 사용 시각으로 갱신
+            os.utime(path)
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(blob_id)
+            return False
+        with self._lock:
+            self._forget(blob_id)
+            self._entries[blob_id] = size
+            self._bytes += size
+        return True
+
+    async def fetch(self, blob_id: str, url: str, size: int, sha256: Optional[str] = None,
+                    headers: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """업스트림에서 blob을 내려받아 검증 후 저장한다. 한도보다 큰 파일은 저장하지 않고 None을 반환한다."""
+        path = self.path_for(blob_id)
+        if size > self.max_bytes:
+            return None
+
+        tmp_path = os.path.join(self.tmp_dir, f"{blob_id}.{os.getpid()}.{uuid.uuid4().hex}")
+        # LFS 파일은 내용의 sha256, 일반 파일은 git blob sha1으로 무결성 검증
+        digest = hashlib.sha256() if sha256 else hashlib.sha1(f"blob {size}\0".encode())
+        expected = sha256 or blob_id
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=settings.HTTP_CONNECT_TIMEOUT,
+                                        sock_read=settings.HTTP_READ_TIMEOUT)
+        file = await _run_io(open, tmp_path, "wb")
+        try:
+            try:
+                async with get_http_session().get(url, headers=headers, timeout=timeout) as response:
+                    response.raise_for_status()
+                    async for chunk in response.content.iter_chunked(settings.DOWNLOAD_CHUNK_SIZE):
+                        # 해시 계산(수 GB 파일이면 CPU 수 초)도 쓰기와 함께 executor에서 수행
+                        await _run_io(_hash_and_write, digest, file, chunk)
+            finally:
+                await _run_io(file.close)
+            if digest.hexdigest() != expected:
+                raise ValueError(f"Checksum mismatch for blob {blob_id}")
+
+            await _run_io(self._commit, blob_id, tmp_path, path, size)
+            tmp_path = None
+        finally:
+            # 실패/취소 시 임시 파일 삭제 (취소되어도 executor 작업은 끝까지 실행됨)
+            if tmp_path is not None:
+                await _run_io(_remove_quietly, tmp_path)
+
+        self.bytes_fetched += size
+        return path
+
+    def _commit(self, blob_id: str, tmp_path: str, path: str, size: int):
+        with self._lock:
+            # 다른 워커가 저장/삭제한 blob까지 반영해 공유 디렉터리 전체 기준으로 한도 적용
+            self._scan()
+            self._forget(blob_id)
+            self._make_room(size)
+            os.replace(tmp_path, path)
+            self._entries[blob_id] = size
+            self._bytes += size
+
+    def _make_room(self, size: int):
+        while self._entries and self._bytes + size > self.max_bytes:
+            blob_id, _ = next(iter(self._entries.items()))
+            self._forget(blob_id)
+            _remove_quietly(os.path.join(self.blobs_dir, blob_id))
+            self.evictions += 1
+            logger.info(f"Blob evicted: {blob_id}")
+
+    def _forget(self, blob_id: str):
+        size = self._entries.pop(blob_id, None)
+        if size is not None:
+            self._bytes -= size
+
+    def usage(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "root": os.path.abspath(self.root),
+            "blobs": len(self._entries),
+            "used_bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "usage_ratio": round(self._bytes / self.max_bytes, 4) if self.max_bytes else 0.0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes_fetched": self.bytes_fetched,
+        }
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(settings.BLOB_STORE_DIR, settings.BLOB_STORE_MAX_BYTES, settings.BLOB_STORE_TMP_MAX_AGE)
+        _blob_store.load()
+    return _blob_store
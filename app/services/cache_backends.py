@@ -0,0 +1,146 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.logging import logger
+
+
+class TierStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+class MemoryLRUTier:
+    """프로세스 내 LRU 캐시. 항목 수와 바이트 예산 중 먼저 초과하는 한도에 맞춰 오래된 항목부터 제거한다."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = TierStats()
+        self._items: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._items.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return None
+        value, expires_at, _ = item
+        if expires_at <= time.time():
+            self._remove(key)
+            self.stats.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float, size: int):
+        if key in self._items:
+            self._remove(key)
+        if size > self.max_bytes:
+            # 한 항목이 전체 예산보다 크면 다른 항목을 모두 밀어내지 않도록 저장하지 않음
+            return
+        self._items[key] = (value, time.time() + ttl, size)
+        self._bytes += size
+        self.stats.sets += 1
+        while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._items))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+    async def delete(self, key: str):
+        if key in self._items:
+            self._remove(key)
+
+    async def clear(self):
+        self._items.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        _, _, size = self._items.pop(key)
+        self._bytes -= size
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats.snapshot(),
+            "entries": len(self._items),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class RedisTier:
+    """여러 워커/노드가 공유하는 Redis 프로토콜 캐시. client는 redis.asyncio.Redis 호환 객체이다."""
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str):
+        self.client = client
+        self.prefix = prefix
+        self.stats = TierStats()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            payload = await self.client.get(self.prefix + key)
+        except Exception as e:
+            # 공유 캐시 장애는 요청 실패가 아니라 miss로 처리
+            self.stats.errors += 1
+            logger.error(f"Redis cache get failed: {str(e)}")
+            return None
+        if payload is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return payload
+
+    async def set(self, key: str, payload: bytes, ttl: float):
+        try:
+            await self.client.set(self.prefix + key, payload, px=max(int(ttl * 1000), 1))
+            self.stats.sets += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(f"Redis cache set failed: {str(e)}")
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(f"Redis cache delete failed: {str(e)}")
+
+    async def clear(self):
+        keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def close(self):
+        await self.client.aclose()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self.stats.snapshot()
+
+
+def create_redis_client(url: str):
+    try:
+        from redis import asyncio as redis_asyncio
+    except ImportError:
+        raise RuntimeError("CACHE_REDIS_URL is set but the 'redis' package is not installed")
+    return redis_asyncio.from_url(url)
@@ -0,0 +1,156 @@
+import asyncio
+import random
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.caching import warm_entry
+from app.services.markets.common import get_market_service
+from app.services.resilience import CircuitBreaker, get_upstream_guard
+from app.services.tag_index import tags_fetcher
+
+
+class AccessStats:
+    """모델 상세 요청 횟수. 최대 개수를 넘으면 상위 절반만 남겨 메모리를 제한한다."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._counts: Dict[str, Counter] = {}
+
+    def record(self, market: str, model_id: str, card_html: bool = True):
+        counts = self._counts.setdefault(market, Counter())
+        counts[(model_id, card_html)] += 1
+        if len(counts) > self.max_entries:
+            self._counts[market] = Counter(dict(counts.most_common(self.max_entries // 2)))
+
+    def top(self, market: str, k: int) -> List[Tuple[str, bool]]:
+        return [key for key, _ in self._counts.get(market, Counter()).most_common(k)]
+
+
+access_stats = AccessStats(settings.WARMER_ACCESS_STATS_MAX)
+
+
+def _default_fields_key() -> str:
+    # api_models에서 fields 미지정 요청과 같은 캐시 키를 사용
+    return ",".join(settings.MODEL_LIST_FIELDS)
+
+
+class CacheWarmer:
+    """태그, 인기 목록 첫 페이지들, 많이 조회된 모델 상세를 주기적으로 미리 갱신한다.
+
+    주기에는 지터를 더해 워커 간 갱신 시점이 겹치지 않게 하고, 동시 갱신 수를 제한하며
+    업스트림이 바쁘거나 서킷이 열려 있으면 해당 항목을 건너뛰어 실제 요청과 경쟁하지 않는다.
+    """
+
+    def __init__(self, markets: List[str], concurrency: int, intervals: Dict[str, float], jitter: float):
+        self.markets = markets
+        self.intervals = intervals
+        self.jitter = jitter
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: List[asyncio.Task] = []
+        self.stats = {"runs": 0, "warmed": 0, "skipped": 0, "deferred": 0, "errors": 0}
+
+    def start(self):
+        if self._tasks:
+            return
+        jobs = {"tags": self.warm_tags, "lists": self.warm_lists, "details": self.warm_details}
+        for market in self.markets:
+            for name, job in jobs.items():
+                self._tasks.append(asyncio.create_task(self._run_periodically(market, name, job)))
+        logger.info(f"Cache warmer started: {len(self._tasks)} jobs")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run_periodically(self, market: str, name: str, job: Callable[[str], Awaitable[None]]):
+        interval = self.intervals[name]
+        # 기동 직후 모든 작업이 동시에 시작하지 않도록 첫 실행도 분산
+        await asyncio.sleep(random.uniform(0, self.jitter * interval))
+        while True:
+            try:
+                await job(market)
+                self.stats["runs"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Error in cache warmer {market} {name}: {str(e)}")
+            await asyncio.sleep(self._jittered(interval))
+
+    def _lead(self, name: str) -> float:
+        # 다음 실행 전에 만료될 항목만 갱신
+        return self.intervals[name] * (1 + self.jitter)
+
+    async def _warm(self, market: str, name: str, endpoint: str, params: Dict[str, Any],
+                    fetch: Callable[[], Awaitable[Any]]):
+        async with self._semaphore:
+            guard = get_upstream_guard(market)
+            if guard.breaker.state != CircuitBreaker.CLOSED or \
+                    guard.stats()["in_flight"] >= guard.policy.max_in_flight // 2:
+                self.stats["deferred"] += 1
+                return
+            try:
+                warmed = await warm_entry(market, endpoint, params, fetch, lead=self._lead(name))
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Error warming {market} {endpoint} {params}: {str(e)}")
+                return
+            self.stats["warmed" if warmed else "skipped"] += 1
+
+    async def warm_tags(self, market: str):
+        await self._warm(market, "tags", "tags", {}, tags_fetcher(market))
+
+    async def warm_lists(self, market: str):
+        service = get_market_service(market)
+        fields = list(settings.MODEL_LIST_FIELDS)
+        fields_key = _default_fields_key()
+        limit = settings.WARMER_PAGE_LIMIT
+        jobs = []
+        for page in range(1, settings.WARMER_PAGES + 1):
+            jobs.append(self._warm(market, "lists", "trending", {"query": "", "page": page, "fields": fields_key},
+                                   lambda page=page: service.get_trending_models(page, "", fields)))
+            for sort in settings.WARMER_SORTS:
+                params = {"query": "", "sort": sort, "page": page, "limit": limit, "fields": fields_key}
+                jobs.append(self._warm(market, "lists", "search", params,
+                                       lambda sort=sort, page=page: service.search_models("", sort, page, limit, fields)))
+        await asyncio.gather(*jobs)
+
+    async def warm_details(self, market: str):
+        service = get_market_service(market)
+        jobs = [
+            self._warm(market, "details", "detail", {"model_id": model_id, "card_html": card_html},
+                       lambda model_id=model_id, card_html=card_html:
+                       service.get_model_detail(model_id, include_html=card_html))
+            for model_id, card_html in access_stats.top(market, settings.WARMER_TOP_MODELS)
+        ]
+        await asyncio.gather(*jobs)
+
+
+_warmer: Optional[CacheWarmer] = None
+
+
+def start_cache_warmer() -> Optional[CacheWarmer]:
+    global _warmer
+    if not settings.WARMER_ENABLED:
+        return None
+    if _warmer is None:
+        _warmer = CacheWarmer(settings.WARMER_MARKETS, settings.WARMER_CONCURRENCY,
+                              settings.WARMER_INTERVALS, settings.WARMER_JITTER)
+    _warmer.start()
+    return _warmer
+
+
+async def stop_cache_warmer():
+    if _warmer is not None:
+        await _warmer.stop()
+
+
+def get_warmer_stats() -> Dict[str, Any]:
+    return dict(_warmer.stats) if _warmer is not None else {}
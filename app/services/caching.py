@@ -1,18 +1,237 @@
-from aiocache import Cache
+import asyncio
 import hashlib
 import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
 from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import registry
+from app.core.responses import json_dumps
+from app.services.cache_backends import MemoryLRUTier, RedisTier, create_redis_client
+from app.services.singleflight import upstream_flight
 
-cache = Cache(Cache.MEMORY)
+_MISSING = object()
 
-async def cache_data(key, data, timeout=settings.CACHE_TIMEOUT):
-    data_bytes = json.dumps(data).encode('utf-8')
-    data_hash = hashlib.sha256(data_bytes).hexdigest()
 
-    await cache.set(key, data, ttl=timeout)
-    await cache.set(f"{key}_hash", data_hash, ttl=timeout)
+def serialize(data: Any) -> bytes:
+    return json_dumps(data)
 
-async def get_cached_data(key):
-    data = await cache.get(key)
-    data_hash = await cache.get(f"{key}_hash")
-    return data, data_hash
+
+class CacheEntry:
+    """직렬화된 본문(bytes)과 한 번만 계산한 콘텐츠 해시를 함께 보관하는 캐시 레코드."""
+
+    __slots__ = ("body", "etag", "stored_at", "fresh_until", "_value")
+
+    def __init__(self, body: bytes, ttl: float, value: Any = _MISSING, etag: Optional[str] = None,
+                 stored_at: Optional[float] = None):
+        self.body = body
+        self.etag = etag or hashlib.sha256(body).hexdigest()
+        self.stored_at = stored_at if stored_at is not None else time.time()
+        self.fresh_until = self.stored_at + ttl
+        self._value = value
+
+    @classmethod
+    def from_value(cls, value: Any, ttl: float) -> "CacheEntry":
+        return cls(serialize(value), ttl, value=value)
+
+    @property
+    def value(self) -> Any:
+        # 공유 캐시에서 읽어온 항목은 처음 접근할 때 한 번만 역직렬화
+        if self._value is _MISSING:
+            self._value = json.loads(self.body)
+        return self._value
+
+    def memory_size(self) -> int:
+        # 메모리 계층은 본문과 함께 역직렬화된 값(객체 그래프)도 보관하므로 그 추정치까지 예산에 포함
+        return int(len(self.body) * (1 + settings.CACHE_VALUE_SIZE_RATIO))
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.fresh_until
+
+    def to_record(self, expires_at: float) -> bytes:
+        header = json.dumps({"etag": self.etag, "stored_at": self.stored_at,
+                             "fresh_until": self.fresh_until, "expires_at": expires_at})
+        return header.encode("utf-8") + b"\n" + self.body
+
+    @classmethod
+    def from_record(cls, record: bytes) -> Tuple["CacheEntry", float]:
+        header, body = record.split(b"\n", 1)
+        meta = json.loads(header)
+        entry = cls(body, meta["fresh_until"] - meta["stored_at"], etag=meta["etag"], stored_at=meta["stored_at"])
+        return entry, meta["expires_at"]
+
+
+class TieredCache:
+    """메모리 LRU 1차 캐시와 선택적인 공유(Redis) 2차 캐시를 묶은 캐시."""
+
+    def __init__(self, memory: MemoryLRUTier, shared: Optional[RedisTier] = None):
+        self.memory = memory
+        self.shared = shared
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = await self.memory.get(key)
+        if entry is not None or self.shared is None:
+            return entry
+
+        record = await self.shared.get(key)
+        if record is None:
+            return None
+        entry, expires_at = CacheEntry.from_record(record)
+        ttl = expires_at - time.time()
+        if ttl <= 0:
+            return None
+        # 공유 캐시 hit은 남은 TTL 동안 로컬 메모리로 승격
+        await self.memory.set(key, entry, ttl, entry.memory_size())
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry, ttl: float):
+        await self.memory.set(key, entry, ttl, entry.memory_size())
+        if self.shared is not None:
+            await self.shared.set(key, entry.to_record(time.time() + ttl), ttl)
+
+    async def delete(self, key: str):
+        await self.memory.delete(key)
+        if self.shared is not None:
+            await self.shared.delete(key)
+
+    async def clear(self):
+        await self.memory.clear()
+        if self.shared is not None:
+            await self.shared.clear()
+
+    async def close(self):
+        if self.shared is not None:
+            await self.shared.close()
+
+    def stats(self) -> Dict[str, Any]:
+        tiers = {self.memory.name: self.memory.snapshot()}
+        if self.shared is not None:
+            tiers[self.shared.name] = self.shared.snapshot()
+        return tiers
+
+
+def create_cache() -> TieredCache:
+    memory = MemoryLRUTier(settings.CACHE_MAX_ENTRIES, settings.CACHE_MAX_BYTES)
+    shared = None
+    if settings.CACHE_REDIS_URL:
+        shared = RedisTier(create_redis_client(settings.CACHE_REDIS_URL), settings.CACHE_KEY_PREFIX)
+    return TieredCache(memory, shared)
+
+
+cache = create_cache()
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    return cache.stats()
+
+
+def _tier_values(key: str) -> Dict[Tuple[str, ...], float]:
+    return {(tier,): stats[key] for tier, stats in cache.stats().items() if key in stats}
+
+
+registry.callback_counter("hub_cache_tier_hits_total", "Cache tier hits", ("tier",), lambda: _tier_values("hits"))
+registry.callback_counter("hub_cache_tier_misses_total", "Cache tier misses", ("tier",),
+                          lambda: _tier_values("misses"))
+registry.callback_counter("hub_cache_tier_evictions_total", "Entries evicted from the cache tier to stay within bounds",
+                          ("tier",), lambda: _tier_values("evictions"))
+registry.callback_gauge("hub_cache_tier_bytes", "Bytes held by the cache tier", ("tier",), lambda: _tier_values("bytes"))
+
+
+async def cache_data(key, data, timeout=settings.CACHE_TIMEOUT) -> CacheEntry:
+    entry = CacheEntry.from_value(data, timeout)
+    await cache.set(key, entry, ttl=timeout)
+    return entry
+
+async def get_cached_entry(key) -> Optional[CacheEntry]:
+    return await cache.get(key)
+
+
+# --- stale-while-revalidate response cache ---
+
+# 키별로 하나의 백그라운드 갱신 작업만 유지
+_refresh_tasks: Dict[str, asyncio.Task] = {}
+
+cache_requests = registry.counter("hub_cache_requests_total", "Response cache lookups by result (hit, stale, miss)",
+                                  ("endpoint", "result"))
+
+
+def get_ttl(endpoint: str) -> int:
+    return settings.CACHE_TTLS.get(endpoint, settings.CACHE_TIMEOUT)
+
+
+def make_cache_key(market: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    # 파라미터 순서, 공백, 빈 값 차이로 같은 요청이 다른 키가 되지 않도록 정규화
+    normalized = []
+    for name in sorted(params or {}):
+        value = params[name]
+        if value is None or value == "":
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        normalized.append((name, value))
+    # 값에 '&', '=' 등이 들어 있어도 다른 파라미터 조합과 같은 키가 되지 않도록 인코딩
+    return f"{market}:{endpoint}:{urlencode(normalized, doseq=True)}"
+
+
+async def _store(key: str, endpoint: str, value: Any) -> CacheEntry:
+    ttl = get_ttl(endpoint)
+    entry = CacheEntry.from_value(value, ttl)
+    await cache.set(key, entry, ttl=ttl + settings.CACHE_STALE_TTL)
+    return entry
+
+
+async def _fetch_and_store(key: str, endpoint: str, fetch: Callable[[], Awaitable[Any]]) -> CacheEntry:
+    # 같은 키의 miss/갱신이 동시에 발생해도 업스트림 호출은 한 번만 수행
+    async def load():
+        return await _store(key, endpoint, await fetch())
+    return await upstream_flight.do(key, load)
+
+
+async def _refresh(key: str, endpoint: str, fetch: Callable[[], Awaitable[Any]]):
+    try:
+        await _fetch_and_store(key, endpoint, fetch)
+        logger.debug(f"Cache refreshed: {key}")
+    except Exception as e:
+        # 갱신 실패 시 기존 stale 항목을 그대로 유지
+        logger.error(f"Error refreshing cache key {key}: {str(e)}")
+    finally:
+        _refresh_tasks.pop(key, None)
+
+
+def _schedule_refresh(key: str, endpoint: str, fetch: Callable[[], Awaitable[Any]]):
+    if key in _refresh_tasks:
+        return
+    _refresh_tasks[key] = asyncio.create_task(_refresh(key, endpoint, fetch))
+
+
+async def cached_fetch_entry(market: str, endpoint: str, params: Dict[str, Any],
+                             fetch: Callable[[], Awaitable[Any]]) -> CacheEntry:
+    key = make_cache_key(market, endpoint, params)
+    entry = await cache.get(key)
+    if entry is not None:
+        if not entry.is_fresh():
+            cache_requests.inc(endpoint, "stale")
+            _schedule_refresh(key, endpoint, fetch)
+        else:
+            cache_requests.inc(endpoint, "hit")
+        return entry
+
+    cache_requests.inc(endpoint, "miss")
+    return await _fetch_and_store(key, endpoint, fetch)
+
+
+async def cached_fetch(market: str, endpoint: str, params: Dict[str, Any],
+                       fetch: Callable[[], Awaitable[Any]]) -> Any:
+    return (await cached_fetch_entry(market, endpoint, params, fetch)).value
+
+
+async def warm_entry(market: str, endpoint: str, params: Dict[str, Any],
+                     fetch: Callable[[], Awaitable[Any]], lead: float = 0.0) -> bool:
+    """만료가 lead초 이내로 남았거나 없는 항목만 미리 갱신한다. 갱신했으면 True."""
+    key = make_cache_key(market, endpoint, params)
+    entry = await cache.get(key)
+    if entry is not None and entry.fresh_until - time.time() > lead:
+        return False
+    await _fetch_and_store(key, endpoint, fetch)
+    return True
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.executor import run_blocking
+from app.services.markets.common import get_market_service
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    downloads INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    last_modified TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS models_downloads ON models (downloads DESC);
+CREATE INDEX IF NOT EXISTS models_likes ON models (likes DESC);
+CREATE INDEX IF NOT EXISTS models_last_modified ON models (last_modified DESC);
+CREATE TABLE IF NOT EXISTS model_tags (
+    tag TEXT NOT NULL,
+    model_rowid INTEGER NOT NULL,
+    PRIMARY KEY (tag, model_rowid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS model_tags_rowid ON model_tags (model_rowid);
+CREATE VIRTUAL TABLE IF NOT EXISTS models_fts USING fts5(name);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _match_expression(query: str) -> Optional[str]:
+    # 검색어를 토큰별 접두사 검색으로 변환 ("llama-2" -> "llama"* "2"*)
+    tokens = _TOKEN.findall(query.lower())
+    return " ".join(f'"{token}"*' for token in tokens) if tokens else None
+
+
+def _model_tags(model: Dict[str, Any]) -> List[str]:
+    tags = set(model.get("tags") or [])
+    for field in ("pipeline_tag", "library_name"):
+        if model.get(field):
+            tags.add(model[field])
+    return sorted(tags)
+
+
+class ModelCatalog:
+    """SQLite(FTS5) 기반 로컬 모델 카탈로그. 검색, 태그 필터, 정렬과 정확한 total을 업스트림 없이 처리한다."""
+
+    SORT_COLUMNS = {"downloads": "downloads", "likes": "likes", "lastModified": "last_modified"}
+    # 동기화 대상(인기 상위 N개, 최근 수정 모델)이 상위 페이지를 빠짐없이 포함하는 정렬만 카탈로그로 응답
+    COVERED_SORTS = ("downloads", "lastModified")
+
+    def __init__(self, path: str, fields: List[str]):
+        self.path = path
+        self.fields = fields
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.RLock()
+        self.ready = False
+        self.initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # 스레드별 연결 (WAL 모드에서 읽기는 쓰기와 동시에 진행 가능)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def initialize(self):
+        with self._lock:
+            self._connect().executescript(SCHEMA)
+        self.initialized = True
+        self.ready = self.get_meta("synced_at") is not None
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def upsert(self, models: List[Dict[str, Any]]) -> int:
+        conn = self._connect()
+        with self._lock, conn:
+            for model in models:
+                data = {field: model[field] for field in self.fields if field in model}
+                rowid = conn.execute(
+                    "INSERT INTO models (id, downloads, likes, last_modified, data) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET downloads = excluded.downloads, likes = excluded.likes, "
+                    "last_modified = excluded.last_modified, data = excluded.data RETURNING rowid",
+                    (model["id"], model.get("downloads") or 0, model.get("likes") or 0,
+                     model.get("lastModified"), json.dumps(data, ensure_ascii=False)),
+                ).fetchone()[0]
+                conn.execute("DELETE FROM models_fts WHERE rowid = ?", (rowid,))
+                conn.execute("INSERT INTO models_fts (rowid, name) VALUES (?, ?)", (rowid, model["id"]))
+                conn.execute("DELETE FROM model_tags WHERE model_rowid = ?", (rowid,))
+                conn.executemany("INSERT INTO model_tags (tag, model_rowid) VALUES (?, ?)",
+                                 [(tag, rowid) for tag in _model_tags(model)])
+        return len(models)
+
+    def search(self, query: str, sort: str, page: int, limit: int, tags: Optional[List[str]] = None,
+               fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        joins, where, params = [], [], []
+        match = _match_expression(query or "")
+        if match:
+            joins.append("JOIN models_fts ON models_fts.rowid = m.rowid")
+            where.append("models_fts MATCH ?")
+            params.append(match)
+        for tag in tags or []:
+            where.append("m.rowid IN (SELECT model_rowid FROM model_tags WHERE tag = ?)")
+            params.append(tag)
+        clause = " ".join(joins) + (" WHERE " + " AND ".join(where) if where else "")
+
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM models m {clause}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT m.data FROM models m {clause} ORDER BY m.{self.SORT_COLUMNS[sort]} DESC, m.id "
+            f"LIMIT ? OFFSET ?", params + [limit, (page - 1) * limit],
+        ).fetchall()
+        models = [json.loads(data) for data, in rows]
+        if fields:
+            models = [{field: model[field] for field in fields if field in model} for model in models]
+        return {"models": models, "total": total}
+
+    def can_serve(self, sort: str, fields: Optional[List[str]]) -> bool:
+        # 첫 동기화 전, 전체 필드 요청, 카탈로그가 다 담지 못하는 정렬(likes 등)은 업스트림으로
+        return sort in self.COVERED_SORTS and fields is not None and set(fields) <= set(self.fields) \
+            and self.ready
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM catalog_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        conn = self._connect()
+        with self._lock, conn:
+            conn.execute("INSERT INTO catalog_meta (key, value) VALUES (?, ?) "
+                         "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        return {
+            "path": self.path,
+            "models": conn.execute("SELECT COUNT(*) FROM models").fetchone()[0],
+            "synced_at": self.get_meta("synced_at"),
+            "last_modified_watermark": self.get_meta("last_modified_watermark"),
+        }
+
+
+class CatalogSync:
+    """인기 모델 상위 N개와 마지막 동기화 이후 수정된 모델을 주기적으로 카탈로그에 반영한다."""
+
+    def __init__(self, catalog: ModelCatalog, market: str):
+        self.catalog = catalog
+        self.market = market
+        self._task: Optional[asyncio.Task] = None
+
+    async def _sync(self, sort: str, max_models: int, stop_before: Optional[str] = None) -> Optional[str]:
+        service = get_market_service(self.market)
+        params = [("sort", sort), ("direction", -1), ("limit", settings.CATALOG_SYNC_PAGE_SIZE)]
+        params += [("expand[]", field) for field in self.catalog.fields if field != "id"]
+        url, synced, newest = None, 0, None
+        while synced < max_models:
+            models, url = await service.list_models_page(params, url)
+            if not models:
+                break
+            synced += await run_blocking(self.catalog.upsert, models)
+            modified = [model["lastModified"] for model in models if model.get("lastModified")]
+            if modified:
+                newest = max(newest or "", *modified)
+                # 최근 수정순 페이지가 이전 동기화 시점보다 오래된 모델까지 내려오면 중단
+                if stop_before and min(modified) < stop_before:
+                    break
+            if url is None:
+                break
+        logger.info(f"Catalog sync ({sort}) upserted {synced} models")
+        return newest
+
+    async def run_once(self):
+        await run_blocking(self.catalog.initialize)
+        await self._sync("downloads", settings.CATALOG_SYNC_POPULAR_MODELS)
+        watermark = await run_blocking(self.catalog.get_meta, "last_modified_watermark")
+        newest = await self._sync("lastModified", settings.CATALOG_SYNC_RECENT_MAX, stop_before=watermark)
+        if newest and (watermark is None or newest > watermark):
+            await run_blocking(self.catalog.set_meta, "last_modified_watermark", newest)
+        await run_blocking(self.catalog.set_meta, "synced_at", str(int(time.time())))
+        self.catalog.ready = True
+
+    async def _run_periodically(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in catalog sync: {str(e)}")
+            interval = settings.CATALOG_SYNC_INTERVAL
+            await asyncio.sleep(interval * random.uniform(0.9, 1.1))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+_catalog: Optional[ModelCatalog] = None
+_sync: Optional[CatalogSync] = None
+
+
+def get_catalog() -> Optional[ModelCatalog]:
+    global _catalog
+    if not settings.CATALOG_ENABLED:
+        return None
+    if _catalog is None:
+        # 스키마 생성은 동기화 작업이 executor에서 수행 (이벤트 루프에서 SQLite를 열지 않음)
+        _catalog = ModelCatalog(settings.CATALOG_PATH, list(settings.MODEL_LIST_FIELDS))
+    return _catalog
+
+
+def start_catalog_sync():
+    global _sync
+    catalog = get_catalog()
+    if catalog is None:
+        return
+    if _sync is None:
+        _sync = CatalogSync(catalog, "huggingface")
+    _sync.start()
+
+
+async def stop_catalog_sync():
+    if _sync is not None:
+        await _sync.stop()
+    if _catalog is not None:
+        _catalog.close()
+
+
+def get_catalog_stats() -> Dict[str, Any]:
+    # executor 스레드에서 호출됨
+    catalog = get_catalog()
+    if catalog is None:
+        return {"enabled": False}
+    if not catalog.initialized:
+        catalog.initialize()
+    return catalog.stats()
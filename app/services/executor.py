@@ -0,0 +1,103 @@
+import asyncio
+import contextvars
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import registry
+
+# huggingface_hub SDK 등 동기 I/O 호출을 위한 프로세스 공용 스레드 풀
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class ExecutorStats:
+    def __init__(self, window: int = 1024):
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits = deque(maxlen=window)
+
+    def record_wait(self, wait: float):
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent_waits.append(wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self.recent_waits)
+        started = self.submitted - self.rejected
+        return {
+            "max_workers": settings.EXECUTOR_MAX_WORKERS,
+            "max_queue": settings.EXECUTOR_MAX_QUEUE,
+            "in_flight": self.in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_avg_ms": round(self.total_wait / started * 1000, 3) if started else 0.0,
+            "wait_p95_ms": round(waits[int(len(waits) * 0.95) - 1] * 1000, 3) if waits else 0.0,
+            "wait_max_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+stats = ExecutorStats()
+
+executor_wait = registry.histogram("hub_executor_wait_seconds", "Time blocking calls wait for a free worker thread")
+registry.callback_gauge("hub_executor_in_flight", "Blocking calls running or queued on the thread pool", (),
+                        lambda: {(): stats.in_flight})
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.EXECUTOR_MAX_WORKERS, thread_name_prefix="hub-sdk")
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    # 작업 중 + 대기 중인 호출 수가 한도를 넘으면 이벤트 루프를 막는 대신 즉시 503 반환
+    if stats.in_flight >= settings.EXECUTOR_MAX_WORKERS + settings.EXECUTOR_MAX_QUEUE:
+        stats.rejected += 1
+        stats.submitted += 1
+        logger.warning(f"Executor queue full, rejecting {getattr(func, '__name__', func)}")
+        raise HTTPException(status_code=503, detail="Server is busy, please retry later")
+
+    submitted_at = time.perf_counter()
+    started_at = None
+
+    def call():
+        nonlocal started_at
+        started_at = time.perf_counter()
+        stats.record_wait(started_at - submitted_at)
+        return func(*args, **kwargs)
+
+    # 스레드에서 남기는 로그에도 요청 컨텍스트(request_context)가 보이도록 호출 시점의 contextvar를 복사해 실행
+    context = contextvars.copy_context()
+    stats.submitted += 1
+    stats.in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), context.run, call)
+    finally:
+        stats.in_flight -= 1
+        stats.completed += 1
+        # 히스토그램은 이벤트 루프 스레드에서만 기록
+        if started_at is not None:
+            executor_wait.observe(started_at - submitted_at)
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    return stats.snapshot()
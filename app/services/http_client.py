@@ -0,0 +1,50 @@
+from typing import Optional
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.logging import logger
+
+# 애플리케이션 수명 동안 공유되는 HTTP 세션 (keep-alive 커넥션 풀 재사용)
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def _build_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=settings.HTTP_POOL_SIZE,
+        limit_per_host=settings.HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings.HTTP_TOTAL_TIMEOUT,
+        sock_connect=settings.HTTP_CONNECT_TIMEOUT,
+        sock_read=settings.HTTP_READ_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, raise_for_status=False)
+
+
+async def open_http_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = _build_session()
+        logger.info(
+            f"HTTP session opened (pool: {settings.HTTP_POOL_SIZE}, per host: {settings.HTTP_POOL_SIZE_PER_HOST})"
+        )
+    return _session
+
+
+async def close_http_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("HTTP session closed")
+    _session = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    # startup 이벤트 없이 호출되는 경우(테스트, 스크립트)를 위해 필요 시 생성
+    global _session
+    if _session is None or _session.closed:
+        _session = _build_session()
+    return _session
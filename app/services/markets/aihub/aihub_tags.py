@@ -7,7 +7,7 @@ logger = logging.getLogger(__name__)
 def get_aihub_tags():
     try:
         tags_data = "empty"
-        logger.debug(f"AIHub tags data fetched: {tags_data}")
+        logger.debug("AIHub tags data fetched: %s", tags_data)
         return tags_data
     except Exception as e:
         logger.error(f"Error fetching AIHub tags: {str(e)}")
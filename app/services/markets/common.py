@@ -1,5 +1,12 @@
+import importlib
+import inspect
+from typing import Any, Dict, Optional
+
 from fastapi import HTTPException
 
+from app.core.logging import logger
+from app.services.executor import run_blocking
+
 # 마켓별 서비스 매핑을 공통으로 관리
 market_services = {
     "huggingface": "app.services.markets.huggingface.huggingface_models.HuggingFaceService",
@@ -8,13 +15,60 @@ market_services = {
 }
 
 
-def get_market_service(market: str):
-    service = market_services.get(market)
-    if not service:
-        raise HTTPException(status_code=404, detail=f"Market {market} not supported")
+class MarketRegistry:
+    """마켓 서비스를 한 번만 생성해 재사용하고, warm_up/close 훅으로 수명 주기를 관리한다."""
+
+    def __init__(self, services: Dict[str, str]):
+        self._services = services
+        self._instances: Dict[str, Any] = {}
+
+    def get(self, market: str):
+        instance = self._instances.get(market)
+        if instance is not None:
+            return instance
+
+        service = self._services.get(market)
+        if not service:
+            raise HTTPException(status_code=404, detail=f"Market {market} not supported")
+
+        module_name, class_name = service.rsplit(".", 1)
+        module = __import__(module_name, fromlist=[class_name])
+        instance = getattr(module, class_name)()
+        self._instances[market] = instance
+        logger.info(f"Market service created: {market}")
+        return instance
 
-    module_name, class_name = service.rsplit(".", 1)
-    module = __import__(module_name, fromlist=[class_name])
-    service_class = getattr(module, class_name)
+    async def load(self, market: str):
+        # 마켓 모듈 import(huggingface_hub 등)는 수백 ms가 걸리므로 이벤트 루프를 막지 않도록 스레드 풀에서 수행
+        service = self._services.get(market)
+        if service and market not in self._instances:
+            await run_blocking(importlib.import_module, service.rsplit(".", 1)[0])
+        return self.get(market)
 
-    return service_class()
+    async def startup(self, markets: Optional[list] = None):
+        for market in markets if markets is not None else self._services:
+            await self._call_hook(await self.load(market), "warm_up", market)
+
+    async def shutdown(self):
+        for market, instance in list(self._instances.items()):
+            await self._call_hook(instance, "close", market)
+        self._instances.clear()
+
+    async def _call_hook(self, instance, hook: str, market: str):
+        method = getattr(instance, hook, None)
+        if method is None:
+            return
+        try:
+            result = method()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            # 한 마켓의 훅 실패가 다른 마켓이나 애플리케이션 기동을 막지 않도록 기록만 함
+            logger.error(f"Error in {market} market {hook}: {str(e)}")
+
+
+market_registry = MarketRegistry(market_services)
+
+
+def get_market_service(market: str):
+    return market_registry.get(market)
@@ -1,111 +1,368 @@
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import base64
+import hashlib
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
+import re
+import aiohttp
 import markdown2
-from fastapi.responses import FileResponse
-from huggingface_hub import HfApi, ModelCard, hf_hub_download
+import requests
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from huggingface_hub import HfApi, ModelCard, configure_http_backend, hf_hub_url
+from starlette.responses import Response
 
 from app.core.config import settings
 from app.core.logging import logger, log_external_api_call
+from app.core.metrics import registry
+from app.services.caching import cache_data, cached_fetch_entry, get_cached_entry
+from app.services.blob_store import BlobFileResponse, get_blob_store
+from app.services.catalog import get_catalog
+from app.services.executor import run_blocking
+from app.services.http_client import get_http_session, open_http_session
+from app.services.resilience import RETRYABLE_STATUS, UpstreamStatusError, get_upstream_guard
+from app.services.singleflight import upstream_flight
 from app.utils.helpers import format_size
 
-hf_api = HfApi(token=settings.HF_API_TOKEN)
+# HfApi 클라이언트는 첫 SDK 호출 시점에 생성해 모듈 import 비용을 줄이고 태그 모듈과 공유
+_hf_api: Optional[HfApi] = None
+
+HUGGINGFACE_MODELS_JSON_URL = f"{settings.HF_ENDPOINT}/models-json"
+HUGGINGFACE_API_MODELS_URL = f"{settings.HF_ENDPOINT}/api/models"
+
+upstream_stream_bytes = registry.counter("hub_upstream_stream_bytes_total",
+                                         "Bytes proxied from upstream file downloads", ("market",))
+
+FULL_SHA = re.compile(r"^[0-9a-f]{40}$")
+
+# 스트리밍 다운로드 시 업스트림 응답에서 그대로 전달할 헤더
+STREAM_PASSTHROUGH_HEADERS = ("Content-Length", "Content-Range", "Accept-Ranges", "ETag", "Last-Modified")
+
+
+def get_hf_api() -> HfApi:
+    global _hf_api
+    if _hf_api is None:
+        _hf_api = HfApi(endpoint=settings.HF_ENDPOINT, token=settings.HF_API_TOKEN)
+    return _hf_api
+
+
+def encode_cursor(next_url: str) -> str:
+    # 재개 토큰에는 다음 페이지 URL의 cursor 값만 담음 (limit 등 나머지 파라미터는 재개 요청에서 다시 만듦)
+    cursor = parse_qs(urlsplit(next_url).query).get("cursor")
+    if not cursor:
+        raise ValueError(f"Next page link has no cursor: {next_url}")
+    return base64.urlsafe_b64encode(cursor[0].encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> str:
+    try:
+        cursor = base64.b64decode(token + "=" * (-len(token) % 4), altchars=b"-_", validate=True).decode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        cursor = ""
+    if not cursor:
+        raise HTTPException(status_code=400, detail="Invalid export cursor")
+    return cursor
+
+
+def project_models(models: List[Dict[str, Any]], fields: List[str]) -> List[Dict[str, Any]]:
+    return [{field: model[field] for field in fields if field in model} for model in models]
+
+
+def load_model_card(model_id: str, revision: Optional[str]) -> ModelCard:
+    # ModelCard.load는 항상 main을 읽으므로, 캐시 키와 같은 커밋의 README를 직접 내려받아 파싱
+    path = get_hf_api().hf_hub_download(model_id, "README.md", revision=revision)
+    with open(path, encoding="utf-8") as file:
+        return ModelCard(file.read())
+
+
+def render_model_card(text: str) -> str:
+    return markdown2.markdown(text, extras=["fenced-code-blocks", "tables"])
+
+
+class _TimeoutAdapter(requests.adapters.HTTPAdapter):
+    # huggingface_hub SDK 호출은 대부분 timeout을 지정하지 않으므로 기본 (connect, read) timeout을 주입
+    def __init__(self, timeout, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def configure_hub_timeouts(connect_timeout: float, read_timeout: float):
+    def backend_factory() -> requests.Session:
+        session = requests.Session()
+        adapter = _TimeoutAdapter((connect_timeout, read_timeout))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    configure_http_backend(backend_factory=backend_factory)
 
-HUGGINGFACE_MODELS_JSON_URL = "https://huggingface.co/models-json"
-HUGGINGFACE_API_MODELS_URL = "https://huggingface.co/api/models"
 
 class HuggingFaceService:
-    async def get_trending_models(self, page: int, query: str = None) -> Dict[str, Any]:
-        params = {
-            "sort": "trending",
-            "p": page - 1 if page > 1 else None,
-        }
+    def __init__(self):
+        self.guard = get_upstream_guard("huggingface")
+        policy = self.guard.policy
+        configure_hub_timeouts(policy.connect_timeout, policy.read_timeout)
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=policy.connect_timeout,
+                                             sock_read=policy.read_timeout)
+
+    async def _get_json(self, url: str, params, endpoint: str) -> Any:
+        async def request():
+            async with get_http_session().get(url, params=params, timeout=self.timeout) as response:
+                if response.status in RETRYABLE_STATUS:
+                    raise UpstreamStatusError(response.status, response.headers.get("Retry-After"))
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        return await self.guard.call(request, endpoint)
+
+    async def _run_sdk(self, endpoint: str, func, *args, **kwargs) -> Any:
+        # SDK 호출도 동일한 재시도/동시성/서킷 브레이커 정책을 거쳐 공용 executor에서 실행
+        return await self.guard.call(lambda: run_blocking(func, *args, **kwargs), endpoint)
+
+    async def warm_up(self):
+        # 첫 요청이 커넥션 풀 생성 비용을 부담하지 않도록 기동 시 세션을 준비
+        await open_http_session()
+
+    async def get_trending_models(self, page: int, query: str = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        params = {"sort": "trending"}
+        if page > 1:
+            params["p"] = page - 1
         if query:
             params["search"] = query
         try:
             log_external_api_call(HUGGINGFACE_MODELS_JSON_URL, "GET", params=params)
-            response = requests.get(HUGGINGFACE_MODELS_JSON_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_json(HUGGINGFACE_MODELS_JSON_URL, params, "models-json")
             models = [model for model in data['models'] if model['repoType'] == 'model']
+            if fields:
+                models = project_models(models, fields)
             return {"models": models, "total": data['numTotalItems']}
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, UpstreamStatusError) as e:
             logger.error(f"Error in get_trending_models: {str(e)}")
             raise
 
-    async def search_models(self, query: str, sort: str, page: int, limit: int) -> Dict[str, Any]:
-        params = {
-            "sort": sort,
-            "search": query,
-            "limit": limit,
-            "full": "true",
-            "direction": -1,
-            "offset": (page - 1) * limit
-        }
-        try:
-            log_external_api_call(HUGGINGFACE_API_MODELS_URL, "GET", params=params)
-            response = requests.get(HUGGINGFACE_API_MODELS_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+    async def list_models_page(self, params: List[Tuple[str, Any]],
+                               url: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """카탈로그 동기화용 목록 조회. 다음 페이지는 Link 헤더의 cursor URL을 따른다."""
+        async def request():
+            async with get_http_session().get(url or HUGGINGFACE_API_MODELS_URL, params=None if url else params,
+                                              timeout=self.timeout) as response:
+                if response.status in RETRYABLE_STATUS:
+                    raise UpstreamStatusError(response.status, response.headers.get("Retry-After"))
+                response.raise_for_status()
+                next_link = response.links.get("next")
+                return await response.json(content_type=None), str(next_link["url"]) if next_link else None
+
+        log_external_api_call(url or HUGGINGFACE_API_MODELS_URL, "GET", params=None if url else params)
+        return await self.guard.call(request, "api/models")
+
+    @staticmethod
+    def _models_params(query: str, sort: str, limit: int, fields: Optional[List[str]],
+                       tags: Optional[List[str]]) -> List[Tuple[str, Any]]:
+        params = [
+            ("sort", sort),
+            ("search", query),
+            ("limit", limit),
+            ("direction", -1),
+        ]
+        params += [("filter", tag) for tag in tags or []]
+        if fields:
+            # 필요한 필드만 업스트림에 요청 (expand는 full과 함께 사용할 수 없음)
+            params += [("expand[]", field) for field in fields if field != "id"]
+        else:
+            params.append(("full", "true"))
+        return params
+
+    @staticmethod
+    def _shape_models(models: List[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+        if fields:
+            return project_models(models, fields)
+        for model in models:
+            model.pop('siblings', None)
+        return models
 
-            for model in data:
-                model.pop('siblings', None)
+    async def search_models(self, query: str, sort: str, page: int, limit: int,
+                            fields: Optional[List[str]] = None, tags: Optional[List[str]] = None) -> Dict[str, Any]:
+        catalog = get_catalog()
+        if catalog is not None and catalog.can_serve(sort, fields):
+            try:
+                result = await run_blocking(catalog.search, query, sort, page, limit, tags, fields)
+                # 카탈로그에 일치하는 모델이 하나도 없을 때만 업스트림으로 조회 (같은 검색의 모든 페이지가 한 출처의 total 사용)
+                if result["total"] > 0:
+                    return result
+            except Exception as e:
+                # 로컬 카탈로그 오류 시 업스트림 검색으로 대체
+                logger.error(f"Error in catalog search, falling back to upstream: {str(e)}")
 
+        params = self._models_params(query, sort, limit, fields, tags) + [("offset", (page - 1) * limit)]
+        try:
+            log_external_api_call(HUGGINGFACE_API_MODELS_URL, "GET", params=params)
+            data = await self._get_json(HUGGINGFACE_API_MODELS_URL, params, "api/models")
+            data = self._shape_models(data, fields)
             return {"models": data, "total": len(data)}
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, UpstreamStatusError) as e:
             logger.error(f"Error in search_models: {str(e)}")
             raise
 
-    async def get_model_files(self, model_id: str) -> Dict[str, Any]:
-        try:
-            repo_info = hf_api.repo_info(repo_id=model_id, repo_type="model", files_metadata=True)
+    async def export_models(self, query: str, sort: str, fields: Optional[List[str]] = None,
+                            tags: Optional[List[str]] = None,
+                            cursor: Optional[str] = None) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """검색 결과 전체를 Link 헤더의 cursor를 따라 페이지 단위로 생성한다: (모델 목록, 다음 페이지 cursor 토큰).
 
-            if not hasattr(repo_info, 'siblings') or repo_info.siblings is None:
-                return {"files": []}
+        다음 페이지는 현재 페이지가 소비되는 동안 하나만 미리 요청하므로 메모리는 최대 두 페이지로 유지된다.
+        """
+        params = self._models_params(query, sort, settings.EXPORT_PAGE_SIZE, fields, tags)
+        if cursor:
+            # 토큰에서는 업스트림 cursor 값만 받고 검색 조건과 페이지 크기는 요청 파라미터로 고정
+            params.append(("cursor", decode_cursor(cursor)))
+        pending = asyncio.ensure_future(self.list_models_page(params))
+        try:
+            while pending is not None:
+                models, next_url = await pending
+                pending = asyncio.ensure_future(self.list_models_page(None, next_url)) if next_url else None
+                yield self._shape_models(models, fields), encode_cursor(next_url) if next_url else None
+        finally:
+            if pending is not None:
+                pending.cancel()
 
-            files_info = [
-                {
-                    "name": file.rfilename,
-                    "size": format_size(file.size if hasattr(file, 'size') else None),
-                    "blob_id": file.blob_id if hasattr(file, 'blob_id') else None
-                } for file in repo_info.siblings
-            ]
+    async def get_model_revision(self, model_id: str, revision: str = "main") -> str:
+        """브랜치/태그가 가리키는 현재 커밋 sha만 조회한다 (파일 목록 없이 가벼운 호출)."""
+        if FULL_SHA.match(revision):
+            return revision
+        model_info = await self._run_sdk("model_revision", get_hf_api().model_info, model_id, revision=revision,
+                                         expand=["sha"])
+        return model_info.sha
 
-            return {"files": files_info}
+    async def get_model_files(self, model_id: str, revision: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            sha = await self.get_model_revision(model_id, revision or "main")
+            # 같은 커밋(sha)의 파일 목록은 바뀌지 않으므로 sha 기준으로 캐시하고, 재검증은 sha 조회만 수행
+            files_key = f"huggingface_model_files_{model_id}@{sha}"
+            entry = await get_cached_entry(files_key)
+            if entry is not None:
+                return entry.value
+            return await upstream_flight.do(files_key, lambda: self._load_model_files(model_id, sha, files_key))
         except Exception as e:
             logger.error(f"Error in get_model_files: {str(e)}")
             raise
 
-    async def download_model_file(self, model_id: str, filename: str) -> FileResponse:
+    async def _load_model_files(self, model_id: str, sha: str, files_key: str) -> Dict[str, Any]:
+        repo_info = await self._run_sdk("repo_info", get_hf_api().repo_info, repo_id=model_id, repo_type="model",
+                                        revision=sha, files_metadata=True)
+        files_info = [
+            {
+                "name": file.rfilename,
+                "size": format_size(getattr(file, 'size', None)),
+                "size_bytes": getattr(file, 'size', None),
+                "blob_id": getattr(file, 'blob_id', None),
+                "lfs": getattr(file, 'lfs', None) is not None,
+            } for file in getattr(repo_info, 'siblings', None) or []
+        ]
+        listing = {"sha": sha, "files": files_info}
+        await cache_data(files_key, listing, timeout=settings.MODEL_FILES_CACHE_TTL)
+        return listing
+
+    async def download_model_file(self, model_id: str, filename: str, range_header: Optional[str] = None) -> Response:
         try:
-            local_path = hf_hub_download(repo_id=model_id, filename=filename, token=settings.HF_API_TOKEN)
-            file_name = os.path.basename(local_path)
-            return FileResponse(local_path, media_type='application/octet-stream', filename=file_name)
+            # 파일 -> blob 매핑을 캐시해 저장된 blob은 업스트림 호출 없이 응답 (stale 항목은 백그라운드에서 갱신)
+            blob = (await cached_fetch_entry("huggingface", "file_blob", {"model_id": model_id, "filename": filename},
+                                             lambda: self._get_file_blob(model_id, filename))).value
+
+            blob_store = get_blob_store()
+            local_path = await blob_store.lookup(blob["blob_id"])
+            if local_path is None:
+                url = hf_hub_url(repo_id=model_id, filename=filename, endpoint=settings.HF_ENDPOINT)
+                # 체크섬은 원본 바이트 기준이므로 전송 압축을 받지 않음
+                headers = {"Authorization": f"Bearer {settings.HF_API_TOKEN}", "Accept-Encoding": "identity"}
+                log_external_api_call(url, "GET")
+                # 같은 blob을 동시에 요청해도 한 번만 내려받음 (다른 저장소의 동일 파일도 blob_id가 같음)
+                local_path = await upstream_flight.do(
+                    f"blob:{blob['blob_id']}",
+                    lambda: blob_store.fetch(blob["blob_id"], url, blob["size"], blob["sha256"], headers),
+                )
+            if local_path is None:
+                # 저장소 한도보다 큰 파일은 저장하지 않고 스트리밍으로 전달
+                return await self.stream_model_file(model_id, filename, range_header)
+
+            return BlobFileResponse(local_path, media_type='application/octet-stream', filename=os.path.basename(filename),
+                                    headers={"ETag": f'"{blob["blob_id"]}"'})
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error in download_model_file: {str(e)}")
             raise
 
-    async def get_model_detail(self, model_id: str) -> Dict[str, Any]:
-        def fetch_model_info():
-            return hf_api.model_info(model_id)
+    async def _get_file_blob(self, model_id: str, filename: str) -> Dict[str, Any]:
+        paths_info = await self._run_sdk("paths_info", get_hf_api().get_paths_info, model_id, [filename], repo_type="model")
+        repo_file = paths_info[0] if paths_info else None
+        if repo_file is None or not hasattr(repo_file, "blob_id"):
+            raise FileNotFoundError(f"{filename} not found in {model_id}")
+        return {"blob_id": repo_file.blob_id, "size": repo_file.size,
+                "sha256": repo_file.lfs.sha256 if repo_file.lfs else None}
+
+    async def stream_model_file(self, model_id: str, filename: str, range_header: Optional[str] = None) -> StreamingResponse:
+        url = hf_hub_url(repo_id=model_id, filename=filename, endpoint=settings.HF_ENDPOINT)
+        # aiohttp가 압축을 풀면 업스트림 Content-Length/Content-Range와 본문이 어긋나므로 원본 그대로 요청
+        headers = {"Authorization": f"Bearer {settings.HF_API_TOKEN}", "Accept-Encoding": "identity"}
+        if range_header:
+            headers["Range"] = range_header
 
-        def fetch_model_card():
-            card = ModelCard.load(model_id, token=settings.HF_API_TOKEN)
-            return card.data.to_dict(), card.text
+        async def open_stream():
+            # 대용량 파일은 전체 시간 제한 없이 connect/read 타임아웃만 적용, 재시도는 응답 헤더를 받기 전까지만
+            response = await get_http_session().get(url, headers=headers, timeout=self.timeout,
+                                                    read_bufsize=settings.DOWNLOAD_CHUNK_SIZE)
+            if response.status in RETRYABLE_STATUS:
+                response.release()
+                raise UpstreamStatusError(response.status, response.headers.get("Retry-After"))
+            return response
 
         try:
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                future_model_info = executor.submit(fetch_model_info)
-                future_model_card = executor.submit(fetch_model_card)
+            log_external_api_call(url, "GET", params={"range": range_header})
+            response = await self.guard.call(open_stream, "download")
+        except (aiohttp.ClientError, UpstreamStatusError) as e:
+            logger.error(f"Error in stream_model_file: {str(e)}")
+            raise
+
+        if response.status not in (200, 206):
+            response.release()
+            if response.status == 416:
+                raise HTTPException(status_code=416, detail="Requested range not satisfiable")
+            raise HTTPException(status_code=404 if response.status in (401, 403, 404) else 502,
+                                detail=f"Upstream returned {response.status} for {filename}")
 
-                for future in as_completed([future_model_info, future_model_card]):
-                    if future == future_model_info:
-                        model_info = future.result()
-                    elif future == future_model_card:
-                        model_data, model_text = future.result()
+        async def body():
+            try:
+                # 클라이언트가 소비한 만큼만 업스트림에서 읽어 버퍼 크기를 제한
+                async for chunk in response.content.iter_chunked(settings.DOWNLOAD_CHUNK_SIZE):
+                    upstream_stream_bytes.inc("huggingface", amount=len(chunk))
+                    yield chunk
+            finally:
+                response.release()
 
-            model_html = markdown2.markdown(model_text, extras=["fenced-code-blocks", "tables"])
+        passthrough = {name: response.headers[name] for name in STREAM_PASSTHROUGH_HEADERS if name in response.headers}
+        if "Content-Encoding" in response.headers:
+            # identity 요청을 무시하고 압축해 보낸 경우 풀린 본문 길이는 알 수 없음
+            passthrough.pop("Content-Length", None)
+        passthrough.setdefault("Accept-Ranges", "bytes")
+        passthrough["Content-Disposition"] = f'attachment; filename="{os.path.basename(filename)}"'
+        # 스트림이 시작되기 전에 클라이언트가 끊어도 업스트림 커넥션이 반환되도록 background에서도 release
+        return StreamingResponse(body(), status_code=response.status, headers=passthrough,
+                                 media_type="application/octet-stream", background=BackgroundTask(response.release))
+
+    async def get_model_detail(self, model_id: str, include_html: bool = True) -> Dict[str, Any]:
+        try:
+            model_info = await self._run_sdk("model_info", get_hf_api().model_info, model_id)
+
+            if include_html:
+                model_data, model_html = await self._get_model_card(model_id, model_info.sha)
+            else:
+                # 목록 화면용: README를 내려받거나 렌더링하지 않고 model_info의 카드 메타데이터만 사용
+                model_data = model_info.card_data.to_dict() if model_info.card_data else {}
 
             combined_info = {
                 "id": model_info.id if model_info else model_id,
@@ -115,12 +372,42 @@ class HuggingFaceService:
                 "pipeline_tag": model_info.pipeline_tag if model_info else None,
                 "tags": model_info.tags if model_info else [],
                 **model_data,
-                "card_html": model_html
             }
+            if include_html:
+                combined_info["card_html"] = model_html
 
             return combined_info
         except Exception as e:
             logger.error(f"Error in get_model_detail: {str(e)}")
             raise
 
+    async def _get_model_card(self, model_id: str, revision: Optional[str]) -> Tuple[Dict[str, Any], str]:
+        # 같은 커밋(sha)의 카드는 다시 내려받지 않음
+        card_key = f"huggingface_model_card_{model_id}@{revision}"
+        entry = await get_cached_entry(card_key)
+        if entry is not None:
+            html_entry = await get_cached_entry(f"model_card_html_{entry.value['text_hash']}")
+            if html_entry is not None:
+                return entry.value["data"], html_entry.value
+
+        model_card = await self._run_sdk("model_card", load_model_card, model_id, revision)
+        text_hash = hashlib.sha256(model_card.text.encode("utf-8")).hexdigest()
+        card = {"data": model_card.data.to_dict(), "text_hash": text_hash}
+
+        # 렌더링 결과는 카드 본문 해시로 캐시하므로 내용이 같으면 커밋이 바뀌어도 재사용
+        html_key = f"model_card_html_{text_hash}"
+        html_entry = await get_cached_entry(html_key)
+        if html_entry is not None:
+            model_html = html_entry.value
+        else:
+            model_html = await run_blocking(render_model_card, model_card.text)
+            await cache_data(html_key, model_html, timeout=settings.MODEL_CARD_CACHE_TTL)
+        await cache_data(card_key, card, timeout=settings.MODEL_CARD_CACHE_TTL)
+        return card["data"], model_html
+
+    async def get_tags(self) -> Dict[str, Any]:
+        # huggingface_tags 모듈이 이 모듈을 import 하므로 순환 참조를 피하기 위해 지연 import
+        from app.services.markets.huggingface.huggingface_tags import get_huggingface_tags
+        return await self._run_sdk("tags", get_huggingface_tags, raise_on_error=True)
+
 huggingface_service = HuggingFaceService()
\ No newline at end of file
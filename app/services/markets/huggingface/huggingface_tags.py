@@ -1,18 +1,15 @@
-from app.services.markets.huggingface.huggingface_models import HuggingFaceService
+from app.services.markets.huggingface.huggingface_models import get_hf_api
 import logging
-from app.core.config import settings
-from huggingface_hub import HfApi
 
-huggingface_service = HuggingFaceService()
 logger = logging.getLogger(__name__)
 
-hf_api = HfApi(token=settings.HF_API_TOKEN)
-
-def get_huggingface_tags():
+def get_huggingface_tags(raise_on_error: bool = False):
     try:
-        tags_data = hf_api.get_model_tags()
-        logger.debug(f"HuggingFace tags data fetched: {tags_data}")
+        tags_data = get_hf_api().get_model_tags()
+        logger.debug("HuggingFace tags data fetched: %s", tags_data)
         return tags_data
     except Exception as e:
         logger.error(f"Error fetching HuggingFace tags: {str(e)}")
+        if raise_on_error:
+            raise
         return {}
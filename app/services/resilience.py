@@ -0,0 +1,252 @@
+import asyncio
+import random
+import sys
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import registry
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+upstream_duration = registry.histogram(
+    "hub_upstream_request_duration_seconds", "Upstream call latency per attempt", ("market", "endpoint", "outcome"))
+upstream_errors = registry.counter(
+    "hub_upstream_errors_total", "Upstream call failures by kind (status code, exception type or circuit_open)",
+    ("market", "endpoint", "kind"))
+
+
+class UpstreamStatusError(Exception):
+    """업스트림이 재시도 가능한 상태 코드를 반환했을 때 사용."""
+
+    def __init__(self, status: int, retry_after: Optional[str] = None):
+        super().__init__(f"Upstream returned {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class UpstreamUnavailableError(HTTPException):
+    def __init__(self, market: str, retry_after: float):
+        super().__init__(status_code=503, detail=f"{market} upstream is temporarily unavailable",
+                         headers={"Retry-After": str(max(int(retry_after), 1))})
+
+
+class UpstreamPolicy:
+    def __init__(self, connect_timeout: float, read_timeout: float, max_retries: int, backoff_base: float,
+                 backoff_max: float, max_in_flight: int, breaker_failure_threshold: int, breaker_reset_timeout: float):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_in_flight = max_in_flight
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_timeout = breaker_reset_timeout
+
+    @classmethod
+    def for_market(cls, market: str) -> "UpstreamPolicy":
+        return cls(**{**settings.UPSTREAM_DEFAULT_POLICY, **settings.UPSTREAM_POLICIES.get(market, {})})
+
+
+class CircuitBreaker:
+    """연속 실패가 임계값을 넘으면 일정 시간 호출을 차단하고, 이후 한 번의 시험 호출로 복구 여부를 확인한다."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            return True
+        # HALF_OPEN 상태에서는 시험 호출 하나만 허용
+        return False
+
+    def retry_after(self) -> float:
+        return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def release_trial(self):
+        # 시험 호출이 결과 없이 끝나면(취소) 다음 호출이 바로 다시 시험하도록 OPEN으로 되돌림
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic() - self.reset_timeout
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+def _requests_module():
+    # requests 예외는 huggingface_hub SDK 호출에서만 발생하므로, 이미 로드된 경우에만 참조 (기동 시 import 비용 절감)
+    return sys.modules.get("requests")
+
+
+def _retry_info(error: BaseException):
+    """(재시도 가능 여부, Retry-After 헤더 값)"""
+    if isinstance(error, UpstreamStatusError):
+        return error.status in RETRYABLE_STATUS, error.retry_after
+    if isinstance(error, aiohttp.ClientResponseError):
+        retry_after = error.headers.get("Retry-After") if error.headers else None
+        return error.status in RETRYABLE_STATUS, retry_after
+    requests = _requests_module()
+    if requests and isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRYABLE_STATUS, error.response.headers.get("Retry-After")
+    if isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+        return True, None
+    if requests and isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True, None
+    return False, None
+
+
+def _is_upstream_response(error: BaseException) -> bool:
+    """업스트림이 실제로 응답한 HTTP 오류(4xx 등)인지 여부. 로컬 오류(executor 503 등)는 False."""
+    if isinstance(error, (UpstreamStatusError, aiohttp.ClientResponseError)):
+        return True
+    requests = _requests_module()
+    return bool(requests and isinstance(error, requests.HTTPError) and error.response is not None)
+
+
+def _error_kind(error: BaseException) -> str:
+    status = getattr(error, "status", None)
+    requests = _requests_module()
+    if status is None and requests and isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+    if status is None and isinstance(error, HTTPException):
+        status = error.status_code
+    return str(status) if status is not None else type(error).__name__
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class UpstreamGuard:
+    """마켓별 업스트림 호출 정책: 동시 호출 수 제한, 지수 백오프+지터 재시도, 서킷 브레이커."""
+
+    def __init__(self, market: str, policy: UpstreamPolicy):
+        self.market = market
+        self.policy = policy
+        self.semaphore = asyncio.Semaphore(policy.max_in_flight)
+        self.breaker = CircuitBreaker(policy.breaker_failure_threshold, policy.breaker_reset_timeout)
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        server_delay = _parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.policy.backoff_max)
+        # full jitter: 0 ~ min(max, base * 2^attempt)
+        return random.uniform(0, min(self.policy.backoff_max, self.policy.backoff_base * (2 ** attempt)))
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], endpoint: str = "") -> Any:
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.rejected += 1
+                upstream_errors.inc(self.market, endpoint, "circuit_open")
+                raise UpstreamUnavailableError(self.market, self.breaker.retry_after())
+            trial = self.breaker.state == CircuitBreaker.HALF_OPEN
+            try:
+                async with self.semaphore:
+                    started, outcome = time.perf_counter(), "error"
+                    try:
+                        result = await fn()
+                        outcome = "ok"
+                    finally:
+                        upstream_duration.observe(time.perf_counter() - started, self.market, endpoint, outcome)
+            except asyncio.CancelledError:
+                # CancelledError는 Exception이 아니므로 따로 처리하지 않으면 HALF_OPEN 상태에 머무름
+                if trial:
+                    self.breaker.release_trial()
+                raise
+            except HTTPException:
+                # executor 대기열 초과(503) 등 로컬 오류는 업스트림 상태와 무관하므로 브레이커를 건드리지 않음
+                if trial:
+                    self.breaker.release_trial()
+                raise
+            except Exception as e:
+                upstream_errors.inc(self.market, endpoint, _error_kind(e))
+                retryable, retry_after = _retry_info(e)
+                if not retryable:
+                    if _is_upstream_response(e):
+                        # 404 등 요청 자체의 오류는 업스트림이 응답한 것이므로 장애로 보지 않음
+                        self.breaker.record_success()
+                    elif trial:
+                        self.breaker.release_trial()
+                    raise
+                self.breaker.record_failure()
+                self.failures += 1
+                if attempt >= self.policy.max_retries or self.breaker.state == CircuitBreaker.OPEN:
+                    logger.error(f"Upstream {self.market} {endpoint} failed after {attempt + 1} attempts: {str(e)}")
+                    raise
+                delay = self.backoff(attempt, retry_after)
+                attempt += 1
+                self.retries += 1
+                logger.warning(f"Retrying {self.market} {endpoint} in {delay:.2f}s (attempt {attempt}): {str(e)}")
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "breaker_state": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+            "in_flight": self.policy.max_in_flight - self.semaphore._value,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+_guards: Dict[str, UpstreamGuard] = {}
+
+
+def get_upstream_guard(market: str) -> UpstreamGuard:
+    guard = _guards.get(market)
+    if guard is None:
+        guard = UpstreamGuard(market, UpstreamPolicy.for_market(market))
+        _guards[market] = guard
+    return guard
+
+
+def get_upstream_stats() -> Dict[str, Dict[str, Any]]:
+    return {market: guard.stats() for market, guard in _guards.items()}
+
+
+registry.callback_gauge("hub_upstream_in_flight", "Upstream calls currently in flight", ("market",),
+                        lambda: {(market,): guard.stats()["in_flight"] for market, guard in _guards.items()})
+registry.callback_gauge("hub_upstream_circuit_open", "1 when the market circuit breaker is not closed", ("market",),
+                        lambda: {(market,): float(guard.breaker.state != CircuitBreaker.CLOSED)
+                                 for market, guard in _guards.items()})
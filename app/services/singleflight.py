@@ -0,0 +1,45 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from app.core.metrics import registry
+
+
+class SingleFlight:
+    """동일 키에 대한 동시 업스트림 호출을 하나로 합쳐 결과(또는 예외)를 공유한다."""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.originated = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            self.originated += 1
+            # 최초 호출자의 요청이 취소되어도 대기 중인 다른 호출자에게 영향이 없도록 별도 task로 실행
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {"originated": self.originated, "coalesced": self.coalesced, "in_flight": self.in_flight()}
+
+
+upstream_flight = SingleFlight()
+
+
+def get_singleflight_stats() -> Dict[str, int]:
+    return upstream_flight.stats()
+
+
+registry.callback_counter("hub_singleflight_calls_total", "Upstream calls started (originated) or joined (coalesced)",
+                          ("result",), lambda: {("originated",): upstream_flight.originated,
+                                                ("coalesced",): upstream_flight.coalesced})
+registry.callback_gauge("hub_singleflight_in_flight", "Distinct upstream calls currently in flight", (),
+                        lambda: {(): upstream_flight.in_flight()})
@@ -0,0 +1,168 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Set, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.caching import CacheEntry, cached_fetch_entry, serialize
+from app.services.executor import run_blocking
+from app.services.markets.common import get_market_service
+
+
+class TagGroup:
+    """한 그룹의 태그 목록과 바로 응답 가능한 직렬화 본문."""
+
+    __slots__ = ("name", "items", "count", "sorted_keys", "word_keys", "terms", "term_positions", "trigrams",
+                 "terms_text", "term_starts", "full_body", "limited_body", "etag")
+
+    def __init__(self, name: str, data: Any, etag: str):
+        self.name = name
+        self.items: List[Any] = data if isinstance(data, list) else list(data.items())
+        self.count = len(self.items)
+        # 검색용 정렬 배열: (소문자 라벨/ID, 원본 위치)와 (라벨 내 단어, 원본 위치)
+        self.sorted_keys: List[Tuple[str, int]] = []
+        self.word_keys: List[Tuple[str, int]] = []
+        # 부분 문자열 검색용: 라벨과 ID를 각각 별도 항목으로 두어 두 필드에 걸친 일치가 생기지 않게 함
+        self.terms: List[str] = []
+        self.term_positions: List[int] = []
+        for position, item in enumerate(self.items):
+            terms = sorted({_tag_label(item).lower(), _tag_id(item).lower()} - {""})
+            self.sorted_keys.extend((term, position) for term in terms)
+            words = {word for term in terms for word in _WORD_SPLIT.split(term) if word} - set(terms)
+            self.word_keys.extend((word, position) for word in words)
+            self.terms.extend(terms)
+            self.term_positions.extend([position] * len(terms))
+        self.sorted_keys.sort()
+        self.word_keys.sort()
+        # 3글자 이상 질의: trigram -> 항목 번호(오름차순) 역색인. 2글자 이하는 구분자로 이은 문자열에서 str.find
+        self.trigrams: Dict[str, array] = {}
+        for number, term in enumerate(self.terms):
+            for gram in {term[start:start + 3] for start in range(len(term) - 2)}:
+                postings = self.trigrams.get(gram)
+                if postings is None:
+                    postings = self.trigrams[gram] = array("i")
+                postings.append(number)
+        self.terms_text = _TERM_SEPARATOR.join(self.terms)
+        self.term_starts: List[int] = []
+        offset = 0
+        for term in self.terms:
+            self.term_starts.append(offset)
+            offset += len(term) + 1
+        self.full_body = serialize({"data": self.items})
+        if name in settings.LIMITED_GROUPS:
+            remaining_count = max(self.count - settings.LIMIT, 0)
+            self.limited_body = serialize({"data": self.items[:settings.LIMIT], "remaining_count": remaining_count})
+        else:
+            self.limited_body = serialize({"data": self.items, "remaining_count": 0})
+        self.etag = f"{etag}-{name}"
+
+    def search(self, query: str, limit: int) -> List[Any]:
+        """라벨/ID 전체 접두어 > 단어 접두어 > 부분 문자열 순으로 순위를 매겨 최대 limit개 반환."""
+        query = query.strip().lower()
+        if not query:
+            return self.items[:limit]
+
+        matched: List[int] = []
+        seen: Set[int] = set()
+        for keys in (self.sorted_keys, self.word_keys):
+            # 정렬 배열에서 접두어 범위의 시작 위치를 이진 탐색 (정확히 일치하는 항목이 가장 앞에 위치)
+            cursor = bisect_left(keys, (query,))
+            while cursor < len(keys) and len(matched) < limit:
+                term, position = keys[cursor]
+                if not term.startswith(query):
+                    break
+                if position not in seen:
+                    seen.add(position)
+                    matched.append(position)
+                cursor += 1
+
+        if len(matched) < limit and _TERM_SEPARATOR not in query:
+            for number in self._substring_terms(query):
+                position = self.term_positions[number]
+                if position not in seen:
+                    seen.add(position)
+                    matched.append(position)
+                    if len(matched) >= limit:
+                        break
+
+        return [self.items[position] for position in matched]
+
+    def _substring_terms(self, query: str) -> Iterator[int]:
+        # 원본 순서(항목 번호 오름차순)로 query를 포함하는 항목 번호를 생성
+        if len(query) >= 3:
+            # 가장 짧은 trigram 목록만 확인 (없는 trigram이 있으면 일치 없음)
+            candidates = min((self.trigrams.get(query[start:start + 3], ()) for start in range(len(query) - 2)),
+                             key=len)
+            for number in candidates:
+                if query in self.terms[number]:
+                    yield number
+            return
+        found = self.terms_text.find(query)
+        while found != -1:
+            number = bisect_right(self.term_starts, found) - 1
+            yield number
+            # 같은 항목 안의 다음 일치는 건너뛰고 다음 항목부터 이어서 찾음
+            next_start = self.term_starts[number + 1] if number + 1 < len(self.term_starts) else len(self.terms_text)
+            found = self.terms_text.find(query, next_start)
+
+
+class TagIndex:
+    """태그 데이터가 갱신될 때 한 번만 만들어지는 그룹별 인덱스."""
+
+    def __init__(self, tags: Dict[str, Any], etag: str):
+        self.etag = etag
+        self.groups: Dict[str, TagGroup] = {
+            group: TagGroup(group, tags.get(group, []), etag) for group in settings.GROUPS
+        }
+
+
+_WORD_SPLIT = re.compile(r"[\s:/_\-.,()]+")
+_TERM_SEPARATOR = "\x00"
+
+
+def _tag_id(item: Any) -> str:
+    if isinstance(item, dict):
+        return str(item.get("id") or "")
+    return ""
+
+
+def _tag_label(item: Any) -> str:
+    if isinstance(item, dict):
+        return str(item.get("label") or item.get("id") or "")
+    if isinstance(item, (tuple, list)) and item:
+        return str(item[0])
+    return str(item)
+
+
+# 마켓별 최신 인덱스 (태그 캐시 항목의 etag가 바뀌면 다시 생성)
+_indexes: Dict[str, TagIndex] = {}
+
+
+def tags_fetcher(market: str) -> Callable[[], Awaitable[Any]]:
+    market_service = get_market_service(market)
+
+    async def fetch():
+        data = await market_service.get_tags()
+        if not data:
+            raise HTTPException(status_code=500, detail="Failed to retrieve tags")
+        return data
+    return fetch
+
+
+async def get_tags_entry(market: str) -> CacheEntry:
+    # stale-while-revalidate: 업스트림 장애(서킷 오픈 포함) 중에도 마지막 태그 데이터를 계속 제공
+    return await cached_fetch_entry(market, "tags", {}, tags_fetcher(market))
+
+
+async def get_tag_index(market: str) -> TagIndex:
+    entry = await get_tags_entry(market)
+    index = _indexes.get(market)
+    if index is None or index.etag != entry.etag:
+        # 큰 그룹의 검색 인덱스 생성은 이벤트 루프를 막지 않도록 executor에서 수행
+        index = await run_blocking(TagIndex, entry.value, entry.etag)
+        _indexes[market] = index
+        logger.debug(f"Tag index rebuilt for {market} ({len(index.groups)} groups)")
+    return index
@@ -0,0 +1,85 @@
+"""JSON 응답 직렬화 처리량 비교.
+
+FastAPI 기본 경로(jsonable_encoder + stdlib json)와 FastJSONResponse(orjson / msgspec),
+그리고 캐시된 본문을 그대로 전달하는 경로를 `full=true` 검색 결과 크기의 페이로드로 측정한다.
+
+    python -m benchmarks.bench_json --models 100 --seconds 2
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+os.environ.setdefault("HF_API_TOKEN", "benchmark")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.core import responses
+from benchmarks.common import measure
+
+
+def make_search_payload(models: int) -> dict:
+    return {
+        "models": [
+            {
+                "id": f"org-{i}/model-{i}",
+                "author": f"org-{i}",
+                "downloads": 1000 * i,
+                "likes": i,
+                "lastModified": datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat(),
+                "pipeline_tag": "text-generation",
+                "tags": ["transformers", "pytorch", "safetensors", "text-generation", "license:apache-2.0", "en"],
+                "cardData": {
+                    "license": "apache-2.0",
+                    "language": ["en", "ko"],
+                    "datasets": [f"dataset-{j}" for j in range(5)],
+                    "model-index": [{"name": f"model-{i}", "results": [{"task": {"type": "text-generation"},
+                                                                           "metrics": [{"type": "accuracy", "value": 0.9}]}]}],
+                },
+                "config": {"architectures": ["LlamaForCausalLM"], "model_type": "llama",
+                           "tokenizer_config": {"bos_token": "<s>", "eos_token": "</s>"}},
+            }
+            for i in range(models)
+        ],
+        "total": models,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    payload = make_search_payload(args.models)
+    body = responses.json_dumps(payload)
+
+    cases = [("fastapi_default", lambda: JSONResponse(jsonable_encoder(payload)).body)]
+    for backend in ("json", "orjson", "msgspec"):
+        dumps = responses._load_dumps(backend)
+        if backend != "json" and dumps is responses._stdlib_dumps:
+            continue
+        cases.append((f"fast_response[{backend}]", lambda dumps=dumps: dumps(payload)))
+    cases.append(("cached_body_passthrough", lambda: bytes(body)))
+
+    results = [measure(name, func, args.seconds) for name, func in cases]
+    baseline = results[0]["ops_per_sec"]
+    for result in results:
+        result["speedup"] = round(result["ops_per_sec"] / baseline, 2)
+
+    if args.json:
+        print(json.dumps({"benchmark": "json_serialization", "models": args.models, "payload_bytes": len(body),
+                          "results": results}, indent=2))
+        return
+    print(f"payload: {args.models} models, {len(body)} bytes")
+    for result in results:
+        print(f"{result['name']:<28} {result['ops_per_sec']:>10.1f} ops/s {result['us_per_op']:>10.2f} us/op "
+              f"x{result['speedup']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""핫 패스 마이크로 벤치마크: 직렬화, gzip 압축, 모델 카드 마크다운 렌더링, 캐시 연산, 태그 검색.
+
+    python -m benchmarks.bench_micro --seconds 1 --output results/micro.json
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+
+os.environ.setdefault("HF_API_TOKEN", "benchmark")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import responses
+from app.core.config import settings
+from app.core.compression import compress_cached
+from app.services.cache_backends import MemoryLRUTier
+from app.services.caching import CacheEntry, make_cache_key
+from app.services.markets.huggingface.huggingface_models import render_model_card
+from app.services.tag_index import TagGroup, TagIndex
+from benchmarks.bench_json import make_search_payload
+from benchmarks.common import measure, run_metadata, write_results
+from benchmarks.fake_hf import make_card, make_tags
+
+
+def serialization_cases(payload: dict):
+    body = responses.json_dumps(payload)
+    yield "json.dumps[stdlib]", lambda: responses._stdlib_dumps(payload)
+    yield f"json_dumps[{settings.JSON_BACKEND}]", lambda: responses.json_dumps(payload)
+    yield "json.loads", lambda: json.loads(body)
+
+
+def compression_cases(body: bytes):
+    for level in (1, 6, 9):
+        yield f"gzip[level={level}]", lambda level=level: gzip.compress(body, compresslevel=level, mtime=0)
+    yield "compress_cached[gzip,hit]", lambda: compress_cached("bench", body, "gzip")
+
+
+def markdown_cases(card_kb: int):
+    card = make_card(card_kb).decode("utf-8")
+    yield f"render_model_card[{card_kb}kb]", lambda: render_model_card(card)
+
+
+def cache_cases(payload: dict):
+    tier = MemoryLRUTier(max_entries=10000, max_bytes=256 * 1024 * 1024)
+    entry = CacheEntry.from_value(payload, 300)
+    loop = asyncio.new_event_loop()
+    keys = [make_cache_key("huggingface", "search", {"query": f"q{i}", "page": 1}) for i in range(1000)]
+    for key in keys:
+        loop.run_until_complete(tier.set(key, entry, 300, len(entry.body)))
+
+    async def get_many():
+        for key in keys:
+            await tier.get(key)
+
+    async def set_many():
+        for key in keys:
+            await tier.set(key, entry, 300, len(entry.body))
+
+    yield "make_cache_key", lambda: make_cache_key("huggingface", "search",
+                                                   {"query": "llama", "sort": "downloads", "page": 1, "limit": 30})
+    yield "CacheEntry.from_value", lambda: CacheEntry.from_value(payload, 300)
+    yield "memory_tier.get[x1000]", lambda: loop.run_until_complete(get_many())
+    yield "memory_tier.set[x1000]", lambda: loop.run_until_complete(set_many())
+
+
+def tag_cases(per_group: int):
+    tags = make_tags(per_group)
+    index = TagIndex(tags, "bench")
+    group = index.groups["language"]
+    yield f"TagIndex.build[{per_group}/group]", lambda: TagIndex(tags, "bench")
+    yield "TagGroup.search[prefix]", lambda: group.search("language 1", 20)
+    yield "TagGroup.search[substring]", lambda: group.search("age 9", 20)
+    # 큰 그룹(데이터셋 태그 규모)에서도 prefix 검색은 정렬된 인덱스의 이진 탐색으로 그룹 크기와 무관해야 함
+    large = TagGroup("dataset", [{"id": f"dataset-{i}", "label": f"Dataset {i:05d}", "type": "dataset"}
+                                 for i in range(20000)], "bench")
+    yield "TagGroup.search[prefix, 20000 items]", lambda: large.search("dataset 1", 20)
+    yield "TagGroup.search[substring miss, 20000 items]", lambda: large.search("zzz", 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=1.0, help="measurement time per case")
+    parser.add_argument("--models", type=int, default=100, help="models in the serialized search payload")
+    parser.add_argument("--card-kb", type=int, default=16)
+    parser.add_argument("--tags-per-group", type=int, default=2000)
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    payload = make_search_payload(args.models)
+    body = responses.json_dumps(payload)
+    groups = {
+        "serialization": serialization_cases(payload),
+        "compression": compression_cases(body),
+        "markdown": markdown_cases(args.card_kb),
+        "cache": cache_cases(payload),
+        "tags": tag_cases(args.tags_per_group),
+    }
+
+    results = []
+    for group, cases in groups.items():
+        for name, func in cases:
+            result = dict(measure(name, func, args.seconds), group=group)
+            print(f"{group:<14} {name:<32} {result['ops_per_sec']:>12.1f} ops/s {result['us_per_op']:>12.2f} us/op",
+                  file=sys.stderr)
+            results.append(result)
+    write_results({"benchmark": "micro", **run_metadata(vars(args)), "payload_bytes": len(body),
+                   "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""벤치마크 스크립트 공용 유틸리티 (측정, 백분위수, 결과 기록)."""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(name: str, func: Callable[[], Any], seconds: float) -> Dict[str, Any]:
+    func()
+    iterations = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        func()
+        iterations += 1
+    elapsed = time.perf_counter() - started
+    return {"name": name, "ops_per_sec": round(iterations / elapsed, 1), "us_per_op": round(elapsed / iterations * 1e6, 2)}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def read_process_cpu(pid: int) -> Optional[float]:
+    """프로세스의 누적 CPU 시간(초, user+system). /proc이 없는 환경에서는 None."""
+    try:
+        with open(f"/proc/{pid}/stat") as file:
+            fields = file.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # ")" 이후 필드 기준 utime=12, stime=13 (stat(5)의 14, 15번째)
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": parameters,
+    }
+
+
+def write_results(data: Dict[str, Any], output: Optional[str]):
+    text = json.dumps(data, indent=2)
+    if not output:
+        print(text)
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        file.write(text + "\n")
+    print(f"results written to {output}", file=sys.stderr)
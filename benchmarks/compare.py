@@ -0,0 +1,57 @@
+"""두 벤치마크 결과(JSON)를 비교해 지표별 변화율을 출력한다.
+
+임계값보다 나빠진 지표가 있으면 종료 코드 1을 반환하므로 커밋 간 회귀 확인에 사용할 수 있다.
+
+    python -m benchmarks.compare results/base.json results/new.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+# 지표별로 값이 클수록 좋은지 여부
+METRICS = {
+    "rps": True,
+    "ops_per_sec": True,
+    "bytes_per_sec": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "cpu_ms_per_request": False,
+}
+
+
+def load(path: str) -> dict:
+    with open(path) as file:
+        data = json.load(file)
+    return {result["name"]: result for result in data["results"]}, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    base, base_data = load(args.base)
+    new, new_data = load(args.new)
+    print(f"base: {base_data.get('commit')}  new: {new_data.get('commit')}")
+
+    regressions = 0
+    for name in base:
+        if name not in new:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = base[name].get(metric), new[name].get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            worse = -change if higher_is_better else change
+            flag = "REGRESSION" if worse > args.threshold else ""
+            regressions += bool(flag)
+            print(f"{name:<32} {metric:<20} {before:>12} -> {after:>12} {change:>+8.1f}% {flag}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""부하 테스트용 로컬 HuggingFace Hub 대역 서버.
+
+HUB Connect가 호출하는 엔드포인트(models-json, /api/models, 모델 정보, paths-info, 태그,
+resolve 파일 다운로드)를 결정적인 데이터로 응답하며, 응답 지연과 페이로드 크기를 조절할 수 있다.
+
+    python -m benchmarks.fake_hf --port 8900 --latency-ms 50 --card-kb 16 --file-mb 8
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+WEIGHTS_FILE = "model.safetensors"
+
+
+def model_id(index: int) -> str:
+    return f"org-{index}/model-{index}"
+
+
+def list_item(index: int) -> Dict[str, Any]:
+    return {
+        "_id": f"{index:024x}",
+        "id": model_id(index),
+        "author": f"org-{index}",
+        "downloads": 1_000_000 // (index + 1),
+        "likes": 10_000 // (index + 1),
+        "lastModified": f"2024-{index % 12 + 1:02d}-{index % 28 + 1:02d}T00:00:00.000Z",
+        "createdAt": "2023-01-01T00:00:00.000Z",
+        "pipeline_tag": "text-generation" if index % 2 else "fill-mask",
+        "library_name": "transformers",
+        "tags": ["transformers", "pytorch", "safetensors", "license:apache-2.0", "en", f"dataset:set-{index % 10}"],
+        "private": False,
+        "gated": False,
+        "trendingScore": 1000 - index,
+    }
+
+
+def full_item(index: int) -> Dict[str, Any]:
+    item = list_item(index)
+    item.update({
+        "sha": SHA,
+        "cardData": {"license": "apache-2.0", "language": ["en", "ko"],
+                     "datasets": [f"set-{index % 10}"], "pipeline_tag": item["pipeline_tag"]},
+        "config": {"architectures": ["LlamaForCausalLM"], "model_type": "llama"},
+        "siblings": [{"rfilename": name} for name in (".gitattributes", "README.md", "config.json", WEIGHTS_FILE)],
+    })
+    return item
+
+
+def make_card(size_kb: int) -> bytes:
+    header = "---\nlicense: apache-2.0\nlanguage:\n- en\n- ko\npipeline_tag: text-generation\n---\n\n# Model\n\n"
+    section = (
+        "## Usage\n\nSome **bold** text with a [link](https://example.com) and `inline code`.\n\n"
+        "```python\nfrom transformers import AutoModel\nmodel = AutoModel.from_pretrained('org/model')\n```\n\n"
+        "| metric | value |\n|---|---|\n| accuracy | 0.91 |\n| f1 | 0.88 |\n\n"
+    )
+    body = header
+    while len(body) < size_kb * 1024:
+        body += section
+    return body.encode("utf-8")
+
+
+def make_tags(per_group: int) -> Dict[str, List[Dict[str, str]]]:
+    groups = ["region", "other", "library", "license", "language", "dataset", "pipeline_tag"]
+    return {group: [{"id": f"{group}-{i}", "label": f"{group.title()} {i}", "type": group}
+                    for i in range(per_group)] for group in groups}
+
+
+def git_blob_sha1(content: bytes) -> str:
+    return hashlib.sha1(f"blob {len(content)}\0".encode() + content).hexdigest()
+
+
+class FakeHub:
+    def __init__(self, models: int, page_size: int, card_kb: int, file_mb: int, tags_per_group: int,
+                 latency_ms: float, jitter_ms: float):
+        self.models = models
+        self.page_size = page_size
+        self.card = make_card(card_kb)
+        self.weights = random.Random(0).randbytes(file_mb * 1024 * 1024)
+        self.weights_sha256 = hashlib.sha256(self.weights).hexdigest()
+        self.files = {"README.md": self.card, "config.json": b'{"model_type": "llama"}', WEIGHTS_FILE: self.weights}
+        self.blob_ids = {name: git_blob_sha1(content) for name, content in self.files.items()}
+        self.tags = make_tags(tags_per_group)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.requests = 0
+
+    @web.middleware
+    async def latency_middleware(self, request: web.Request, handler):
+        self.requests += 1
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await handler(request)
+
+    def _matching(self, search: str) -> List[int]:
+        indexes = range(self.models)
+        return [i for i in indexes if search in model_id(i)] if search else list(indexes)
+
+    async def models_json(self, request: web.Request) -> web.Response:
+        matches = self._matching(request.query.get("search", ""))
+        page = int(request.query.get("p", 0))
+        items = [dict(list_item(i), repoType="model")
+                 for i in matches[page * self.page_size:(page + 1) * self.page_size]]
+        return web.json_response({"models": items, "numTotalItems": len(matches)})
+
+    async def api_models(self, request: web.Request) -> web.Response:
+        matches = self._matching(request.query.get("search", ""))
+        limit = int(request.query.get("limit", self.page_size))
+        # 다음 페이지 Link는 실제 Hub처럼 opaque cursor로 전달 (여기서는 offset을 그대로 사용)
+        offset = int(request.query.get("cursor") or request.query.get("offset", 0))
+        full = request.query.get("full") == "true"
+        items = [full_item(i) if full else list_item(i) for i in matches[offset:offset + limit]]
+        headers = {}
+        if offset + limit < len(matches):
+            query = [(name, value) for name, value in request.query.items() if name not in ("offset", "cursor")]
+            query.append(("cursor", str(offset + limit)))
+            headers["Link"] = f'<{request.url.with_query(query)}>; rel="next"'
+        return web.json_response(items, headers=headers)
+
+    def _index(self, request: web.Request) -> int:
+        org, name = request.match_info["org"], request.match_info["name"]
+        try:
+            index = int(name.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            raise web.HTTPNotFound()
+        if org != f"org-{index}" or index >= self.models:
+            raise web.HTTPNotFound()
+        return index
+
+    async def model_info(self, request: web.Request) -> web.Response:
+        item = full_item(self._index(request))
+        if request.query.get("blobs"):
+            item["siblings"] = [self._sibling(name, content) for name, content in self.files.items()]
+        return web.json_response(item)
+
+    def _sibling(self, name: str, content: bytes) -> Dict[str, Any]:
+        sibling = {"rfilename": name, "size": len(content), "blobId": self.blob_ids[name]}
+        if name == WEIGHTS_FILE:
+            sibling["lfs"] = {"size": len(content), "sha256": self.weights_sha256, "pointerSize": 134}
+        return sibling
+
+    async def paths_info(self, request: web.Request) -> web.Response:
+        self._index(request)
+        form = await request.post()
+        result = []
+        for path in form.getall("paths", []):
+            if path not in self.files:
+                continue
+            content = self.files[path]
+            info = {"type": "file", "path": path, "size": len(content), "oid": self.blob_ids[path]}
+            if path == WEIGHTS_FILE:
+                info["lfs"] = {"size": len(content), "oid": self.weights_sha256, "pointerSize": 134}
+            result.append(info)
+        return web.json_response(result)
+
+    async def tags_by_type(self, request: web.Request) -> web.Response:
+        return web.json_response(self.tags)
+
+    async def resolve(self, request: web.Request) -> web.StreamResponse:
+        self._index(request)
+        filename = request.match_info["filename"]
+        content = self.files.get(filename)
+        if content is None:
+            raise web.HTTPNotFound()
+        etag = self.weights_sha256 if filename == WEIGHTS_FILE else self.blob_ids[filename]
+        headers = {"X-Repo-Commit": SHA, "ETag": f'"{etag}"', "Accept-Ranges": "bytes"}
+        status, body = 200, content
+        range_header = request.headers.get("Range", "")
+        if range_header.startswith("bytes="):
+            start_text, _, end_text = range_header[6:].partition("-")
+            start = int(start_text or 0)
+            end = min(int(end_text) if end_text else len(content) - 1, len(content) - 1)
+            if start >= len(content):
+                raise web.HTTPRequestRangeNotSatisfiable(headers={"Content-Range": f"bytes */{len(content)}"})
+            status, body = 206, content[start:end + 1]
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            return web.Response(status=status, headers=headers)
+        return web.Response(status=status, body=body, headers=headers, content_type="application/octet-stream")
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"requests": self.requests})
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.latency_middleware], client_max_size=16 * 1024 * 1024)
+        repo = "/{org}/{name}"
+        app.router.add_get("/models-json", self.models_json)
+        app.router.add_get("/api/models", self.api_models)
+        app.router.add_get("/api/models-tags-by-type", self.tags_by_type)
+        app.router.add_get("/api/models" + repo, self.model_info)
+        app.router.add_get("/api/models" + repo + "/revision/{revision}", self.model_info)
+        app.router.add_post("/api/models" + repo + "/paths-info/{revision}", self.paths_info)
+        app.router.add_route("HEAD", repo + "/resolve/{revision}/{filename}", self.resolve)
+        app.router.add_get(repo + "/resolve/{revision}/{filename}", self.resolve, allow_head=False)
+        app.router.add_get("/_stats", self.stats)
+        return app
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--models", type=int, default=1000, help="number of fake models")
+    parser.add_argument("--page-size", type=int, default=30)
+    parser.add_argument("--card-kb", type=int, default=16, help="README.md (model card) size")
+    parser.add_argument("--file-mb", type=int, default=8, help="weights file size for downloads")
+    parser.add_argument("--tags-per-group", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="fixed upstream latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="random extra latency per request")
+
+
+def hub_from_args(args: argparse.Namespace) -> FakeHub:
+    return FakeHub(args.models, args.page_size, args.card_kb, args.file_mb, args.tags_per_group,
+                   args.latency_ms, args.jitter_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_arguments(parser)
+    args = parser.parse_args()
+    web.run_app(hub_from_args(args).build_app(), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""로컬 HuggingFace 대역 서버를 상대로 HUB Connect 부하 테스트를 실행한다.
+
+fake_hf 서버와 앱(uvicorn)을 각각 하위 프로세스로 띄우고, 시나리오별로 동시 요청을 보내
+RPS, 지연 시간 p50/p95/p99, 요청당 앱 프로세스 CPU 시간을 측정해 JSON으로 기록한다.
+
+    python -m benchmarks.load_test --duration 10 --concurrency 32 --output results/load.json
+    python -m benchmarks.load_test --scenarios search,detail --latency-ms 100
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.common import percentile, read_process_cpu, run_metadata, write_results
+from benchmarks.fake_hf import WEIGHTS_FILE, add_arguments, model_id
+
+API = "/api/v1"
+MARKET = "market=huggingface"
+
+# 시나리오별 요청 URL. k는 키 공간(--keys) 안에서 순환해 캐시 hit/miss 비율을 조절한다.
+SCENARIOS: Dict[str, Callable[[int], str]] = {
+    "search": lambda k: f"{API}/models/?{MARKET}&query=model-{k}&sort=downloads",
+    "trending": lambda k: f"{API}/models/?{MARKET}&sort=trending&page={k % 5 + 1}",
+    "detail": lambda k: f"{API}/models/{model_id(k)}?{MARKET}",
+    "tags": lambda k: f"{API}/tags/language/search?{MARKET}&q=language {k % 20}",
+    "download": lambda k: f"{API}/models/{model_id(k)}/download?{MARKET}&filename={WEIGHTS_FILE}",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_ready(url: str, timeout: float = 30.0, interval: float = 0.2):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url) as response:
+                    if response.status < 500:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(interval)
+    raise RuntimeError(f"{url} did not become ready in {timeout}s")
+
+
+async def run_scenario(base_url: str, name: str, keys: int, concurrency: int, duration: float,
+                       app_pid: int) -> Dict:
+    make_url = SCENARIOS[name]
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    transferred = 0
+    counter = 0
+    connector = aiohttp.TCPConnector(limit=concurrency)
+
+    async with aiohttp.ClientSession(base_url, connector=connector) as session:
+        # 캐시 채우기: 측정 전에 키 공간을 한 번 순회
+        for k in range(keys):
+            async with session.get(make_url(k)) as response:
+                await response.read()
+
+        async def worker(deadline: float):
+            nonlocal counter, transferred
+            while time.perf_counter() < deadline:
+                k = counter % keys
+                counter += 1
+                started = time.perf_counter()
+                async with session.get(make_url(k), headers={"Accept-Encoding": "gzip"}) as response:
+                    async for chunk in response.content.iter_any():
+                        transferred += len(chunk)
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+
+        cpu_before = read_process_cpu(app_pid)
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(started + duration) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+        cpu_after = read_process_cpu(app_pid)
+
+    requests = len(latencies)
+    latencies.sort()
+    cpu_per_request = None
+    if cpu_before is not None and cpu_after is not None and requests:
+        cpu_per_request = round((cpu_after - cpu_before) / requests * 1000, 3)
+    return {
+        "name": name,
+        "requests": requests,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        "cpu_ms_per_request": cpu_per_request,
+        "bytes_per_sec": round(transferred / elapsed),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def start_process(args: List[str], env: Dict[str, str], cwd: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *args], env=env, cwd=cwd,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def stop_process(process: Optional[subprocess.Popen]):
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def app_env(hub_url: str, workdir: str, **overrides: str) -> Dict[str, str]:
+    return dict(os.environ, PYTHONPATH=ROOT, HF_ENDPOINT=hub_url, HF_API_TOKEN="benchmark",
+                HF_HOME=os.path.join(workdir, "hf_home"), BLOB_STORE_DIR=os.path.join(workdir, "blob_store"),
+                WARMER_ENABLED="false", LOG_LEVEL="WARNING", **overrides)
+
+
+def hub_command(args: argparse.Namespace, port: int) -> List[str]:
+    return ["-m", "benchmarks.fake_hf", "--port", str(port), "--models", str(args.models),
+            "--page-size", str(args.page_size), "--card-kb", str(args.card_kb), "--file-mb", str(args.file_mb),
+            "--tags-per-group", str(args.tags_per_group), "--latency-ms", str(args.latency_ms),
+            "--jitter-ms", str(args.jitter_ms)]
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    hub_port, app_port = free_port(), free_port()
+    hub_url = f"http://127.0.0.1:{hub_port}"
+    workdir = tempfile.mkdtemp(prefix="hub-connect-bench-")
+    env = app_env(hub_url, workdir, DOWNLOAD_MODE=args.download_mode)
+
+    hub_args = hub_command(args, hub_port)
+    app_args = ["-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(app_port),
+                "--log-level", "warning", "--no-access-log"]
+    hub = app = None
+    try:
+        hub = start_process(hub_args, env, ROOT)
+        await wait_until_ready(f"{hub_url}/_stats")
+        # 앱은 작업 디렉터리에 app.log를 남기므로 임시 디렉터리에서 실행
+        app = start_process(app_args, env, workdir)
+        await wait_until_ready(f"http://127.0.0.1:{app_port}/ready")
+
+        results = []
+        for name in args.scenarios.split(","):
+            result = await run_scenario(f"http://127.0.0.1:{app_port}", name, args.keys, args.concurrency,
+                                        args.duration, app.pid)
+            print(f"{name:<10} {result['rps']:>9.1f} rps  p50 {result['p50_ms']:>8.2f} ms  "
+                  f"p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms  "
+                  f"cpu {result['cpu_ms_per_request']} ms/req  {result['statuses']}", file=sys.stderr)
+            results.append(result)
+        return results
+    finally:
+        stop_process(app)
+        stop_process(hub)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--keys", type=int, default=50, help="distinct keys per scenario (cache working set)")
+    parser.add_argument("--download-mode", choices=["stream", "cache"], default="stream")
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    results = asyncio.run(run(args))
+    write_results({"benchmark": "load", **run_metadata(vars(args)), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""콜드 스타트 측정: app.main import 시간과 프로세스 시작부터 첫 요청 응답까지의 시간.
+
+매 실행마다 새 프로세스를 띄워 다음 단계를 측정한다 (로컬 HuggingFace 대역 서버 사용).
+  - import: `import app.main` 소요 시간
+  - live: run.py 실행 ~ live check(/) 응답
+  - ready: run.py 실행 ~ /ready 200 (warm-up 완료)
+  - first_request: run.py 실행 ~ 첫 API 요청(검색, 캐시 미스) 응답 완료
+
+    python -m benchmarks.startup --runs 5 --output results/startup.json
+    python -m benchmarks.startup --importtime 15     # import 비용이 큰 모듈 상위 15개 출력
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.common import percentile, run_metadata, write_results
+from benchmarks.fake_hf import add_arguments
+from benchmarks.load_test import (API, MARKET, app_env, free_port, hub_command, start_process, stop_process,
+                                  wait_until_ready)
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import app.main; print(time.perf_counter() - started)"
+
+
+def measure_import(env: Dict[str, str], workdir: str) -> float:
+    output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], env=env, cwd=workdir,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def top_imports(env: Dict[str, str], workdir: str, count: int) -> List[Dict]:
+    # -X importtime 출력: "import time: self [us] | cumulative | imported package"
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], env=env, cwd=workdir,
+                            capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[0].split(":")[-1].strip().isdigit():
+            continue
+        rows.append({"module": parts[2].strip(), "self_ms": int(parts[0].split(":")[-1]) / 1000,
+                     "cumulative_ms": int(parts[1]) / 1000})
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:count]
+
+
+async def wait_for_status(session: aiohttp.ClientSession, url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.005)
+    raise RuntimeError(f"{url} did not return 200 in {timeout}s")
+
+
+async def measure_server(env: Dict[str, str], workdir: str, workers: int) -> Dict[str, float]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    app = start_process([os.path.join(ROOT, "run.py"), "--host", "127.0.0.1", "--port", str(port),
+                         "--workers", str(workers)], env, workdir)
+    try:
+        timings = {}
+        async with aiohttp.ClientSession() as session:
+            await wait_for_status(session, f"{base_url}/")
+            timings["live"] = time.perf_counter() - started
+            await wait_for_status(session, f"{base_url}/ready")
+            timings["ready"] = time.perf_counter() - started
+            async with session.get(f"{base_url}{API}/models/?{MARKET}&query=model-1") as response:
+                await response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"first request failed with {response.status}")
+            timings["first_request"] = time.perf_counter() - started
+        return timings
+    finally:
+        stop_process(app)
+
+
+def summarize(name: str, values: List[float]) -> Dict:
+    values = sorted(values)
+    return {
+        "name": name,
+        "runs": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "min_ms": round(values[0] * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    hub_port = free_port()
+    hub_url = f"http://127.0.0.1:{hub_port}"
+    workdir = tempfile.mkdtemp(prefix="hub-connect-startup-")
+    env = app_env(hub_url, workdir, SERVER_ACCESS_LOG="false")
+    hub = None
+    try:
+        hub = start_process(hub_command(args, hub_port), env, ROOT)
+        await wait_until_ready(f"{hub_url}/_stats")
+
+        samples: Dict[str, List[float]] = {"import": [], "live": [], "ready": [], "first_request": []}
+        for _ in range(args.runs):
+            samples["import"].append(measure_import(env, workdir))
+            for name, value in (await measure_server(env, workdir, args.workers)).items():
+                samples[name].append(value)
+
+        results = [summarize(name, values) for name, values in samples.items()]
+        for result in results:
+            print(f"{result['name']:<14} p50 {result['p50_ms']:>9.2f} ms  min {result['min_ms']:>9.2f} ms  "
+                  f"max {result['max_ms']:>9.2f} ms", file=sys.stderr)
+        imports = top_imports(env, workdir, args.importtime) if args.importtime else []
+        for row in imports:
+            print(f"{row['cumulative_ms']:>9.1f} ms  {row['module']}", file=sys.stderr)
+        return {"results": results, "top_imports": imports}
+    finally:
+        stop_process(hub)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to start per measurement")
+    parser.add_argument("--workers", type=int, default=1, help="run.py --workers")
+    parser.add_argument("--importtime", type=int, default=0, help="report the N slowest imports (python -X importtime)")
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    add_arguments(parser)
+    parser.set_defaults(latency_ms=0.0, jitter_ms=0.0, file_mb=1)
+    args = parser.parse_args()
+
+    data = asyncio.run(run(args))
+    write_results({"benchmark": "startup", **run_metadata(vars(args)), **data}, args.output)
+
+
+if __name__ == "__main__":
+    main()
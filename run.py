@@ -1,4 +1,43 @@
+"""HUB Connect 서버 실행.
+
+    python run.py                  # 프로덕션: settings(SERVER_*) 기준 워커 수, uvloop/httptools, graceful shutdown
+    python run.py --workers 4      # 설정값을 명령행에서 덮어쓰기
+    python run.py --reload         # 개발용: 단일 프로세스, 코드 변경 시 재시작
+"""
+import argparse
+import os
+
 import uvicorn
 
+from app.core.config import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument("--reload", action="store_true", help="development mode (single process, auto reload)")
+    args = parser.parse_args()
+
+    # 워커 프로세스는 각자 app.main을 import 하므로 앱은 import 문자열로 전달
+    # 워커 수는 환경 변수로 넘겨 각 워커가 지표 pid 레이블과 리더 잠금 사용 여부를 판단하게 함
+    os.environ["SERVER_WORKERS"] = "1" if args.reload else str(args.workers)
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=None if args.reload else args.workers,
+        reload=args.reload,
+        loop=settings.SERVER_LOOP,
+        http=settings.SERVER_HTTP,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        access_log=settings.SERVER_ACCESS_LOG,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+
+
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8001, reload=True)
\ No newline at end of file
+    main()
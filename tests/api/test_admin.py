@@ -0,0 +1,42 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.caching import cache, cache_data, get_cached_entry
+from app.services.singleflight import upstream_flight
+
+client = TestClient(app)
+
+
+def test_api_cache_stats_reports_tier_counters():
+    asyncio.run(cache.clear())
+    asyncio.run(cache_data("admin:test", {"ok": True}))
+    asyncio.run(get_cached_entry("admin:test"))
+    asyncio.run(get_cached_entry("admin:missing"))
+
+    response = client.get("/api/v1/admin/cache")
+    assert response.status_code == 200
+    memory = response.json()["memory"]
+    assert memory["hits"] >= 1 and memory["misses"] >= 1
+    assert "evictions" in memory
+
+    text = client.get("/metrics").text
+    assert "# TYPE hub_cache_tier_hits_total counter" in text
+    assert 'hub_cache_tier_evictions_total{tier="memory"}' in text
+
+
+def test_api_singleflight_stats_counts_coalesced_calls():
+    async def scenario():
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "ok"
+        await asyncio.gather(*(upstream_flight.do("admin:flight", fetch) for _ in range(3)))
+
+    before = client.get("/api/v1/admin/singleflight").json()
+    asyncio.run(scenario())
+    after = client.get("/api/v1/admin/singleflight").json()
+
+    assert after["originated"] - before["originated"] == 1
+    assert after["coalesced"] - before["coalesced"] == 2
+    assert f'hub_singleflight_calls_total{{result="coalesced"}} {after["coalesced"]}' in client.get("/metrics").text
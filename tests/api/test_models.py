@@ -1,117 +1,127 @@
-import os
-import tempfile
+import asyncio
+import json
+from unittest.mock import patch, MagicMock, AsyncMock
 
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
-from dotenv import load_dotenv
-
-# 테스트 시작 전에 .env 파일 로드
-load_dotenv()
-
-# 환경 변수가 제대로 로드되었는지 확인 (디버깅 목적)
-print(f"HF_API_TOKEN: {'*' * len(os.getenv('HF_API_TOKEN', ''))}")  # 토큰 값을 직접 출력하지 않고 길이만 표시
+from starlette.responses import Response
 
+from app.core.config import settings
 from app.main import app
-from app.api import models
+from app.services.caching import cache, cache_data
 
 client = TestClient(app)
 
 @pytest.fixture
-def mock_requests():
-    with patch('app.api.models.requests') as mock:
-        yield mock
-
-@pytest.fixture
-def mock_hf_api():
-    with patch('app.api.models.hf_api') as mock:
-        yield mock
-
-@pytest.fixture
-def mock_hf_hub_download():
-    with patch('app.api.models.hf_hub_download') as mock:
-        yield mock
-
-def test_api_models_trending(mock_requests):
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
+def mock_market_service():
+    asyncio.run(cache.clear())
+    service = MagicMock()
+    with patch('app.api.models.get_market_service', return_value=service):
+        yield service
+
+def test_api_models_trending(mock_market_service):
+    mock_market_service.get_trending_models = AsyncMock(return_value={
         'models': [
             {'id': 'model1', 'repoType': 'model'},
             {'id': 'model2', 'repoType': 'model'}
         ],
-        'numTotalItems': 2
-    }
-    mock_requests.get.return_value = mock_response
+        'total': 2
+    })
 
-    response = client.get("/api/v1/models?sort=trending")
+    response = client.get("/api/v1/models?market=huggingface&sort=trending")
     assert response.status_code == 200
     data = response.json()
     assert len(data['models']) == 2
     assert data['total'] == 2
+    assert mock_market_service.get_trending_models.await_args.args[0] == 1
 
-def test_api_models_search(mock_requests):
-    mock_response = MagicMock()
-    mock_response.json.return_value = [
-        {'id': 'model1'}, {'id': 'model2'}
-    ]
-    mock_requests.get.return_value = mock_response
+def test_api_models_search(mock_market_service):
+    mock_market_service.search_models = AsyncMock(return_value={
+        'models': [{'id': 'model1'}, {'id': 'model2'}],
+        'total': 2
+    })
 
-    response = client.get("/api/v1/models?query=test&sort=downloads")
+    response = client.get("/api/v1/models?market=huggingface&query=test&sort=downloads")
     assert response.status_code == 200
     data = response.json()
     assert len(data['models']) == 2
     assert data['total'] == 2
+    query, sort, page, limit = mock_market_service.search_models.await_args.args[:4]
+    assert (query, sort, page, limit) == ('test', 'downloads', 1, 30)
 
-def test_api_model_files(mock_hf_api):
-    mock_repo_info = MagicMock()
-    mock_repo_info.siblings = [
-        MagicMock(rfilename='file1.txt', size=1000, blob_id='blob1'),
-        MagicMock(rfilename='file2.txt', size=2000, blob_id='blob2')
-    ]
-    mock_hf_api.repo_info.return_value = mock_repo_info
+def test_api_model_files(mock_market_service):
+    mock_market_service.get_model_files = AsyncMock(return_value={'files': [
+        {'name': 'file1.txt', 'size': '1000 B', 'blob_id': 'blob1'},
+        {'name': 'file2.txt', 'size': '2000 B', 'blob_id': 'blob2'},
+    ]})
 
-    response = client.get("/api/v1/models/test-model/files")
+    response = client.get("/api/v1/models/test-model/files?market=huggingface")
     assert response.status_code == 200
     data = response.json()
     assert len(data['files']) == 2
     assert data['files'][0]['name'] == 'file1.txt'
     assert data['files'][1]['name'] == 'file2.txt'
-
-@patch('app.api.models.hf_hub_download')
-def test_download_model(mock_hf_hub_download):
-    # 임시 파일 생성
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        temp_file.write(b"Test content")
-        temp_file_path = temp_file.name
-
-    mock_hf_hub_download.return_value = temp_file_path
-
-    try:
-        response = client.get("/api/v1/models/test-model/download?filename=test_file.bin")
+    mock_market_service.get_model_files.assert_awaited_once_with('test-model', None)
+
+def test_api_model_files_filters_paginates_and_totals(mock_market_service):
+    mock_market_service.get_model_files = AsyncMock(return_value={'sha': 'a' * 40, 'files': [
+        {'name': 'README.md', 'size_bytes': 10},
+        {'name': 'model-00001.safetensors', 'size_bytes': 1000},
+        {'name': 'model-00002.safetensors', 'size_bytes': 2000},
+        {'name': 'onnx/model.onnx', 'size_bytes': 500},
+    ]})
+
+    with patch('app.api.models.cache_data', wraps=cache_data) as cached:
+        response = client.get("/api/v1/models/org/big/files?market=huggingface&extensions=safetensors&limit=1&page=2")
         assert response.status_code == 200
-        assert response.headers['content-type'] == 'application/octet-stream'
-        assert response.headers['content-disposition'] == 'attachment; filename="test_file.bin"'
-        assert response.content == b"Test content"
-    finally:
-        # 테스트 후 임시 파일 삭제
-        os.unlink(temp_file_path)
-
-@patch('app.api.models.get_model_info')
-@patch('app.api.models.get_model_card')
-@patch('app.api.models.markdown2.markdown')
-def test_api_model_detail(mock_markdown, mock_get_model_card, mock_get_model_info):
-    mock_get_model_info.return_value = MagicMock(
-        id='test-model',
-        downloads=1000,
-        likes=100,
-        lastModified='2023-01-01',
-        pipeline_tag='text-classification',
-        tags=['nlp', 'classification']
-    )
-    mock_get_model_card.return_value = ({'key': 'value'}, 'Model card text')
-    mock_markdown.return_value = '<p>Model card HTML</p>'
-
-    response = client.get("/api/v1/models/test-model")
+        data = response.json()
+        assert [file['name'] for file in data['files']] == ['model-00002.safetensors']
+        assert (data['total'], data['total_size'], data['sha']) == (2, 3000, 'a' * 40)
+
+        data = client.get("/api/v1/models/org/big/files?market=huggingface&pattern=onnx/*").json()
+        assert [file['name'] for file in data['files']] == ['onnx/model.onnx']
+        assert client.get("/api/v1/models/org/big/files?market=huggingface&page=99").json()['files'] == []
+        # 필터/임의 페이지 결과는 캐시하지 않음
+        cached.assert_not_called()
+
+        assert client.get("/api/v1/models/org/big/files?market=huggingface").json()['total'] == 4
+        assert cached.await_count == 1
+    # 목록은 (model_id, revision) 단위로 캐시되어 필터/페이지가 달라도 다시 조회하지 않음
+    mock_market_service.get_model_files.assert_awaited_once_with('org/big', None)
+
+def test_download_model(mock_market_service):
+    mock_market_service.stream_model_file = AsyncMock(return_value=Response(
+        content=b"Test content", media_type='application/octet-stream',
+        headers={'Content-Disposition': 'attachment; filename="test_file.bin"'}
+    ))
+    mock_market_service.download_model_file = AsyncMock(return_value=Response(content=b"Cached content"))
+
+    response = client.get("/api/v1/models/test-model/download?market=huggingface&filename=test_file.bin&stream=true")
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/octet-stream'
+    assert response.headers['content-disposition'] == 'attachment; filename="test_file.bin"'
+    assert response.content == b"Test content"
+    mock_market_service.stream_model_file.assert_awaited_once_with('test-model', 'test_file.bin', None)
+
+    response = client.get("/api/v1/models/test-model/download?market=huggingface&filename=test_file.bin&stream=false",
+                          headers={'Range': 'bytes=0-3'})
+    assert response.content == b"Cached content"
+    mock_market_service.download_model_file.assert_awaited_once_with('test-model', 'test_file.bin', 'bytes=0-3')
+
+def test_api_model_detail(mock_market_service):
+    mock_market_service.get_model_detail = AsyncMock(return_value={
+        'id': 'test-model',
+        'downloads': 1000,
+        'likes': 100,
+        'lastModified': '2023-01-01',
+        'pipeline_tag': 'text-classification',
+        'tags': ['nlp', 'classification'],
+        'key': 'value',
+        'card_html': '<p>Model card HTML</p>'
+    })
+
+    response = client.get("/api/v1/models/test-model?market=huggingface")
     assert response.status_code == 200
     data = response.json()
     assert data['id'] == 'test-model'
@@ -122,10 +132,93 @@ def test_api_model_detail(mock_markdown, mock_get_model_card, mock_get_model_inf
     assert data['tags'] == ['nlp', 'classification']
     assert data['key'] == 'value'
     assert data['card_html'] == '<p>Model card HTML</p>'
+    mock_market_service.get_model_detail.assert_awaited_once_with('test-model', include_html=True)
+
+    response = client.get("/api/v1/models/test-model?market=huggingface",
+                          headers={'If-None-Match': response.headers['etag']})
+    assert response.status_code == 304
+    assert response.content == b""
 
-def test_api_models_error(mock_requests):
-    mock_requests.get.side_effect = Exception("Test error")
+def test_api_models_error(mock_market_service):
+    mock_market_service.search_models = AsyncMock(side_effect=Exception("Test error"))
 
-    response = client.get("/api/v1/models")
+    response = client.get("/api/v1/models?market=huggingface")
     assert response.status_code == 500
-    assert "Test error" in response.json()['detail']
\ No newline at end of file
+    assert "Test error" in response.json()['detail']
+
+
+def test_api_models_batch_streams_ndjson(mock_market_service):
+    async def get_model_detail(model_id, include_html=False):
+        if model_id == 'missing':
+            raise Exception("Repository not found")
+        return {'id': model_id, 'downloads': 1, 'likes': 2}
+
+    mock_market_service.get_model_detail = AsyncMock(side_effect=get_model_detail)
+
+    response = client.post("/api/v1/models/batch?market=huggingface",
+                           json={"model_ids": ["model1", "missing", "model2", "model1"], "fields": ["id", "likes"]})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = {item['id']: item for item in map(json.loads, response.text.splitlines())}
+    assert len(lines) == 3
+    assert lines['model1']['data'] == {'id': 'model1', 'likes': 2}
+    assert lines['missing']['status'] == 404
+    assert mock_market_service.get_model_detail.await_count == 3
+
+    response = client.post("/api/v1/models/batch?market=huggingface",
+                           json={"model_ids": ["model1"], "fields": ["id", "siblings"]})
+    assert response.status_code == 400
+    assert response.json()['detail'] == "Unsupported fields: siblings"
+
+
+def test_api_models_fields_projection(mock_market_service):
+    mock_market_service.search_models = AsyncMock(return_value={'models': [{'id': 'model1', 'likes': 3}], 'total': 1})
+
+    response = client.get("/api/v1/models/?market=huggingface")
+    assert response.status_code == 200
+    assert mock_market_service.search_models.await_args.args[4] == settings.MODEL_LIST_FIELDS
+
+    # 필드 조합마다 캐시 키가 달라 업스트림을 다시 조회
+    client.get("/api/v1/models/?market=huggingface&fields=likes")
+    assert mock_market_service.search_models.await_args.args[4] == ['id', 'likes']
+
+    client.get("/api/v1/models/?market=huggingface&fields=all")
+    assert mock_market_service.search_models.await_args.args[4] is None
+    assert mock_market_service.search_models.await_count == 3
+
+    response = client.get("/api/v1/models/?market=huggingface&fields=siblings")
+    assert response.status_code == 400
+
+
+def make_export(pages, error=None):
+    async def export_models(query, sort, fields, tags, cursor):
+        for page in pages:
+            yield page
+        if error:
+            raise error
+    return export_models
+
+
+def test_api_models_export_streams_ndjson_with_cursors(mock_market_service):
+    mock_market_service.export_models = make_export([([{"id": "a"}, {"id": "b"}], "c1"), ([{"id": "c"}], None)])
+
+    response = client.get("/api/v1/models/export?market=huggingface&fields=id")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"id": "a"}, {"id": "b"}, {"cursor": "c1"}, {"id": "c"}, {"done": True, "count": 3}]
+
+
+def test_api_models_export_reports_mid_stream_error_with_resume_cursor(mock_market_service):
+    mock_market_service.export_models = make_export([([{"id": "a"}], "c1")], error=Exception("upstream reset"))
+
+    response = client.get("/api/v1/models/export?market=huggingface&cursor=c0")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1] == {"error": "upstream reset", "cursor": "c1"}
+
+
+def test_api_models_export_first_page_error_is_http_error(mock_market_service):
+    mock_market_service.export_models = make_export([], error=HTTPException(status_code=400, detail="Invalid export cursor"))
+
+    response = client.get("/api/v1/models/export?market=huggingface&cursor=!!!")
+    assert response.status_code == 400
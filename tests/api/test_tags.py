@@ -0,0 +1,78 @@
+import asyncio
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.caching import cache
+
+client = TestClient(app)
+
+TAGS = {
+    "language": [{"id": f"lang-{i}", "label": f"Language {i}", "type": "language"} for i in range(150)],
+    "library": [{"id": "pytorch", "label": "PyTorch", "type": "library"}],
+}
+
+
+@pytest.fixture
+def mock_market_service():
+    asyncio.run(cache.clear())
+    service = MagicMock()
+    service.get_tags = AsyncMock(return_value=TAGS)
+    with patch('app.services.tag_index.get_market_service', return_value=service):
+        yield service
+
+
+def test_api_tags_serves_etag_and_304(mock_market_service):
+    response = client.get("/api/v1/tags/?market=huggingface")
+    assert response.status_code == 200
+    assert response.json() == TAGS
+    etag = response.headers['etag']
+
+    response = client.get("/api/v1/tags/?market=huggingface", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert mock_market_service.get_tags.await_count == 1
+
+
+def test_api_tags_group_limited(mock_market_service):
+    response = client.get("/api/v1/tags/language?market=huggingface")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data['data']) == 100
+    assert data['remaining_count'] == 50
+
+    response = client.get("/api/v1/tags/language/all?market=huggingface")
+    assert len(response.json()['data']) == 150
+    assert mock_market_service.get_tags.await_count == 1
+
+
+def test_api_tags_group_not_found():
+    response = client.get("/api/v1/tags/unknown?market=huggingface")
+    assert response.status_code == 404
+
+
+def test_api_tags_group_index_is_shared_across_groups(mock_market_service):
+    library = client.get("/api/v1/tags/library?market=huggingface")
+    assert library.json() == {"data": TAGS["library"], "remaining_count": 0}
+
+    all_languages = client.get("/api/v1/tags/language/all?market=huggingface")
+    etag = all_languages.headers['etag']
+    assert client.get("/api/v1/tags/language/all?market=huggingface",
+                      headers={"If-None-Match": etag}).status_code == 304
+    assert mock_market_service.get_tags.await_count == 1
+
+
+def test_api_tags_group_search(mock_market_service):
+    response = client.get("/api/v1/tags/language/search?market=huggingface&q=Language 14&limit=5")
+    assert response.status_code == 200
+    ids = [item["id"] for item in response.json()["data"]]
+    assert ids[0] == "lang-14"
+    assert len(ids) == 5
+
+    etag = response.headers['etag']
+    assert client.get("/api/v1/tags/language/search?market=huggingface&q=language 14&limit=5",
+                      headers={"If-None-Match": etag}).status_code == 304
+    other = client.get("/api/v1/tags/language/search?market=huggingface&q=Language 14&limit=6")
+    assert other.headers['etag'] != etag
@@ -0,0 +1,4 @@
+import os
+
+# Settings()는 HF_API_TOKEN을 필수로 요구하므로 .env가 없는 환경에서도 import 가능하도록 기본값 지정
+os.environ.setdefault("HF_API_TOKEN", "test-token")
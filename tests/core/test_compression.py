@@ -0,0 +1,120 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+BODY = b'{"models": [' + b'{"id": "model"},' * 200 + b'{}]}'
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+
+@app.get("/json")
+async def json_body():
+    return Response(BODY, media_type="application/json")
+
+
+@app.get("/small")
+async def small_body():
+    return PlainTextResponse("ok")
+
+
+@app.get("/binary")
+async def binary_body():
+    return Response(BODY, media_type="application/octet-stream")
+
+
+@app.get("/ndjson")
+async def ndjson_body():
+    async def lines():
+        for i in range(50):
+            yield b'{"id": "model-%d"}\n' % i
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/precompressed")
+async def precompressed():
+    return Response(gzip.compress(BODY), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+
+@app.get("/cached")
+async def cached(request: Request):
+    return compression.precompressed_response(request, BODY, "v1")
+
+
+client = TestClient(app)
+
+
+def test_negotiate_encoding_prefers_configured_order_and_quality():
+    preferred = compression.available_encodings()[0]
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate, br, zstd") == preferred
+    assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+    assert negotiate_encoding("br;q=0, gzip;q=0") is None
+    assert negotiate_encoding("*") == preferred
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_json_is_compressed_with_negotiated_encoding(encoding):
+    if encoding not in compression.available_encodings():
+        pytest.skip(f"{encoding} support is not installed")
+    response = client.get("/json", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == BODY
+
+
+def test_no_accept_encoding_returns_identity():
+    response = client.get("/json", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY
+
+
+def test_small_and_binary_bodies_are_not_compressed():
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/binary", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_streaming_response_is_compressed_incrementally():
+    response = client.get("/ndjson", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.text.splitlines()) == 50
+
+
+def test_already_encoded_response_is_not_compressed_again():
+    response = client.get("/precompressed", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
+
+
+def test_compress_cached_reuses_compressed_body(monkeypatch):
+    calls = []
+    original = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda body, encoding: calls.append(encoding) or original(body, encoding))
+
+    first = compression.compress_cached("etag-1", BODY, "gzip")
+    second = compression.compress_cached("etag-1", BODY, "gzip")
+
+    assert first is second
+    assert calls == ["gzip"]
+
+
+def test_precompressed_response_tags_each_encoding_and_answers_304():
+    plain = client.get("/cached", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    assert plain.headers["etag"] == '"v1"'
+    assert compressed.headers["etag"] == '"v1-gzip"'
+    assert compressed.content == BODY
+
+    not_modified = client.get("/cached", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    # 다른 인코딩의 ETag로는 304가 아님
+    assert client.get("/cached", headers={"Accept-Encoding": "identity",
+                                          "If-None-Match": '"v1-gzip"'}).status_code == 200
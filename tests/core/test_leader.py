@@ -0,0 +1,27 @@
+import asyncio
+
+from app.core.leader import LeaderLock
+
+
+def test_only_one_holder_and_waiter_takes_over(tmp_path):
+    path = str(tmp_path / "leader.lock")
+    first = LeaderLock(path, retry_interval=0.01)
+    second = LeaderLock(path, retry_interval=0.01)
+    started = []
+
+    async def scenario():
+        first.start(lambda: started.append("first"))
+        second.start(lambda: started.append("second"))
+        await asyncio.sleep(0.05)
+        assert started == ["first"] and not second.held
+        # 리더가 종료되면 대기 중인 워커가 이어받음
+        await first.stop()
+        for _ in range(100):
+            if second.held:
+                break
+            await asyncio.sleep(0.01)
+        await second.stop()
+
+    asyncio.run(scenario())
+    assert started == ["first", "second"]
+    assert not first.held and not second.held
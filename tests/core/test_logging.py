@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from unittest.mock import patch
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.logging import LoggingMiddleware, RequestInfoFilter, log_external_api_call, logger, request_context
+
+
+def make_record():
+    return logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+
+
+def test_filter_uses_per_request_context():
+    request_filter = RequestInfoFilter()
+
+    async def handle(path):
+        request_context.set({"request_path": path, "request_method": "GET"})
+        await asyncio.sleep(0.01)
+        record = make_record()
+        request_filter.filter(record)
+        return record.request_path
+
+    async def scenario():
+        return await asyncio.gather(*[handle(f"/path/{i}") for i in range(5)])
+
+    assert asyncio.run(scenario()) == [f"/path/{i}" for i in range(5)]
+
+    record = make_record()
+    request_filter.filter(record)
+    assert record.request_path == "N/A"
+
+
+def test_middleware_sets_context_and_captures_body_prefix():
+    app = FastAPI()
+    app.add_middleware(LoggingMiddleware)
+    seen = {}
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        seen.update(request_context.get())
+        return {"size": len(body)}
+
+    with patch.object(logger, "isEnabledFor", return_value=True):
+        response = TestClient(app).post("/echo?q=1", content=b"x" * 1500)
+
+    assert response.json() == {"size": 1500}
+    assert seen["request_path"] == "/echo"
+    assert seen["request_method"] == "POST"
+    assert seen["request_params"] == "{'q': '1'}"
+    assert seen["request_body"] == "x" * 1000 + "..."
+    assert request_context.get() == {}
+
+
+def test_external_api_call_is_sampled():
+    with patch.object(logger, "info") as info, \
+            patch("app.core.logging.settings") as settings, \
+            patch.object(logger, "isEnabledFor", return_value=True):
+        settings.LOG_SAMPLE_RATES = {"external_api_call": 0.0}
+        log_external_api_call("https://example.com", "GET")
+        info.assert_not_called()
+
+        settings.LOG_SAMPLE_RATES = {}
+        log_external_api_call("https://example.com", "GET", params={"a": 1})
+        info.assert_called_once()
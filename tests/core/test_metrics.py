@@ -0,0 +1,79 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsRegistry
+from app.main import app
+from app.services.caching import cache
+from app.services.resilience import UpstreamGuard, UpstreamPolicy, UpstreamStatusError
+
+client = TestClient(app)
+
+
+def test_histogram_and_counter_render():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    counter = registry.counter("test_total", "Test count", ("kind",))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+    counter.inc('say "hi"', amount=2)
+
+    text = registry.render()
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'test_seconds_count{route="/a"} 3' in text
+    assert 'test_total{kind="say \\"hi\\""} 2' in text
+
+
+def test_worker_label_distinguishes_processes():
+    registry = MetricsRegistry()
+    registry.histogram("test_seconds", "Test latency", ("route",), buckets=(0.1,)).observe(0.05, "/a")
+    registry.gauge("test_in_flight", "Test gauge").set(value=3)
+
+    text = registry.render(worker_label=True)
+    worker = f'worker="{os.getpid()}"'
+    assert f'test_seconds_bucket{{route="/a",{worker},le="0.1"}} 1' in text
+    assert f'test_seconds_count{{route="/a",{worker}}} 1' in text
+    assert f'test_in_flight{{{worker}}} 3' in text
+
+
+def test_metrics_endpoint_reports_route_templates_and_cache_results():
+    asyncio.run(cache.clear())
+    service = MagicMock()
+    service.get_model_detail = AsyncMock(return_value={"id": "org/metrics-model"})
+    with patch("app.api.models.get_market_service", return_value=service):
+        for _ in range(2):
+            assert client.get("/api/v1/models/org/metrics-model?market=huggingface").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert ('hub_http_request_duration_seconds_count{route="/api/v1/models/{model_id:path}",method="GET",'
+            'status="200",market="huggingface"}') in text
+    assert "org/metrics-model" not in text
+    assert 'hub_cache_requests_total{endpoint="detail",result="miss"}' in text
+    assert 'hub_cache_requests_total{endpoint="detail",result="hit"}' in text
+    assert "hub_http_requests_in_flight" in text
+
+
+def test_upstream_attempts_and_errors_are_recorded():
+    guard = UpstreamGuard("metrics-test", UpstreamPolicy(1.0, 1.0, 1, 0.0, 0.0, 4, 5, 30.0))
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise UpstreamStatusError(503)
+        return "ok"
+
+    asyncio.run(guard.call(flaky, "api/models"))
+    text = client.get("/metrics").text
+    assert ('hub_upstream_request_duration_seconds_count{market="metrics-test",endpoint="api/models",'
+            'outcome="error"} 1') in text
+    assert 'hub_upstream_errors_total{market="metrics-test",endpoint="api/models",kind="503"} 1' in text
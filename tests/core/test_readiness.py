@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.readiness import Readiness, readiness
+from app.main import app
+
+
+def test_ready_after_warm_up_and_not_ready_while_stopping():
+    async def scenario():
+        state = Readiness()
+        gate = asyncio.Event()
+
+        async def warm_up():
+            await gate.wait()
+
+        state.start(warm_up)
+        await asyncio.sleep(0)
+        assert not state.ready and state.status()["status"] == "starting"
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        assert state.ready and state.warmup_seconds() is not None
+
+        await state.stop()
+        assert not state.ready and state.status()["status"] == "stopping"
+
+    asyncio.run(scenario())
+
+
+def test_failed_warm_up_still_becomes_ready():
+    async def scenario():
+        state = Readiness()
+
+        async def warm_up():
+            raise RuntimeError("upstream down")
+
+        state.start(warm_up)
+        await asyncio.sleep(0.01)
+        return state.ready
+
+    assert asyncio.run(scenario())
+
+
+def test_ready_endpoint_reports_503_until_warm_up_finishes():
+    client = TestClient(app)
+    readiness.started_at, readiness.ready_at = time.monotonic(), None
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    readiness.ready_at = time.monotonic()
+    try:
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+    finally:
+        readiness.started_at = readiness.ready_at = None
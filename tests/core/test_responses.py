@@ -0,0 +1,24 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core import responses
+from app.core.responses import FastJSONResponse
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson", "msgspec"])
+def test_backends_produce_equivalent_json(backend):
+    if backend != "json":
+        # 미설치 백엔드는 json으로 대체되므로 해당 백엔드를 검증한 것으로 보고하지 않음
+        pytest.importorskip(backend)
+    dumps = responses._load_dumps(backend)
+    data = {"id": "org/모델", "lastModified": datetime(2024, 1, 1, tzinfo=timezone.utc), "tags": ["nlp"], "n": 1.5}
+    assert json.loads(dumps(data)) == {"id": "org/모델", "lastModified": "2024-01-01T00:00:00+00:00",
+                                       "tags": ["nlp"], "n": 1.5}
+
+
+def test_fast_json_response_is_the_default_response_class():
+    from app.main import app
+    assert app.router.default_response_class is FastJSONResponse
+    assert FastJSONResponse({"a": [1, 2]}).body == b'{"a":[1,2]}'
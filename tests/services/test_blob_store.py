@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aiohttp import web
+
+from app.services import http_client
+from app.services.blob_store import BlobStore
+from app.services.caching import cache
+from app.services.markets.huggingface.huggingface_models import HuggingFaceService
+
+MODULE = "app.services.markets.huggingface.huggingface_models"
+
+FILES = {"a.bin": b"a" * 400, "b.bin": b"b" * 400, "c.bin": b"c" * 400}
+
+
+def git_blob_id(content: bytes) -> str:
+    return hashlib.sha1(f"blob {len(content)}\0".encode() + content).hexdigest()
+
+
+async def with_upstream(scenario):
+    requested = []
+
+    async def serve(request):
+        requested.append(request.match_info["name"])
+        return web.Response(body=FILES[request.match_info["name"]])
+
+    app = web.Application()
+    app.router.add_get("/{name}", serve)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    try:
+        return await scenario(base_url), requested
+    finally:
+        await http_client.close_http_session()
+        await runner.cleanup()
+
+
+def test_fetch_lookup_and_lru_eviction(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1000)
+    store.load()
+    ids = {name: git_blob_id(content) for name, content in FILES.items()}
+
+    async def scenario(base_url):
+        await store.fetch(ids["a.bin"], f"{base_url}/a.bin", 400)
+        await store.fetch(ids["b.bin"], f"{base_url}/b.bin", 400)
+        assert await store.lookup(ids["a.bin"]) is not None
+        # 한도 초과: 가장 오래 사용하지 않은 b가 제거됨
+        return await store.fetch(ids["c.bin"], f"{base_url}/c.bin", 400)
+
+    path, requested = asyncio.run(with_upstream(scenario))
+    assert open(path, "rb").read() == FILES["c.bin"]
+    assert asyncio.run(store.lookup(ids["b.bin"])) is None
+    assert asyncio.run(store.lookup(ids["a.bin"])) is not None
+    usage = store.usage()
+    assert usage["used_bytes"] == 800
+    assert usage["evictions"] == 1
+    assert requested == ["a.bin", "b.bin", "c.bin"]
+
+    # 재시작 시 디스크에서 인덱스 복원
+    reloaded = BlobStore(str(tmp_path), max_bytes=1000)
+    reloaded.load()
+    assert reloaded.usage()["blobs"] == 2
+
+
+def test_fetch_rejects_checksum_mismatch_and_oversized_blobs(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1000)
+    store.load()
+
+    async def scenario(base_url):
+        with pytest.raises(ValueError):
+            await store.fetch(git_blob_id(b"other"), f"{base_url}/a.bin", 400)
+        return await store.fetch(git_blob_id(FILES["a.bin"]), f"{base_url}/a.bin", 5000)
+
+    path, _ = asyncio.run(with_upstream(scenario))
+    assert path is None
+    assert store.usage()["blobs"] == 0
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_invalid_blob_id_is_rejected(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1000)
+    with pytest.raises(ValueError):
+        store.path_for("../../etc/passwd")
+
+
+def test_stores_sharing_a_directory_see_each_others_blobs_and_quota(tmp_path):
+    worker_a = BlobStore(str(tmp_path), max_bytes=1000)
+    worker_b = BlobStore(str(tmp_path), max_bytes=1000)
+    worker_a.load()
+    worker_b.load()
+    ids = {name: git_blob_id(content) for name, content in FILES.items()}
+
+    async def scenario(base_url):
+        await worker_a.fetch(ids["a.bin"], f"{base_url}/a.bin", 400)
+        await worker_b.fetch(ids["b.bin"], f"{base_url}/b.bin", 400)
+        assert await worker_b.lookup(ids["a.bin"]) is not None
+        # worker_a의 인덱스에는 b가 없지만 저장 전 디렉터리를 다시 스캔해 전체 한도를 지킴
+        await worker_a.fetch(ids["c.bin"], f"{base_url}/c.bin", 400)
+
+    asyncio.run(with_upstream(scenario))
+    assert sorted(os.listdir(worker_a.blobs_dir)) == sorted([ids["a.bin"], ids["c.bin"]])
+
+
+def test_load_only_removes_stale_temp_files(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1000, tmp_max_age=60)
+    store.load()
+    stale = os.path.join(store.tmp_dir, "stale.tmp")
+    active = os.path.join(store.tmp_dir, "active.tmp")
+    for path in (stale, active):
+        open(path, "wb").close()
+    os.utime(stale, (time.time() - 120, time.time() - 120))
+
+    BlobStore(str(tmp_path), max_bytes=1000, tmp_max_age=60).load()
+    assert os.listdir(store.tmp_dir) == ["active.tmp"]
+
+
+def test_cancelled_fetch_removes_temp_file(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1000)
+    store.load()
+
+    async def scenario(base_url):
+        task = asyncio.ensure_future(store.fetch(git_blob_id(FILES["a.bin"]), f"{base_url}/slow", 400))
+        for _ in range(100):
+            if os.listdir(store.tmp_dir):
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.05)
+
+    async def with_slow_upstream():
+        async def slow(request):
+            await asyncio.sleep(0.5)
+            return web.Response(body=b"")
+
+        app = web.Application()
+        app.router.add_get("/slow", slow)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        try:
+            await scenario(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+        finally:
+            await http_client.close_http_session()
+            await runner.cleanup()
+
+    asyncio.run(with_slow_upstream())
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_download_of_stored_blob_skips_upstream(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1000)
+    store.load()
+    blob_id = git_blob_id(FILES["a.bin"])
+    hf_api = MagicMock()
+    hf_api.get_paths_info.return_value = [MagicMock(blob_id=blob_id, size=400, lfs=None)]
+
+    async def scenario(base_url):
+        await store.fetch(blob_id, f"{base_url}/a.bin", 400)
+        service = HuggingFaceService()
+        first = await service.download_model_file("org/model", "a.bin")
+        # 매핑이 캐시된 뒤에는 업스트림 장애와 무관하게 저장된 blob으로 응답
+        hf_api.get_paths_info.side_effect = ConnectionError("hub is down")
+        second = await service.download_model_file("org/model", "a.bin")
+        return first, second
+
+    asyncio.run(cache.clear())
+    with patch(f"{MODULE}.get_hf_api", return_value=hf_api), patch(f"{MODULE}.get_blob_store", return_value=store):
+        (first, second), _ = asyncio.run(with_upstream(scenario))
+
+    assert first.path == second.path == store.path_for(blob_id)
+    assert hf_api.get_paths_info.call_count == 1
@@ -0,0 +1,105 @@
+import asyncio
+import fnmatch
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.services.cache_backends import MemoryLRUTier, RedisTier
+from app.services.caching import CacheEntry, TieredCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, px=None):
+        self.store[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.store):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def aclose(self):
+        pass
+
+
+def test_memory_tier_evicts_least_recently_used_by_count():
+    async def scenario():
+        tier = MemoryLRUTier(max_entries=2, max_bytes=1000)
+        await tier.set("a", 1, 60, 1)
+        await tier.set("b", 2, 60, 1)
+        await tier.get("a")
+        await tier.set("c", 3, 60, 1)
+        return tier, await tier.get("a"), await tier.get("b")
+
+    tier, a, b = asyncio.run(scenario())
+    assert (a, b) == (1, None)
+    assert tier.snapshot()["evictions"] == 1
+
+
+def test_memory_tier_respects_byte_budget():
+    async def scenario():
+        tier = MemoryLRUTier(max_entries=100, max_bytes=10)
+        await tier.set("a", "x", 60, 6)
+        await tier.set("b", "y", 60, 6)
+        await tier.set("huge", "z", 60, 11)
+        return tier, await tier.get("a"), await tier.get("b"), await tier.get("huge")
+
+    tier, a, b, huge = asyncio.run(scenario())
+    assert (a, b, huge) == (None, "y", None)
+    assert tier.snapshot()["bytes"] == 6
+
+
+def test_shared_tier_is_promoted_across_workers():
+    redis = FakeRedis()
+    worker_a = TieredCache(MemoryLRUTier(10, 10_000), RedisTier(redis, "t:"))
+    worker_b = TieredCache(MemoryLRUTier(10, 10_000), RedisTier(redis, "t:"))
+
+    async def scenario():
+        await worker_a.set("tags", CacheEntry.from_value({"region": []}, 60), 120)
+        entry = await worker_b.get("tags")
+        # 두 번째 조회는 worker_b의 메모리 tier에서 응답
+        await worker_b.get("tags")
+        return entry
+
+    entry = asyncio.run(scenario())
+    assert entry.value == {"region": []}
+    assert entry.is_fresh()
+    stats = worker_b.stats()
+    assert stats["redis"]["hits"] == 1
+    assert stats["memory"]["hits"] == 1
+
+
+def test_datetime_values_are_cached_in_memory_and_shared_tiers():
+    # model_info.lastModified 등 datetime 값은 공유 tier에 ISO 형식으로 저장
+    redis = FakeRedis()
+    memory_only = TieredCache(MemoryLRUTier(10, 10_000))
+    worker_a = TieredCache(MemoryLRUTier(10, 10_000), RedisTier(redis, "t:"))
+    worker_b = TieredCache(MemoryLRUTier(10, 10_000), RedisTier(redis, "t:"))
+    modified = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    async def scenario():
+        await memory_only.set("detail", CacheEntry.from_value({"lastModified": modified}, 60), 120)
+        await worker_a.set("detail", CacheEntry.from_value({"lastModified": modified}, 60), 120)
+        return await memory_only.get("detail"), await worker_b.get("detail")
+
+    local, shared = asyncio.run(scenario())
+    assert local.value == {"lastModified": modified}
+    assert shared.value == {"lastModified": "2024-01-01T00:00:00+00:00"}
+
+
+def test_memory_tier_charges_decoded_value_estimate():
+    cache = TieredCache(MemoryLRUTier(10, 10_000))
+    entry = CacheEntry.from_value({"models": ["x" * 100]}, 60)
+
+    asyncio.run(cache.set("search", entry, 60))
+
+    # 본문뿐 아니라 함께 보관하는 역직렬화 값의 추정치까지 바이트 예산에 포함
+    assert cache.stats()["memory"]["bytes"] == int(len(entry.body) * (1 + settings.CACHE_VALUE_SIZE_RATIO))
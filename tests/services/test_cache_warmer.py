@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.cache_warmer import AccessStats, CacheWarmer
+from app.services.caching import cache, make_cache_key
+from app.services.resilience import CircuitBreaker, get_upstream_guard
+
+INTERVALS = {"tags": 60, "lists": 60, "details": 60}
+
+
+def make_service():
+    service = MagicMock()
+    service.get_tags = AsyncMock(return_value={"library": [{"id": "pytorch"}]})
+    service.get_trending_models = AsyncMock(return_value={"models": [], "total": 0})
+    service.search_models = AsyncMock(return_value={"models": [], "total": 0})
+    service.get_model_detail = AsyncMock(return_value={"id": "org/model"})
+    return service
+
+
+def test_access_stats_top_and_bounded():
+    stats = AccessStats(max_entries=4)
+    for model_id, hits in [("a", 5), ("b", 3), ("c", 1)]:
+        for _ in range(hits):
+            stats.record("huggingface", model_id)
+    assert stats.top("huggingface", 2) == [("a", True), ("b", True)]
+
+    for model_id in ["d", "e"]:
+        stats.record("huggingface", model_id)
+    assert stats.top("huggingface", 10)[:2] == [("a", True), ("b", True)]
+    assert len(stats.top("huggingface", 10)) <= 4
+
+
+def test_warm_lists_populates_default_list_keys_once():
+    service = make_service()
+    warmer = CacheWarmer(["huggingface"], 2, INTERVALS, 0.1)
+
+    async def scenario():
+        await cache.clear()
+        with patch("app.services.cache_warmer.get_market_service", return_value=service), \
+                patch("app.services.cache_warmer.settings") as settings:
+            settings.MODEL_LIST_FIELDS = ["id", "downloads"]
+            settings.WARMER_PAGES = 2
+            settings.WARMER_PAGE_LIMIT = 30
+            settings.WARMER_SORTS = ["downloads"]
+            await warmer.warm_lists("huggingface")
+            # 아직 충분히 신선한 항목은 다시 호출하지 않음
+            warmer.intervals = {"lists": 0}
+            warmer.jitter = 0
+            await warmer.warm_lists("huggingface")
+        key = make_cache_key("huggingface", "search", {"query": "", "sort": "downloads", "page": 1,
+                                                       "limit": 30, "fields": "id,downloads"})
+        return await cache.get(key)
+
+    entry = asyncio.run(scenario())
+    assert entry is not None
+    assert service.get_trending_models.await_count == 2
+    assert service.search_models.await_count == 2
+    assert warmer.stats["warmed"] == 4
+    assert warmer.stats["skipped"] == 4
+
+
+def test_warm_details_uses_access_stats():
+    service = make_service()
+    stats = AccessStats(max_entries=100)
+    stats.record("huggingface", "org/model", False)
+    warmer = CacheWarmer(["huggingface"], 2, INTERVALS, 0.1)
+
+    async def scenario():
+        await cache.clear()
+        with patch("app.services.cache_warmer.get_market_service", return_value=service), \
+                patch("app.services.cache_warmer.access_stats", stats):
+            await warmer.warm_details("huggingface")
+
+    asyncio.run(scenario())
+    service.get_model_detail.assert_awaited_once_with("org/model", include_html=False)
+
+
+def test_warming_defers_while_breaker_is_open():
+    service = make_service()
+    warmer = CacheWarmer(["huggingface"], 2, INTERVALS, 0.1)
+    guard = get_upstream_guard("huggingface")
+
+    async def scenario():
+        await cache.clear()
+        with patch("app.services.tag_index.get_market_service", return_value=service), \
+                patch.object(guard.breaker, "state", CircuitBreaker.OPEN):
+            await warmer.warm_tags("huggingface")
+
+    asyncio.run(scenario())
+    service.get_tags.assert_not_awaited()
+    assert warmer.stats["deferred"] == 1
+
+
+def test_start_and_stop_jobs():
+    warmer = CacheWarmer(["huggingface"], 1, INTERVALS, 0.1)
+
+    async def scenario():
+        warmer.start()
+        assert len(warmer._tasks) == 3
+        await warmer.stop()
+        assert warmer._tasks == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,44 @@
+import asyncio
+from unittest.mock import patch
+
+from app.services import caching
+
+
+def test_make_cache_key_is_normalized():
+    a = caching.make_cache_key("huggingface", "search", {"sort": "downloads", "query": " bert ", "page": 1})
+    b = caching.make_cache_key("huggingface", "search", {"page": 1, "query": "bert", "sort": "downloads", "x": ""})
+    assert a == b == "huggingface:search:page=1&query=bert&sort=downloads"
+
+
+def test_make_cache_key_encodes_values():
+    packed = caching.make_cache_key("huggingface", "search", {"query": "a&sort=likes"})
+    split = caching.make_cache_key("huggingface", "search", {"query": "a", "sort": "likes"})
+    assert packed != split
+    assert caching.make_cache_key("huggingface", "search", {"query": "llama 2"}) == "huggingface:search:query=llama+2"
+
+
+def test_cached_fetch_serves_stale_and_refreshes_once():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"n": len(calls)}
+
+    async def scenario():
+        await caching.cache.clear()
+        with patch.dict(caching.settings.CACHE_TTLS, {"search": 0}):
+            first = await caching.cached_fetch("hf", "search", {"q": "a"}, fetch)
+            # TTL 0: 이후 호출은 stale 값을 즉시 반환하고 백그라운드 갱신은 한 번만 실행
+            stale = await asyncio.gather(*[caching.cached_fetch("hf", "search", {"q": "a"}, fetch) for _ in range(5)])
+            await asyncio.sleep(0.05)
+            upstream_calls = len(calls)
+            refreshed = await caching.cached_fetch("hf", "search", {"q": "a"}, fetch)
+            await asyncio.sleep(0.05)
+        return first, stale, upstream_calls, refreshed
+
+    first, stale, upstream_calls, refreshed = asyncio.run(scenario())
+    assert first == {"n": 1}
+    assert all(item == {"n": 1} for item in stale)
+    assert upstream_calls == 2
+    assert refreshed == {"n": 2}
@@ -0,0 +1,125 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.catalog import CatalogSync, ModelCatalog, get_catalog_stats
+from app.services.markets.huggingface.huggingface_models import HuggingFaceService
+
+FIELDS = ["id", "downloads", "likes", "lastModified", "pipeline_tag", "library_name", "tags"]
+
+MODELS = [
+    {"id": "meta-llama/Llama-2-7b", "downloads": 500, "likes": 40, "lastModified": "2024-03-01T00:00:00.000Z",
+     "pipeline_tag": "text-generation", "library_name": "transformers", "tags": ["pytorch", "en"]},
+    {"id": "org/llama-tiny", "downloads": 50, "likes": 90, "lastModified": "2024-05-01T00:00:00.000Z",
+     "pipeline_tag": "text-generation", "library_name": "gguf", "tags": ["en"]},
+    {"id": "google/bert-base", "downloads": 900, "likes": 10, "lastModified": "2023-01-01T00:00:00.000Z",
+     "pipeline_tag": "fill-mask", "library_name": "transformers", "tags": ["pytorch"]},
+]
+
+
+def make_catalog(tmp_path):
+    catalog = ModelCatalog(str(tmp_path / "catalog.db"), FIELDS)
+    catalog.initialize()
+    return catalog
+
+
+def test_search_filter_sort_and_total(tmp_path):
+    catalog = make_catalog(tmp_path)
+    catalog.upsert(MODELS)
+
+    result = catalog.search("llama", "downloads", 1, 1, fields=["id"])
+    assert result == {"models": [{"id": "meta-llama/Llama-2-7b"}], "total": 2}
+    assert catalog.search("llama", "likes", 1, 10)["models"][0]["id"] == "org/llama-tiny"
+    assert catalog.search("", "downloads", 2, 2)["models"][0]["id"] == "org/llama-tiny"
+
+    tagged = catalog.search("", "downloads", 1, 10, tags=["transformers", "pytorch"])
+    assert [model["id"] for model in tagged["models"]] == ["google/bert-base", "meta-llama/Llama-2-7b"]
+    assert tagged["total"] == 2
+
+
+def test_upsert_replaces_existing_rows(tmp_path):
+    catalog = make_catalog(tmp_path)
+    catalog.upsert(MODELS)
+    catalog.upsert([{**MODELS[2], "downloads": 1, "tags": ["jax"]}])
+
+    assert catalog.stats()["models"] == 3
+    assert catalog.search("bert", "downloads", 1, 10)["models"][0]["downloads"] == 1
+    assert catalog.search("", "downloads", 1, 10, tags=["pytorch"])["total"] == 1
+
+
+def test_can_serve_requires_sync_and_known_fields(tmp_path):
+    catalog = make_catalog(tmp_path)
+    assert not catalog.can_serve("downloads", ["id"])
+    catalog.ready = True
+    assert catalog.can_serve("downloads", ["id", "likes"])
+    assert not catalog.can_serve("downloads", None)
+    assert not catalog.can_serve("trending", ["id"])
+    # 동기화가 상위 페이지를 다 담지 못하는 정렬
+    assert not catalog.can_serve("likes", ["id"])
+    assert not catalog.can_serve("downloads", ["id", "safetensors"])
+
+
+def test_sync_follows_cursor_and_stops_at_watermark(tmp_path):
+    catalog = make_catalog(tmp_path)
+    catalog.set_meta("last_modified_watermark", "2024-04-01T00:00:00.000Z")
+    service = MagicMock()
+
+    async def list_models_page(params, url=None):
+        sort = dict(params)["sort"]
+        if sort == "downloads":
+            return (MODELS[:2], "https://next") if url is None else (MODELS[2:], None)
+        return [MODELS[1], MODELS[0]], "https://older"
+
+    service.list_models_page = AsyncMock(side_effect=list_models_page)
+    with patch("app.services.catalog.get_market_service", return_value=service), \
+            patch("app.services.catalog.settings") as settings:
+        settings.CATALOG_SYNC_PAGE_SIZE = 2
+        settings.CATALOG_SYNC_POPULAR_MODELS = 10
+        settings.CATALOG_SYNC_RECENT_MAX = 10
+        asyncio.run(CatalogSync(catalog, "huggingface").run_once())
+
+    # 인기순 2페이지 + 최근 수정순 1페이지 (워터마크보다 오래된 모델이 나와 중단)
+    assert service.list_models_page.await_count == 3
+    assert catalog.ready
+    assert catalog.get_meta("last_modified_watermark") == "2024-05-01T00:00:00.000Z"
+    assert catalog.stats()["models"] == 3
+
+
+def test_search_models_served_from_catalog(tmp_path):
+    catalog = make_catalog(tmp_path)
+    catalog.upsert(MODELS)
+    catalog.ready = True
+    session = MagicMock()
+    with patch("app.services.markets.huggingface.huggingface_models.get_catalog", return_value=catalog), \
+            patch("app.services.markets.huggingface.huggingface_models.get_http_session", return_value=session):
+        data = asyncio.run(HuggingFaceService().search_models("llama", "downloads", 1, 10, ["id"], ["gguf"]))
+
+    assert data == {"models": [{"id": "org/llama-tiny"}], "total": 1}
+    session.get.assert_not_called()
+
+
+def test_search_models_falls_back_to_upstream_only_without_catalog_hits(tmp_path):
+    catalog = make_catalog(tmp_path)
+    catalog.upsert(MODELS)
+    catalog.ready = True
+    upstream = AsyncMock(return_value=[{"id": "other/huge"}])
+    with patch("app.services.markets.huggingface.huggingface_models.get_catalog", return_value=catalog), \
+            patch.object(HuggingFaceService, "_get_json", upstream):
+        # 카탈로그에 없는 모델
+        missing = asyncio.run(HuggingFaceService().search_models("huge", "downloads", 1, 10, ["id"]))
+        # 마지막(부분) 페이지와 범위를 벗어난 페이지도 카탈로그의 total을 유지
+        last_page = asyncio.run(HuggingFaceService().search_models("llama", "downloads", 2, 1, ["id"]))
+        past_end = asyncio.run(HuggingFaceService().search_models("llama", "downloads", 5, 1, ["id"]))
+
+    assert missing == {"models": [{"id": "other/huge"}], "total": 1}
+    assert last_page == {"models": [{"id": "org/llama-tiny"}], "total": 2}
+    assert past_end == {"models": [], "total": 2}
+    assert upstream.await_count == 1
+
+
+def test_get_catalog_stats_initializes_lazily(tmp_path):
+    catalog = ModelCatalog(str(tmp_path / "catalog.db"), FIELDS)
+    with patch("app.services.catalog.get_catalog", return_value=catalog):
+        stats = get_catalog_stats()
+
+    assert catalog.initialized
+    assert stats["models"] == 0
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.logging import request_context
+from app.services import executor
+
+
+def test_run_blocking_returns_result_and_records_wait():
+    before = executor.stats.completed
+    result = asyncio.run(executor.run_blocking(lambda a, b=0: a + b, 1, b=2))
+    assert result == 3
+    assert executor.stats.completed == before + 1
+    assert executor.get_executor_stats()["wait_max_ms"] >= 0
+
+
+def test_run_blocking_propagates_request_context():
+    async def scenario():
+        request_context.set({"method": "GET", "path": "/api/models"})
+        return await executor.run_blocking(request_context.get)
+
+    assert asyncio.run(scenario()) == {"method": "GET", "path": "/api/models"}
+
+
+def test_run_blocking_rejects_when_queue_is_full():
+    release = threading.Event()
+
+    async def scenario():
+        with patch.object(executor.settings, "EXECUTOR_MAX_WORKERS", 1), \
+                patch.object(executor.settings, "EXECUTOR_MAX_QUEUE", 1):
+            blocked = [asyncio.ensure_future(executor.run_blocking(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            with pytest.raises(HTTPException) as exc_info:
+                await executor.run_blocking(lambda: None)
+            release.set()
+            await asyncio.gather(*blocked)
+        return exc_info.value
+
+    rejected_before = executor.stats.rejected
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert executor.stats.rejected == rejected_before + 1
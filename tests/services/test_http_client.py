@@ -0,0 +1,121 @@
+import asyncio
+import base64
+from unittest.mock import patch, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services import http_client
+from app.services.markets.huggingface.huggingface_models import (HUGGINGFACE_API_MODELS_URL, HuggingFaceService,
+                                                                 decode_cursor, encode_cursor)
+
+
+class FakeResponse:
+    def __init__(self, payload, status=200, headers=None):
+        self.payload = payload
+        self.status = status
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self, content_type=None):
+        return self.payload
+
+
+def test_session_lifecycle():
+    async def scenario():
+        session = await http_client.open_http_session()
+        assert http_client.get_http_session() is session
+        assert await http_client.open_http_session() is session
+        await http_client.close_http_session()
+        assert session.closed
+
+    asyncio.run(scenario())
+
+
+def test_trending_uses_shared_session():
+    session = MagicMock()
+    session.get.return_value = FakeResponse({
+        "models": [{"id": "a", "repoType": "model"}, {"id": "b", "repoType": "space"}],
+        "numTotalItems": 2,
+    })
+    with patch("app.services.markets.huggingface.huggingface_models.get_http_session", return_value=session):
+        data = asyncio.run(HuggingFaceService().get_trending_models(1))
+
+    assert data == {"models": [{"id": "a", "repoType": "model"}], "total": 2}
+    _, kwargs = session.get.call_args
+    assert kwargs["params"] == {"sort": "trending"}
+
+
+def test_search_with_fields_requests_expand_and_projects():
+    session = MagicMock()
+    session.get.return_value = FakeResponse([
+        {"_id": "x", "id": "org/a", "downloads": 5, "likes": 1, "siblings": []},
+    ])
+    with patch("app.services.markets.huggingface.huggingface_models.get_http_session", return_value=session):
+        data = asyncio.run(HuggingFaceService().search_models("a", "downloads", 2, 10, ["id", "downloads"]))
+
+    assert data == {"models": [{"id": "org/a", "downloads": 5}], "total": 1}
+    params = session.get.call_args.kwargs["params"]
+    assert ("expand[]", "downloads") in params
+    assert ("offset", 10) in params
+    assert "full" not in dict(params)
+
+
+def test_export_follows_link_cursor_and_resumes_from_token():
+    next_url = f"{HUGGINGFACE_API_MODELS_URL}?sort=downloads&limit=2&cursor=abc%3D%3D"
+    pages = [([{"id": "org/a", "downloads": 5, "likes": 1}], next_url), ([{"id": "org/b", "downloads": 3}], None)]
+
+    async def collect(service, cursor=None):
+        return [page async for page in service.export_models("", "downloads", ["id", "downloads"], None, cursor)]
+
+    service = HuggingFaceService()
+    with patch.object(service, "list_models_page", side_effect=pages) as list_page:
+        exported = asyncio.run(collect(service))
+
+    token = encode_cursor(next_url)
+    assert exported == [([{"id": "org/a", "downloads": 5}], token), ([{"id": "org/b", "downloads": 3}], None)]
+    first_params = list_page.call_args_list[0].args[0]
+    assert ("expand[]", "downloads") in first_params and "offset" not in dict(first_params)
+    assert list_page.call_args_list[1].args == (None, next_url)
+
+    with patch.object(service, "list_models_page", side_effect=pages[1:]) as list_page:
+        exported = asyncio.run(collect(service, token))
+    assert exported == [([{"id": "org/b", "downloads": 3}], None)]
+    resumed_params = list_page.call_args.args[0]
+    assert ("cursor", "abc==") in resumed_params
+    assert ("expand[]", "downloads") in resumed_params
+
+
+def test_export_cursor_only_carries_the_upstream_cursor():
+    # 다른 파라미터를 넣어 만든 토큰이어도 페이지 크기/검색 조건은 요청 파라미터로 고정
+    token = base64.urlsafe_b64encode(b"abc&limit=100000").decode("ascii")
+    service = HuggingFaceService()
+
+    async def first_page():
+        return await service.export_models("llama", "downloads", ["id"], None, token).__anext__()
+
+    with patch.object(service, "list_models_page", return_value=([], None)) as list_page:
+        asyncio.run(first_page())
+
+    params = list_page.call_args.args[0]
+    assert ("cursor", "abc&limit=100000") in params
+    assert [value for name, value in params if name == "limit"] == [settings.EXPORT_PAGE_SIZE]
+    assert ("search", "llama") in params
+    with pytest.raises(ValueError):
+        encode_cursor(f"{HUGGINGFACE_API_MODELS_URL}?sort=downloads&offset=100")
+
+
+@pytest.mark.parametrize("token", ["%%", "", "a+b/"])
+def test_export_rejects_malformed_cursor(token):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(token)
+    assert exc_info.value.status_code == 400
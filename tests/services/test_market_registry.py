@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.markets.common import MarketRegistry
+
+EVENTS = []
+
+
+class FakeService:
+    def __init__(self):
+        EVENTS.append("init")
+
+    async def warm_up(self):
+        EVENTS.append("warm_up")
+
+    def close(self):
+        EVENTS.append("close")
+
+
+class BrokenService:
+    async def warm_up(self):
+        raise RuntimeError("upstream down")
+
+
+def test_registry_returns_singletons_and_runs_hooks():
+    EVENTS.clear()
+    registry = MarketRegistry({"fake": f"{__name__}.FakeService", "broken": f"{__name__}.BrokenService"})
+
+    asyncio.run(registry.startup())
+    assert registry.get("fake") is registry.get("fake")
+    asyncio.run(registry.shutdown())
+
+    assert EVENTS == ["init", "warm_up", "close"]
+
+
+def test_unknown_market_is_rejected_without_import():
+    registry = MarketRegistry({})
+    with pytest.raises(HTTPException) as exc_info:
+        registry.get("unknown")
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,59 @@
+import asyncio
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from app.services.caching import cache
+from app.services.markets.huggingface import huggingface_models
+from app.services.markets.huggingface.huggingface_models import HuggingFaceService
+
+MODULE = "app.services.markets.huggingface.huggingface_models"
+
+
+def make_model_info(sha):
+    card_data = MagicMock()
+    card_data.to_dict.return_value = {"license": "mit"}
+    return MagicMock(id="org/model", sha=sha, downloads=10, likes=2, lastModified="2024-01-01",
+                     pipeline_tag="text-generation", tags=["nlp"], card_data=card_data)
+
+
+@pytest.fixture
+def hub(tmp_path):
+    asyncio.run(cache.clear())
+    readme = tmp_path / "README.md"
+    readme.write_text("---\nlicense: mit\nlanguage: en\n---\n# Title\n", encoding="utf-8")
+    with patch(f"{MODULE}.get_hf_api") as get_hf_api, \
+            patch(f"{MODULE}.render_model_card", wraps=huggingface_models.render_model_card) as render:
+        get_hf_api.return_value.hf_hub_download.return_value = str(readme)
+        yield get_hf_api.return_value, render
+
+
+def test_card_is_loaded_once_per_sha_and_rendered_once_per_content(hub):
+    hf_api, render = hub
+    service = HuggingFaceService()
+
+    hf_api.model_info.return_value = make_model_info("sha1")
+    first = asyncio.run(service.get_model_detail("org/model"))
+    second = asyncio.run(service.get_model_detail("org/model"))
+    # 새 커밋이지만 README 내용은 동일
+    hf_api.model_info.return_value = make_model_info("sha2")
+    third = asyncio.run(service.get_model_detail("org/model"))
+
+    assert first == second == third
+    assert first["card_html"].strip() == "<h1>Title</h1>"
+    assert first["language"] == "en"
+    # README는 model_info와 같은 커밋에서 읽음
+    assert [call.kwargs["revision"] for call in hf_api.hf_hub_download.call_args_list] == ["sha1", "sha2"]
+    assert render.call_count == 1
+
+
+def test_detail_without_html_skips_card_download(hub):
+    hf_api, render = hub
+    hf_api.model_info.return_value = make_model_info("sha1")
+
+    detail = asyncio.run(HuggingFaceService().get_model_detail("org/model", include_html=False))
+
+    assert "card_html" not in detail
+    assert detail["license"] == "mit"
+    hf_api.hf_hub_download.assert_not_called()
+    render.assert_not_called()
@@ -0,0 +1,52 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.caching import cache
+from app.services.markets.huggingface.huggingface_models import HuggingFaceService
+
+MODULE = "app.services.markets.huggingface.huggingface_models"
+SHA1, SHA2 = "1" * 40, "2" * 40
+
+
+def make_repo_info(names):
+    siblings = [MagicMock(rfilename=name, size=100, blob_id=f"blob-{name}", lfs=None) for name in names]
+    return MagicMock(siblings=siblings)
+
+
+@pytest.fixture
+def hf_api():
+    asyncio.run(cache.clear())
+    with patch(f"{MODULE}.get_hf_api") as get_hf_api:
+        yield get_hf_api.return_value
+
+
+def test_file_listing_is_cached_per_sha_and_revalidated_by_sha_only(hf_api):
+    service = HuggingFaceService()
+    hf_api.model_info.return_value = MagicMock(sha=SHA1)
+    hf_api.repo_info.return_value = make_repo_info(["README.md", "model.safetensors"])
+
+    first = asyncio.run(service.get_model_files("org/model"))
+    second = asyncio.run(service.get_model_files("org/model"))
+    assert first == second
+    assert first["sha"] == SHA1
+    assert first["files"][1] == {"name": "model.safetensors", "size": "100.0 B", "size_bytes": 100,
+                                 "blob_id": "blob-model.safetensors", "lfs": False}
+    assert hf_api.repo_info.call_count == 1
+    assert hf_api.model_info.call_args.kwargs == {"revision": "main", "expand": ["sha"]}
+    assert hf_api.repo_info.call_args.kwargs["revision"] == SHA1
+
+    # 새 커밋이 올라오면 sha가 바뀌므로 목록을 다시 조회
+    hf_api.model_info.return_value = MagicMock(sha=SHA2)
+    hf_api.repo_info.return_value = make_repo_info(["README.md"])
+    assert asyncio.run(service.get_model_files("org/model"))["sha"] == SHA2
+    assert hf_api.repo_info.call_count == 2
+
+
+def test_full_sha_revision_skips_revision_lookup(hf_api):
+    hf_api.repo_info.return_value = make_repo_info(["README.md"])
+
+    listing = asyncio.run(HuggingFaceService().get_model_files("org/model", SHA1))
+    assert listing["sha"] == SHA1
+    hf_api.model_info.assert_not_called()
@@ -0,0 +1,176 @@
+import asyncio
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from fastapi import HTTPException
+
+from app.services.resilience import (CircuitBreaker, UpstreamGuard, UpstreamPolicy, UpstreamStatusError,
+                                     UpstreamUnavailableError, _parse_retry_after)
+
+
+def make_guard(**overrides):
+    policy = dict(connect_timeout=1.0, read_timeout=1.0, max_retries=2, backoff_base=0.0, backoff_max=0.0,
+                  max_in_flight=4, breaker_failure_threshold=3, breaker_reset_timeout=30.0)
+    policy.update(overrides)
+    return UpstreamGuard("test", UpstreamPolicy(**policy))
+
+
+def test_retries_transient_errors_then_succeeds():
+    guard = make_guard()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise UpstreamStatusError(503)
+        return "ok"
+
+    assert asyncio.run(guard.call(flaky)) == "ok"
+    assert len(attempts) == 3
+    assert guard.retries == 2
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_errors_are_not_retried():
+    guard = make_guard()
+    attempts = []
+
+    async def not_found():
+        attempts.append(1)
+        raise aiohttp.ClientResponseError(None, (), status=404)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(guard.call(not_found))
+    assert len(attempts) == 1
+    assert guard.breaker.failures == 0
+
+
+def test_breaker_opens_and_rejects_until_reset():
+    guard = make_guard(max_retries=0, breaker_failure_threshold=2)
+
+    async def down():
+        raise aiohttp.ClientConnectionError("refused")
+
+    async def up():
+        return "ok"
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await guard.call(down)
+        assert guard.breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(UpstreamUnavailableError) as exc_info:
+            await guard.call(up)
+        assert exc_info.value.status_code == 503
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+        # 리셋 시간이 지나면 시험 호출 하나로 복구
+        guard.breaker.opened_at -= guard.policy.breaker_reset_timeout
+        assert await guard.call(up) == "ok"
+        assert guard.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+    assert guard.rejected == 1
+    assert guard.breaker.trips == 1
+
+
+def test_cancelled_half_open_trial_does_not_wedge_breaker():
+    guard = make_guard(max_retries=0, breaker_failure_threshold=1)
+
+    async def down():
+        raise aiohttp.ClientConnectionError("refused")
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def up():
+        return "ok"
+
+    async def scenario():
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await guard.call(down)
+        guard.breaker.opened_at -= guard.policy.breaker_reset_timeout
+
+        trial = asyncio.ensure_future(guard.call(hang))
+        await asyncio.sleep(0)
+        assert guard.breaker.state == CircuitBreaker.HALF_OPEN
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        # 취소된 시험 호출 뒤에도 다음 호출이 새 시험 호출로 통과해야 함
+        assert await guard.call(up) == "ok"
+        assert guard.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_local_errors_do_not_touch_the_breaker():
+    guard = make_guard(max_retries=0, breaker_failure_threshold=2)
+
+    async def down():
+        raise aiohttp.ClientConnectionError("refused")
+
+    async def executor_full():
+        # run_blocking 대기열 초과처럼 업스트림에 도달하지 못한 로컬 오류
+        raise HTTPException(status_code=503, detail="Server busy")
+
+    async def scenario():
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await guard.call(down)
+        with pytest.raises(HTTPException):
+            await guard.call(executor_full)
+        # 연속 실패 횟수가 초기화되지 않아 다음 실패에서 열림
+        assert guard.breaker.failures == 1
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await guard.call(down)
+        assert guard.breaker.state == CircuitBreaker.OPEN
+
+        # HALF_OPEN 시험 호출이 로컬 오류로 끝나도 닫히지 않고 다음 호출이 다시 시험함
+        guard.breaker.opened_at -= guard.policy.breaker_reset_timeout
+        with pytest.raises(HTTPException):
+            await guard.call(executor_full)
+        assert guard.breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await guard.call(down)
+        assert guard.breaker.trips == 2
+
+    asyncio.run(scenario())
+
+
+def test_backoff_honors_retry_after_and_caps_jitter():
+    guard = make_guard(backoff_base=1.0, backoff_max=5.0)
+    assert guard.backoff(0, "2") == 2.0
+    assert guard.backoff(0, "120") == 5.0
+    assert all(0 <= guard.backoff(10, None) <= 5.0 for _ in range(20))
+    assert _parse_retry_after("invalid") is None
+
+
+def test_in_flight_is_capped():
+    guard = make_guard(max_in_flight=2)
+    active, peak = 0, 0
+
+    async def slow():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    async def scenario():
+        await asyncio.gather(*[guard.call(slow) for _ in range(6)])
+
+    asyncio.run(scenario())
+    assert peak == 2
+
+
+def test_policy_merges_market_overrides():
+    with patch("app.services.resilience.settings") as settings:
+        settings.UPSTREAM_DEFAULT_POLICY = dict(connect_timeout=5.0, read_timeout=30.0, max_retries=2,
+                                                backoff_base=0.5, backoff_max=10.0, max_in_flight=32,
+                                                breaker_failure_threshold=5, breaker_reset_timeout=30.0)
+        settings.UPSTREAM_POLICIES = {"huggingface": {"max_retries": 4}}
+        policy = UpstreamPolicy.for_market("huggingface")
+    assert policy.max_retries == 4
+    assert policy.read_timeout == 30.0
@@ -0,0 +1,75 @@
+import asyncio
+import gzip
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services import http_client
+from app.services.markets.huggingface.huggingface_models import HuggingFaceService
+
+PAYLOAD = bytes(range(256)) * 64
+
+
+async def serve_file(request):
+    if request.match_info["name"] == "forced-gzip.bin":
+        # Accept-Encoding을 무시하고 압축해 보내는 서버
+        return web.Response(body=gzip.compress(PAYLOAD), headers={"Content-Encoding": "gzip"})
+    if request.match_info["name"] != "model.bin":
+        return web.Response(status=404)
+    if request.headers.get("Accept-Encoding") != "identity":
+        return web.Response(status=400)
+    range_header = request.headers.get("Range")
+    if range_header:
+        start, end = (int(value) for value in range_header.removeprefix("bytes=").split("-"))
+        return web.Response(status=206, body=PAYLOAD[start:end + 1],
+                            headers={"Content-Range": f"bytes {start}-{end}/{len(PAYLOAD)}"})
+    return web.Response(body=PAYLOAD, headers={"ETag": '"abc"'})
+
+
+async def stream(range_header=None, filename="model.bin"):
+    app = web.Application()
+    app.router.add_get("/org/model/resolve/main/{name}", serve_file)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        with patch.object(settings, "HF_ENDPOINT", f"http://127.0.0.1:{port}"):
+            response = await HuggingFaceService().stream_model_file("org/model", filename, range_header)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+        return response, body
+    finally:
+        await http_client.close_http_session()
+        await runner.cleanup()
+
+
+def test_stream_full_file():
+    response, body = asyncio.run(stream())
+    assert response.status_code == 200
+    assert body == PAYLOAD
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-disposition"] == 'attachment; filename="model.bin"'
+
+
+def test_stream_range_request():
+    response, body = asyncio.run(stream("bytes=100-199"))
+    assert response.status_code == 206
+    assert body == PAYLOAD[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(PAYLOAD)}"
+
+
+def test_stream_missing_file():
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(stream(filename="missing.bin"))
+    assert exc_info.value.status_code == 404
+
+
+def test_stream_drops_length_of_compressed_upstream_body():
+    response, body = asyncio.run(stream(filename="forced-gzip.bin"))
+    assert body == PAYLOAD
+    assert "content-length" not in response.headers
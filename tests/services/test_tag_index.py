@@ -0,0 +1,57 @@
+import time
+
+from app.services.tag_index import TagGroup
+
+LANGUAGES = [
+    {"id": "en", "label": "English", "type": "language"},
+    {"id": "ko", "label": "Korean", "type": "language"},
+    {"id": "kok", "label": "Konkani", "type": "language"},
+    {"id": "ckb", "label": "Central Kurdish", "type": "language"},
+    {"id": "ang", "label": "Old English", "type": "language"},
+]
+
+
+def test_search_ranks_prefix_before_word_prefix_before_substring():
+    group = TagGroup("language", LANGUAGES, "etag")
+    assert [item["id"] for item in group.search("ko", 10)] == ["ko", "kok"]
+    assert [item["id"] for item in group.search("kurd", 10)] == ["ckb"]
+    assert [item["id"] for item in group.search("english", 10)] == ["en", "ang"]
+    assert [item["id"] for item in group.search("glis", 10)] == ["en", "ang"]
+    assert group.search("K", 1) == [LANGUAGES[1]]
+
+
+def test_search_empty_query_returns_first_items():
+    group = TagGroup("language", LANGUAGES, "etag")
+    assert group.search("  ", 2) == LANGUAGES[:2]
+
+
+def test_prefix_search_on_large_groups_returns_matches_in_order():
+    # 소요 시간은 benchmarks/bench_micro.py 의 "TagGroup.search[prefix, 20000 items]"에서 측정
+    items = [{"id": f"dataset-{i}", "label": f"Dataset {i:05d}", "type": "dataset"} for i in range(20000)]
+    group = TagGroup("dataset", items, "etag")
+
+    assert [item["id"] for item in group.search("dataset 1", 20)] == [f"dataset-{i}" for i in range(10000, 10020)]
+    assert [item["id"] for item in group.search("dataset 19999", 20)] == ["dataset-19999"]
+
+
+def test_substring_search_does_not_match_across_label_and_id():
+    group = TagGroup("language", LANGUAGES, "etag")
+    # ID와 라벨을 이은 "ko korean"에서만 나오는 부분 문자열
+    assert group.search("ko kor", 10) == []
+    assert [item["id"] for item in group.search("an", 10)] == ["ang", "ko", "kok"]
+    assert [item["id"] for item in group.search("kan", 10)] == ["kok"]
+
+
+def test_substring_search_is_fast_when_few_items_match():
+    # 일치가 적은 질의도 전체 항목을 훑지 않고 trigram 색인으로 찾음 (기존 선형 탐색은 50k 항목에서 수 ms)
+    items = [{"id": f"org/set-{i}", "label": f"Dataset {i:05d} collection", "type": "dataset"} for i in range(50000)]
+    group = TagGroup("dataset", items, "etag")
+    queries = ("zzz", "n s", "t 4999", "et-4999")
+
+    started = time.perf_counter()
+    for _ in range(20):
+        results = [group.search(query, 20) for query in queries]
+    elapsed = (time.perf_counter() - started) / (20 * len(queries))
+
+    assert [len(result) for result in results] == [0, 0, 10, 11]
+    assert elapsed < 0.001